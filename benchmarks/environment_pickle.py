@@ -0,0 +1,57 @@
+"""Measure the size and load time of the pickled build environment.
+
+Builds a synthetic project with one ``pandas-compat`` note per page and
+reports the size of ``environment.pickle`` and how long it takes to load::
+
+    python benchmarks/environment_pickle.py --pages 100 1000
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import pickle
+import tempfile
+import time
+
+from sphinx.application import Sphinx
+
+from synthetic import make_project
+
+
+def run(n_pages: int, repeat: int) -> tuple[int, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        # a note in every function, one module per page
+        make_project(
+            root, modules=n_pages, functions=1, compat_density=1, todo_density=0
+        )
+        app = Sphinx(
+            root, root, root / "_build", root / "_doctrees", "html",
+            status=None, warning=None, freshenv=True,
+        )
+        app.build()
+
+        path = root / "_doctrees" / "environment.pickle"
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with open(path, "rb") as f:
+                pickle.load(f)
+            best = min(best, time.perf_counter() - start)
+        return path.stat().st_size, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'pages':>8} {'pickle [KiB]':>14} {'load [s]':>10}")
+    for n_pages in args.pages:
+        size, load = run(n_pages, args.repeat)
+        print(f"{n_pages:>8} {size / 1024:>14.1f} {load:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
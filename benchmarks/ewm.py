@@ -0,0 +1,95 @@
+"""Compare ``ewm`` on a list of ``com`` values with looping over ``DataFrame.ewm``.
+
+Both compute the means, and optionally the variances, of ``--coms`` on a
+random frame of ``--rows`` by ``--columns``, and the results are compared,
+as they are first on a Series. The loop concatenates its frames into the
+same MultiIndex columns::
+
+    python benchmarks/ewm.py --rows 10000 100000 --columns 200 --var
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, pathlib.Path(__file__).parents[1].as_posix())
+
+from compatsphinxext import ewm  # noqa: E402
+
+
+def loop(df: pd.DataFrame, coms: list[float], var: bool) -> pd.DataFrame:
+    frames = {}
+    for com in coms:
+        window = df.ewm(com=com)
+        frames[com] = (
+            pd.concat({"mean": window.mean(), "var": window.var()}, axis=1)
+            if var
+            else window.mean()
+        )
+    return pd.concat(frames, axis=1, names=["com"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument(
+        "--coms",
+        type=float,
+        nargs="+",
+        default=[0.5, 1, 2, 3, 5, 8, 10, 15, 20, 30, 50, 100],
+    )
+    parser.add_argument("--var", action="store_true", help="also compute variances")
+    parser.add_argument(
+        "--missing",
+        type=float,
+        default=0.0,
+        help="fraction of columns with a missing value",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # import SciPy and warm up pandas outside of the timings
+    warmup = pd.DataFrame(rng.random((10, 2)))
+    loop(warmup, args.coms, args.var)
+    ewm(warmup, com=args.coms, var=args.var)
+
+    series = pd.Series(rng.normal(100, 3, 1000))
+    pd.testing.assert_frame_equal(
+        ewm(series, com=args.coms, var=args.var),
+        loop(series, args.coms, args.var),
+        check_names=False,
+        check_column_type=False,
+        rtol=1e-8,
+    )
+
+    print(f"{len(args.coms)} coms, {args.columns} columns, var={args.var}")
+    print(f"{'rows':>10} {'loop [s]':>10} {'batched [s]':>12} {'speedup':>8}")
+    for rows in args.rows:
+        values = rng.normal(100, 3, (rows, args.columns))
+        gaps = np.flatnonzero(rng.random(args.columns) < args.missing)
+        values[rng.integers(0, rows, len(gaps)), gaps] = np.nan
+        df = pd.DataFrame(values)
+
+        start = time.perf_counter()
+        expected = loop(df, args.coms, args.var)
+        looped = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = ewm(df, com=args.coms, var=args.var)
+        batched = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(
+            result, expected, check_names=False, check_column_type=False, rtol=1e-8
+        )
+        print(f"{rows:>10} {looped:>10.3f} {batched:>12.3f} {looped / batched:>7.1f}x")
+        del df, expected, result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Measure the time and peak memory of the ``from_arrow`` modes.
+
+A table of ``--rows`` rows is written to an Arrow IPC file. Each mode runs in
+a fresh process, which reads the file and converts it. The peak is the
+anonymous RSS (memory-mapped file pages are not counted) above the one
+before the conversion, sampled every millisecond::
+
+    python benchmarks/from_arrow.py --rows 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pyarrow as pa
+
+sys.path.insert(0, pathlib.Path(__file__).parents[1].as_posix())
+
+from compatsphinxext import from_arrow, from_arrow_batches  # noqa: E402
+
+MODES = {
+    "default": {},
+    "arrow_dtypes": {"arrow_dtypes": True},
+    "split+self_destruct": {"split_blocks": True, "self_destruct": True},
+    "batches": None,
+}
+
+
+def write_table(path: pathlib.Path, rows: int, batch_size: int) -> None:
+    rng = np.random.default_rng(0)
+    table = pa.table(
+        {f"f{i}": rng.random(rows) for i in range(4)}
+        | {f"i{i}": rng.integers(0, 1000, rows) for i in range(4)}
+    )
+    with pa.OSFile(path.as_posix(), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=batch_size)
+
+
+def anon_rss_mib() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("RssAnon not found in /proc/self/status")
+
+
+class PeakSampler(threading.Thread):
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self.before = self.peak = anon_rss_mib()
+        self.done = threading.Event()
+
+    def run(self) -> None:
+        while not self.done.wait(0.001):
+            self.peak = max(self.peak, anon_rss_mib())
+
+    def stop(self) -> float:
+        self.done.set()
+        self.join()
+        return max(self.peak, anon_rss_mib()) - self.before
+
+
+def child(path: str, mode: str) -> None:
+    if MODES[mode] is not None:
+        # read the table into memory, as a caller of from_arrow would have it
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all().combine_chunks()
+
+    sampler = PeakSampler()
+    sampler.start()
+    start = time.perf_counter()
+    if MODES[mode] is None:
+        total = sum(df["f0"].sum() for df in from_arrow_batches(path))
+    else:
+        df = from_arrow(table, **MODES[mode])
+        del table
+        total = df["f0"].sum()
+    elapsed = time.perf_counter() - start
+    peak = sampler.stop()
+    json.dump({"time": elapsed, "peak": peak, "total": float(total)}, sys.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "MODE"))
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "table.arrow"
+        write_table(path, args.rows, args.batch_size)
+        size = path.stat().st_size / 2**20
+        print(f"{args.rows} rows, {size:.0f} MiB on disk")
+        print(f"{'mode':>20} {'time [s]':>10} {'peak [MiB]':>11}")
+        for mode in MODES:
+            result = subprocess.run(
+                [sys.executable, __file__, "--child", path.as_posix(), mode],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            record = json.loads(result.stdout)
+            print(f"{mode:>20} {record['time']:>10.3f} {record['peak']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measure how fast ``create_meal_df`` generates rows and how big they are.
+
+Reports rows per second and bytes per row (``memory_usage(deep=True)``) for
+both dtype backends::
+
+    python benchmarks/meal_df.py --rows 100000 1000000 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, pathlib.Path(__file__).parents[1].as_posix())
+
+from compatsphinxext import create_meal_df  # noqa: E402
+
+
+def run(n: int, dtype_backend: str, repeat: int) -> tuple[float, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = create_meal_df(n, dtype_backend=dtype_backend)
+        best = min(best, time.perf_counter() - start)
+    return n / best, df.memory_usage(deep=True).sum() / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'backend':>8} {'rows/s':>14} {'bytes/row':>10}")
+    for n in args.rows:
+        for dtype_backend in ("numpy", "pyarrow"):
+            rate, size = run(n, dtype_backend, args.repeat)
+            print(f"{n:>10} {dtype_backend:>8} {rate:>14,.0f} {size:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
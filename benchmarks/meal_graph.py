@@ -0,0 +1,70 @@
+"""Compare the ways of building the ingredient to meal graph.
+
+``dataframe`` is the previous path (a DataFrame of the rows passed to
+``nx.from_pandas_edgelist``), ``arrays`` builds the ``DiGraph`` from the
+counted edge arrays and ``csr`` returns the SciPy adjacency instead::
+
+    python benchmarks/meal_graph.py --edges 10000 100000 1000000 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+
+sys.path.insert(0, pathlib.Path(__file__).parents[1].as_posix())
+
+from compatsphinxext import create_meal_df, create_meal_g  # noqa: E402
+
+
+def from_dataframe(n: int) -> nx.DiGraph:
+    df = create_meal_df(n).astype(str)
+    return nx.from_pandas_edgelist(
+        df, source="ingredient", target="meal", create_using=nx.DiGraph
+    )
+
+
+PATHS = {
+    "dataframe": from_dataframe,
+    "arrays": lambda n: create_meal_g(n),
+    "csr": lambda n: create_meal_g(n, sparse=True),
+}
+
+
+def run(path: str, n: int) -> tuple[float, float]:
+    build = PATHS[path]
+    start = time.perf_counter()
+    build(n)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    build(n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--edges",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000, 10_000_000],
+    )
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    args = parser.parse_args()
+
+    print(f"{'edges':>10} {'path':>10} {'time [s]':>10} {'peak [MiB]':>11}")
+    for n in args.edges:
+        for path in args.paths:
+            elapsed, peak = run(path, n)
+            print(f"{n:>10} {path:>10} {elapsed:>10.4f} {peak:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Time ``sphinx-build -j N`` on a synthetic project.
+
+Every page carries a ``pandas-compat`` note and a ``todo``, and one page
+holds both lists. For each job count the full build is timed, along with the
+time the main process spends merging the environments of the read workers::
+
+    python benchmarks/parallel_build.py --pages 2000 --jobs 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+
+from sphinx.application import Sphinx
+from sphinx.environment import BuildEnvironment
+
+from synthetic import EXT_DIR, make_project
+
+sys.path.insert(0, EXT_DIR.as_posix())
+
+from PandasCompat import PandasCompatDomain  # noqa: E402
+from todo import TodoDomain  # noqa: E402
+
+
+class Timer:
+    """Accumulate the time spent in a method, patched onto its class."""
+
+    def __init__(self, cls: type, name: str) -> None:
+        self.total = 0.0
+        self.cls = cls
+        self.name = name
+        self.method = getattr(cls, name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return self.method(*args, **kwargs)
+            finally:
+                self.total += time.perf_counter() - start
+
+        setattr(cls, name, timed)
+
+    def restore(self) -> None:
+        setattr(self.cls, self.name, self.method)
+
+
+def run(n_pages: int, jobs: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        # a note and a todo in every function, one module per page
+        make_project(
+            root, modules=n_pages, functions=1, compat_density=1, todo_density=1
+        )
+        timers = {
+            "merge": Timer(BuildEnvironment, "merge_info_from"),
+            "merge (extensions)": Timer(PandasCompatDomain, "merge_domaindata"),
+            "merge (todo)": Timer(TodoDomain, "merge_domaindata"),
+        }
+        try:
+            start = time.perf_counter()
+            app = Sphinx(
+                root, root, root / "_build", root / "_doctrees", "html",
+                status=None, warning=None, freshenv=True, parallel=jobs,
+            )
+            app.build()
+            wall = time.perf_counter() - start
+        finally:
+            for timer in timers.values():
+                timer.restore()
+        timers["merge (extensions)"].total += timers.pop("merge (todo)").total
+        return {"wall": wall} | {name: t.total for name, t in timers.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(
+        f"{'jobs':>6} {'wall [s]':>10} {'speedup':>8} "
+        f"{'merge [s]':>10} {'ext merge [s]':>14}"
+    )
+    baseline = None
+    for jobs in args.jobs:
+        timings = run(args.pages, jobs)
+        baseline = baseline or timings["wall"]
+        print(
+            f"{jobs:>6} {timings['wall']:>10.2f} "
+            f"{baseline / timings['wall']:>7.2f}x "
+            f"{timings['merge']:>10.3f} {timings['merge (extensions)']:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
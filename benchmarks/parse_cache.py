@@ -0,0 +1,79 @@
+"""Time the read phase with and without the cache of parsed note content.
+
+A synthetic project is built three times, each in a fresh process and from
+a fresh environment: with ``parse_cache = False``, with an empty cache, and
+with the cache filled by the previous build, as after an environment reset.
+The time spent parsing the content of the ``pandas-compat`` and ``todo``
+notes is reported next to the read phase::
+
+    python benchmarks/parse_cache.py --modules 40 --functions 50 \\
+        --compat-density 1 --todo-density 1
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+from parallel_build import Timer
+from run import build
+from synthetic import add_arguments, make_project, project_options
+
+EXT_DIR = pathlib.Path(__file__).parents[1] / "docs" / "source" / "_ext"
+sys.path.insert(0, EXT_DIR.as_posix())
+
+import parsecache  # noqa: E402
+
+MODES = {"off": False, "cold": True, "warm": True}
+
+
+def child(root: pathlib.Path, jobs: int, mode: str) -> None:
+    timer = Timer(parsecache, "nested_parse")
+    try:
+        results = build(root, jobs, {"parse_cache": MODES[mode]})
+    finally:
+        timer.restore()
+    json.dump({"read": results["read"], "notes": timer.total}, sys.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--child", metavar="MODE")
+    parser.add_argument("--root", type=pathlib.Path)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.root, args.jobs, args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        counts = make_project(root, **project_options(args))
+        print(", ".join(f"{count} {name}" for name, count in counts.items()))
+        print(f"{'cache':>6} {'read [s]':>10} {'notes [s]':>10} {'files':>6}")
+        cache = root / "_doctrees" / parsecache.CACHE_DIRNAME
+        for mode in MODES:
+            result = subprocess.run(
+                [
+                    sys.executable, __file__, "--child", mode,
+                    "--root", tmp, "--jobs", str(args.jobs),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            record = json.loads(result.stdout)
+            files = sum(1 for _ in cache.glob("*.pickle"))
+            print(
+                f"{mode:>6} {record['read']:>10.2f} {record['notes']:>10.3f} "
+                f"{files:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measure the peak memory of ``reindex`` and ``rename`` with and without copies.
+
+Each mode runs in a fresh process on a float frame of ``--rows`` by
+``--columns``, and reports the time and the peak anonymous RSS above the one
+with the frame alone. The modes without copies are first checked to give the
+same frames as the ones with::
+
+    python benchmarks/reindex_rename.py --rows 5000000 --columns 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, pathlib.Path(__file__).parents[1].as_posix())
+
+from compatsphinxext import reindex, rename  # noqa: E402
+from from_arrow import PeakSampler  # noqa: E402
+
+MODES = {
+    "reindex": lambda df: reindex(df),
+    "reindex copy=False": lambda df: reindex(df, copy=False),
+    "rename": lambda df: rename(df),
+    "rename copy=False": lambda df: rename(df, copy=False),
+    "chained": lambda df: rename(reindex(df)),
+    "chained copy=False": lambda df: rename(reindex(df, copy=False), copy=False),
+}
+
+
+# column labels the copy-free modes must handle like the copying ones
+LABELS = [
+    ["c0", "c1", "c2"],
+    [np.nan, "c1", "c2"],
+    [np.nan, "c1", np.nan],
+    ["c1", "c0", "c1"],
+    pd.Index(["c0", "c1", "c2"], name="columns"),
+    pd.CategoricalIndex(["c0", "c1", "c2"]),
+]
+
+
+def check() -> None:
+    for labels in LABELS:
+        df = pd.DataFrame([[1.0, 2.0, 3.0]], columns=labels)
+        pd.testing.assert_frame_equal(rename(df, copy=False), rename(df))
+        pd.testing.assert_frame_equal(reindex(df, copy=False), reindex(df))
+
+
+def child(rows: int, columns: int, mode: str) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        rng.random((rows, columns)), columns=[f"c{i}" for i in range(columns)]
+    )
+
+    sampler = PeakSampler()
+    sampler.start()
+    start = time.perf_counter()
+    result = MODES[mode](df)  # noqa: F841, kept alive until measured
+    elapsed = time.perf_counter() - start
+    peak = sampler.stop()
+    json.dump({"time": elapsed, "peak": peak}, sys.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--child", metavar="MODE")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.rows, args.columns, args.child)
+        return
+
+    check()
+    size = args.rows * args.columns * 8 / 2**20
+    print(f"pandas {pd.__version__}, {size:.0f} MiB frame")
+    print(f"{'mode':>20} {'time [s]':>10} {'peak [MiB]':>11}")
+    for mode in MODES:
+        result = subprocess.run(
+            [
+                sys.executable, __file__, "--child", mode,
+                "--rows", str(args.rows), "--columns", str(args.columns),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        record = json.loads(result.stdout)
+        print(f"{mode:>20} {record['time']:>10.4f} {record['peak']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
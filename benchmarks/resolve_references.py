@@ -0,0 +1,90 @@
+"""Time cross-reference resolution for ``pandas-compat-list`` content.
+
+Compares resolving every note in its own scratch document, one
+``env.resolve_references`` call per note, with resolving all notes of a page
+in a single batch::
+
+    python benchmarks/resolve_references.py --notes 10 100 1000
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+
+from sphinx.application import Sphinx
+from sphinx.util.docutils import new_document
+
+from synthetic import EXT_DIR, make_project
+
+sys.path.insert(0, EXT_DIR.as_posix())
+
+from PandasCompat import PandasCompatListProcessor  # noqa: E402
+
+# the page of the synthetic project holding the list
+LIST_PAGE = "lists/list0"
+
+
+def copies(processor: PandasCompatListProcessor) -> list:
+    return [
+        pandascompat.to_node()
+        for vals in processor.domain.pandascompats.values()
+        for pandascompat in vals
+    ]
+
+
+def per_note(processor: PandasCompatListProcessor, docname: str) -> None:
+    for new_pandascompat in copies(processor):
+        processor.resolve_references([new_pandascompat], docname)
+
+
+def batched(processor: PandasCompatListProcessor, docname: str) -> None:
+    processor.resolve_references(copies(processor), docname)
+
+
+def run(n_notes: int, repeat: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        # one module with a note in every function, all on one page
+        make_project(
+            root, modules=1, functions=n_notes, compat_density=1, todo_density=0
+        )
+        app = Sphinx(
+            root, root, root / "_build", root / "_doctrees", "html",
+            status=None, warning=None, freshenv=True,
+        )
+        app.build()
+        # an empty doctree makes the processor return before doing any work
+        processor = PandasCompatListProcessor(app, new_document(""), LIST_PAGE)
+
+        timings = {}
+        for name, func in [("per-note", per_note), ("batched", batched)]:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(processor, LIST_PAGE)
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+        return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'notes':>8} {'per-note [s]':>14} {'batched [s]':>14} {'speedup':>8}")
+    for n_notes in args.notes:
+        timings = run(n_notes, args.repeat)
+        print(
+            f"{n_notes:>8} {timings['per-note']:>14.4f} "
+            f"{timings['batched']:>14.4f} "
+            f"{timings['per-note'] / timings['batched']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Build a synthetic project and record how long each build phase takes.
+
+The read, resolve and write phases are timed separately, together with the
+peak RSS of the process and the size of the pickled environment. Results are
+saved as JSON, so runs on different commits can be compared::
+
+    python benchmarks/run.py --modules 200 --functions 50 -o new.json
+    python benchmarks/run.py --modules 200 --functions 50 --compare old.json
+
+``-D name=value`` overrides a configuration value, as with ``sphinx-build``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import sphinx
+from sphinx.application import Sphinx
+from sphinx.environment import BuildEnvironment
+
+from synthetic import add_arguments, make_project, project_options
+
+METRICS = ["read", "resolve", "write", "total", "peak_rss_mib", "env_pickle_kib"]
+
+
+def git_revision() -> str:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        capture_output=True,
+        text=True,
+        cwd=pathlib.Path(__file__).parent,
+    )
+    return result.stdout.strip()
+
+
+def build(
+    root: pathlib.Path, jobs: int, confoverrides: dict | None = None
+) -> dict[str, float]:
+    marks: dict[str, float] = {}
+    resolve = 0.0
+
+    def mark(name: str) -> None:
+        # handlers of env-updated must not return anything
+        marks.setdefault(name, time.perf_counter())
+
+    get_and_resolve_doctree = BuildEnvironment.get_and_resolve_doctree
+
+    def timed_resolve(*args, **kwargs):
+        nonlocal resolve
+        start = time.perf_counter()
+        try:
+            return get_and_resolve_doctree(*args, **kwargs)
+        finally:
+            resolve += time.perf_counter() - start
+
+    BuildEnvironment.get_and_resolve_doctree = timed_resolve
+    try:
+        app = Sphinx(
+            root, root, root / "_build", root / "_doctrees", "html",
+            confoverrides, status=None, warning=None, freshenv=True,
+            parallel=jobs,
+        )
+        app.connect("env-before-read-docs", lambda *args: mark("read"))
+        app.connect("env-updated", lambda *args: mark("read_end"))
+        start = time.perf_counter()
+        app.build()
+        end = time.perf_counter()
+    finally:
+        BuildEnvironment.get_and_resolve_doctree = get_and_resolve_doctree
+
+    # everything after reading is resolving and writing
+    after_read = end - marks["read_end"]
+    return {
+        "read": marks["read_end"] - marks["read"],
+        "resolve": resolve,
+        "write": after_read - resolve,
+        "total": end - start,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "env_pickle_kib": (root / "_doctrees" / "environment.pickle").stat().st_size
+        / 1024,
+    }
+
+
+def compare(old: dict, new: dict) -> None:
+    print(f"{'metric':>16} {'old':>12} {'new':>12} {'change':>8}")
+    for metric in METRICS:
+        before, after = old["results"][metric], new["results"][metric]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{metric:>16} {before:>12.3f} {after:>12.3f} {change:>+7.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("-o", "--output", type=pathlib.Path)
+    parser.add_argument(
+        "-D", "--define", action="append", default=[], metavar="NAME=VALUE"
+    )
+    parser.add_argument(
+        "--compare", type=pathlib.Path, help="earlier results to compare with"
+    )
+    args = parser.parse_args()
+
+    options = project_options(args)
+    overrides = dict(define.split("=", 1) for define in args.define)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        counts = make_project(root, **options)
+        results = build(root, args.jobs, overrides)
+
+    record = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "sphinx": sphinx.__version__,
+        "jobs": args.jobs,
+        "project": options | counts,
+        "overrides": overrides,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(record, indent=2) + "\n")
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), record)
+    else:
+        json.dump(record, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Generate a synthetic Sphinx project exercising the ``_ext`` extensions.
+
+The project has ``modules`` Python modules of ``functions`` functions each,
+documented with autodoc. A share of the docstrings (``compat_density`` and
+``todo_density``) carry a ``pandas-compat`` note or a ``todo``, and
+``list_pages`` pages hold a ``pandas-compat-list`` and a ``todolist``::
+
+    python benchmarks/synthetic.py /tmp/project --modules 100 --functions 50
+    sphinx-build /tmp/project /tmp/project/_build
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import pathlib
+import random
+import sys
+
+EXT_DIR = pathlib.Path(__file__).parents[1] / "docs" / "source" / "_ext"
+
+PACKAGE = "bench_pkg"
+
+UPSTREAMS = [
+    ":meth:`pandas.DataFrame.reindex`",
+    ":meth:`pandas.DataFrame.rename`",
+    ":meth:`pandas.DataFrame.ewm`",
+    ":attr:`pandas.DataFrame.empty`",
+    ":func:`pandas.to_numeric`",
+    ":meth:`pyarrow.Table.to_pandas`",
+    ":class:`networkx.DiGraph`",
+]
+
+CONF = f"""
+import pathlib
+import sys
+sys.path.insert(0, pathlib.Path(__file__).parent.as_posix())
+sys.path.insert(0, {EXT_DIR.as_posix()!r})
+project = "synthetic"
+extensions = ["sphinx.ext.autodoc", "PandasCompat", "todo"]
+include_pandas_compat = True
+todo_include_todos = True
+# the default sidebar toctree makes writing quadratic in the page count
+html_sidebars = {{"**": []}}
+"""
+
+FUNCTION = '''
+
+def func_{j}(df, n=5):
+    """
+    Return a copy of *df* with the first {j} rows dropped.
+
+    :param df: Pandas DataFrame.
+    :param n: Length of the data.
+    :returns: Pandas DataFrame.
+{directives}    """
+    return df
+'''
+
+COMPAT = """
+    .. pandas-compat::
+        {upstream}
+
+        Function {j} of module {i} has fewer options than the upstream one.
+"""
+
+TODO = """
+    .. todo::
+        Check function {j} of module {i} against :ref:`list-0`.
+"""
+
+
+def make_project(
+    root: pathlib.Path,
+    *,
+    modules: int = 10,
+    functions: int = 20,
+    compat_density: float = 0.2,
+    todo_density: float = 0.1,
+    list_pages: int = 1,
+    seed: int = 0,
+) -> dict[str, int]:
+    """Write the project to *root* and return what it contains."""
+    # autodoc imports the package in-process: forget a previous project's
+    for name in list(sys.modules):
+        if name == PACKAGE or name.startswith(f"{PACKAGE}."):
+            del sys.modules[name]
+    importlib.invalidate_caches()
+
+    rng = random.Random(seed)
+    counts = {"documented_functions": 0, "compat_notes": 0, "todos": 0}
+
+    package = root / PACKAGE
+    (root / "api").mkdir(parents=True, exist_ok=True)
+    (root / "lists").mkdir(exist_ok=True)
+    package.mkdir(exist_ok=True)
+    (package / "__init__.py").write_text("")
+    (root / "conf.py").write_text(CONF)
+
+    for i in range(modules):
+        source = [f'"""Synthetic module {i}."""\n']
+        for j in range(functions):
+            directives = ""
+            if rng.random() < compat_density:
+                directives += COMPAT.format(i=i, j=j, upstream=rng.choice(UPSTREAMS))
+                counts["compat_notes"] += 1
+            if rng.random() < todo_density:
+                directives += TODO.format(i=i, j=j)
+                counts["todos"] += 1
+            source.append(FUNCTION.format(j=j, directives=directives))
+            counts["documented_functions"] += 1
+        (package / f"mod{i}.py").write_text("".join(source))
+
+        title = f"Module {i}"
+        (root / "api" / f"mod{i}.rst").write_text(
+            f"{title}\n{'=' * len(title)}\n\n"
+            f".. automodule:: {PACKAGE}.mod{i}\n   :members:\n"
+        )
+
+    for k in range(list_pages):
+        title = f"List {k}"
+        (root / "lists" / f"list{k}.rst").write_text(
+            f".. _list-{k}:\n\n{title}\n{'=' * len(title)}\n\n"
+            ".. pandas-compat-list::\n\n.. todolist::\n"
+        )
+
+    (root / "index.rst").write_text(
+        "Synthetic\n=========\n\n"
+        ".. toctree::\n   :glob:\n\n   lists/*\n   api/*\n"
+    )
+    return counts
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--modules", type=int, default=10)
+    parser.add_argument("--functions", type=int, default=20)
+    parser.add_argument("--compat-density", type=float, default=0.2)
+    parser.add_argument("--todo-density", type=float, default=0.1)
+    parser.add_argument("--list-pages", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def project_options(args: argparse.Namespace) -> dict[str, int | float]:
+    return {
+        "modules": args.modules,
+        "functions": args.functions,
+        "compat_density": args.compat_density,
+        "todo_density": args.todo_density,
+        "list_pages": args.list_pages,
+        "seed": args.seed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", type=pathlib.Path)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    counts = make_project(args.root, **project_options(args))
+    print(", ".join(f"{n} {name.replace('_', ' ')}" for name, n in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare the ``to_numeric`` engines on object-dtype Series of strings.
+
+``current`` is the plain ``pd.to_numeric`` call the function used to make;
+the others are chunked, optionally on a thread pool::
+
+    python benchmarks/to_numeric.py --sizes 1000000 10000000 100000000 --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, pathlib.Path(__file__).parents[1].as_posix())
+
+from compatsphinxext import to_numeric  # noqa: E402
+
+
+def make_series(n: int, kind: str) -> pd.Series:
+    rng = np.random.default_rng(0)
+    if kind == "int":
+        values = rng.integers(-1_000_000, 1_000_000, n).astype(str)
+    else:
+        values = rng.random(n).astype(str)
+    return pd.Series(values, dtype=object)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000]
+    )
+    parser.add_argument("--kind", choices=["int", "float"], default="float")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    variants = {
+        "current": lambda s: pd.to_numeric(s),
+        "pandas chunks": lambda s: to_numeric(
+            s, chunk_size=args.chunk_size, max_workers=1
+        ),
+        "pandas threads": lambda s: to_numeric(
+            s, chunk_size=args.chunk_size, max_workers=args.workers
+        ),
+        "pyarrow": lambda s: to_numeric(
+            s, engine="pyarrow", chunk_size=args.chunk_size
+        ),
+        "pyarrow threads": lambda s: to_numeric(
+            s, engine="pyarrow", chunk_size=args.chunk_size, max_workers=args.workers
+        ),
+    }
+
+    print(f"{'size':>11} {'variant':>16} {'time [s]':>10} {'elements/s':>14}")
+    for n in args.sizes:
+        s = make_series(n, args.kind)
+        expected = None
+        for name, convert in variants.items():
+            start = time.perf_counter()
+            result = convert(s)
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = result
+            else:
+                pd.testing.assert_series_equal(result, expected)
+            print(f"{n:>11} {name:>16} {elapsed:>10.3f} {n / elapsed:>14,.0f}")
+        del s, expected, result
+
+
+if __name__ == "__main__":
+    main()
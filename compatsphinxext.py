@@ -1,18 +1,93 @@
-import networkx as nx
-import pandas as pd
-import pyarrow as pa
+from __future__ import annotations
 
+import importlib
+import os
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
 
-def create_meal_df(n: int = 5, country: str = "italy") -> pd.DataFrame:
+
+class _LazyModule:
+    """Stand in for the module ``name`` until an attribute is looked up.
+
+    The module is then imported and replaces this object in the globals, so
+    importing compatsphinxext, as every autodoc worker does, stays fast.
+    """
+
+    def __init__(self, alias: str, name: str) -> None:
+        self._alias = alias
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
+
+
+if TYPE_CHECKING:
+    import networkx as nx
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import scipy.sparse
+else:
+    nx = _LazyModule("nx", "networkx")
+    np = _LazyModule("np", "numpy")
+    pd = _LazyModule("pd", "pandas")
+    pa = _LazyModule("pa", "pyarrow")
+    pc = _LazyModule("pc", "pyarrow.compute")
+
+
+# (ingredient, meal) pairs per country
+RECIPES = {
+    "italy": [
+        ("eggs", "omelette"),
+        ("tomato", "pasta salad"),
+        ("pasta", "spaghetti bolognese"),
+        ("beef", "spaghetti bolognese"),
+        ("bell pepper", "stir fry"),
+    ],
+    "japan": [
+        ("rice", "sushi"),
+        ("salmon", "sushi"),
+        ("noodles", "ramen"),
+        ("pork", "ramen"),
+        ("tofu", "miso soup"),
+    ],
+    "mexico": [
+        ("tortilla", "tacos"),
+        ("beef", "tacos"),
+        ("beans", "burrito"),
+        ("rice", "burrito"),
+        ("avocado", "guacamole"),
+    ],
+}
+
+
+def create_meal_df(
+    n: int = 5,
+    country: str = "italy",
+    seed: int | None = 0,
+    dtype_backend: str = "numpy",
+) -> pd.DataFrame:
     """
     Return a :class:`pandas.DataFrame` of ingredients and meals.
 
+    Rows are drawn at random from the recipes of ``country``.
+
     Parameters
     ----------
     n : int
         Length of the data.
     country : str
-        Home country of food.
+        Home country of food, one of the keys of ``RECIPES``.
+    seed : int, optional
+        Seed of the random number generator, None for fresh entropy.
+    dtype_backend : {"numpy", "pyarrow"}
+        Return ``category`` columns, or Arrow dictionary-encoded columns.
 
     Returns
     -------
@@ -22,37 +97,138 @@ def create_meal_df(n: int = 5, country: str = "italy") -> pd.DataFrame:
     .. todo::
         Fix this and checkout :class:`pandas.DataFrame`.
     """
-    ingredients = ['eggs', 'tomato', 'pasta', 'beef', 'bell pepper']
-    meals = ['omelette', 'pasta salad', 'spaghetti bolognese', 'spaghetti bolognese', 'stir fry']
-    return pd.DataFrame({'ingredient': ingredients, 'meal': meals})
-
-
-def create_meal_g(n: int = 5, country: str = "italy") -> nx.DiGraph:
+    ingredient_codes, meal_codes, ingredients, meals = _sample_recipes(
+        n, country, seed
+    )
+    if dtype_backend == "pyarrow":
+        columns = {
+            "ingredient": _arrow_dictionary(ingredient_codes, ingredients),
+            "meal": _arrow_dictionary(meal_codes, meals),
+        }
+    elif dtype_backend == "numpy":
+        columns = {
+            "ingredient": pd.Categorical.from_codes(ingredient_codes, ingredients),
+            "meal": pd.Categorical.from_codes(meal_codes, meals),
+        }
+    else:
+        raise ValueError(
+            f"dtype_backend must be 'numpy' or 'pyarrow', got {dtype_backend!r}"
+        )
+    return pd.DataFrame(columns, copy=False)
+
+
+def _sample_recipes(n, country, seed):
+    """Return ingredient and meal codes for ``n`` random recipe rows.
+
+    Codes are the smallest integer type holding the vocabularies, so a row
+    takes two bytes.
+    """
+    try:
+        recipes = RECIPES[country]
+    except KeyError:
+        raise ValueError(
+            f"unknown country {country!r}, expected one of {sorted(RECIPES)}"
+        ) from None
+
+    ingredients = sorted({ingredient for ingredient, _ in recipes})
+    meals = sorted({meal for _, meal in recipes})
+    dtype = np.min_scalar_type(-max(len(ingredients), len(meals)))
+    recipe_ingredient = np.array(
+        [ingredients.index(ingredient) for ingredient, _ in recipes], dtype=dtype
+    )
+    recipe_meal = np.array([meals.index(meal) for _, meal in recipes], dtype=dtype)
+
+    rng = np.random.default_rng(seed)
+    # recipes can outnumber both vocabularies
+    rows = rng.integers(
+        0, len(recipes), size=n, dtype=np.min_scalar_type(-len(recipes))
+    )
+    return recipe_ingredient[rows], recipe_meal[rows], ingredients, meals
+
+
+def _arrow_dictionary(codes, values):
+    array = pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(values))
+    return pd.arrays.ArrowExtensionArray(array)
+
+
+def create_meal_g(
+    n: int = 5,
+    country: str = "italy",
+    seed: int | None = 0,
+    sparse: bool = False,
+) -> nx.DiGraph | tuple[scipy.sparse.csr_array, np.ndarray]:
     """
     Return a :class:`networkx.DiGraph` of ingredients and meals.
 
+    The ``n`` rows of :func:`create_meal_df` become edges from an ingredient
+    to a meal, weighted by how many rows they appear in.
+
     Parameters
     ----------
     n : int
         Length of the data.
     country : str
         Home country of food.
+    seed : int, optional
+        Seed of the random number generator, None for fresh entropy.
+    sparse : bool
+        Return a :class:`scipy.sparse.csr_array` adjacency matrix of the
+        weights and the array of node labels instead, for graphs too large
+        for NetworkX. Needs SciPy.
 
     Returns
     -------
-    networkx.DiGraph
+    networkx.DiGraph or (scipy.sparse.csr_array, numpy.ndarray)
 
 
     .. todo::
         Fix this and checkout :class:`networkx.DiGraph`.
-    """
-    ingredients = ['eggs', 'tomato', 'pasta', 'beef', 'bell pepper']
-    meals = ['omelette', 'pasta salad', 'spaghetti bolognese', 'spaghetti bolognese', 'stir fry']
-    df = pd.DataFrame({'ingredient': ingredients, 'meal': meals})
-    return nx.from_pandas_edgelist(df, source="ingredient", target="meal", create_using=nx.DiGraph)
 
+    .. networkx-compat::
+        :func:`networkx.from_pandas_edgelist`
 
-def reindex(df: pd.DataFrame) -> pd.DataFrame:
+        Edges always point from an ingredient to a meal.
+    """
+    sources, targets, weights, labels = _meal_edges(n, country, seed)
+    if sparse:
+        import scipy.sparse
+
+        adjacency = scipy.sparse.csr_array(
+            (weights, (sources, targets)), shape=(len(labels), len(labels))
+        )
+        return adjacency, labels
+
+    g = nx.DiGraph()
+    names = labels.tolist()
+    g.add_edges_from(
+        (names[source], names[target], {"weight": weight})
+        for source, target, weight in zip(
+            sources.tolist(), targets.tolist(), weights.tolist()
+        )
+    )
+    return g
+
+
+def _meal_edges(n, country, seed):
+    """Return the ingredient to meal edges of ``n`` rows, and node labels.
+
+    Nodes are numbered ingredients first, then meals. Rows are counted with
+    one ``bincount`` over the pair codes, so the cost is linear in ``n``
+    and the edges are unique.
+    """
+    ingredient_codes, meal_codes, ingredients, meals = _sample_recipes(
+        n, country, seed
+    )
+    pairs = ingredient_codes.astype(np.intp) * len(meals) + meal_codes
+    counts = np.bincount(pairs, minlength=len(ingredients) * len(meals))
+    edges = np.flatnonzero(counts)
+    sources = edges // len(meals)
+    targets = len(ingredients) + edges % len(meals)
+    labels = np.array(ingredients + meals)
+    return sources, targets, counts[edges], labels
+
+
+def reindex(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Use :meth:`pandas.DataFrame.reindex` and drop the first row of the
     :class:`pandas.DataFrame`.
@@ -61,6 +237,10 @@ def reindex(df: pd.DataFrame) -> pd.DataFrame:
     ----------
     df : pandas.DataFrame
         Pandas DataFrame.
+    copy : bool
+        Reindex on ``range(1, len(df))``, which copies every column. With
+        False, drop the first row by position instead, returning a view of
+        the data of ``df``.
 
     Returns
     -------
@@ -70,12 +250,19 @@ def reindex(df: pd.DataFrame) -> pd.DataFrame:
     .. pandas-compat::
         :meth:`pandas.DataFrame.reindex`
 
-        This function has no args or kwargs compared to the pandas version.
+        This function has no args or kwargs compared to the pandas version,
+        except ``copy``. ``copy=False`` slices by position, so it matches
+        the reindex only for a default :class:`pandas.RangeIndex`. Under
+        Copy-on-Write (always on from pandas 3.0) the view is copied on the
+        first write to either frame; without it, writing to the result
+        also modifies ``df``.
     """
+    if not copy:
+        return df.iloc[1:]
     return df.reindex(range(1, len(df)))
 
 
-def rename(df: pd.DataFrame) -> pd.DataFrame:
+def rename(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Use :meth:`pandas.DataFrame.rename` and rename the first
     column of :class:`pandas.DataFrame` "YO!".
@@ -84,6 +271,9 @@ def rename(df: pd.DataFrame) -> pd.DataFrame:
     ----------
     df : pandas.DataFrame
         Pandas DataFrame.
+    copy : bool
+        With False, only the column labels of a shallow copy are replaced,
+        so the data is never copied, even without Copy-on-Write.
 
     Returns
     -------
@@ -95,11 +285,32 @@ def rename(df: pd.DataFrame) -> pd.DataFrame:
 
         Unlike pandas rename, which offers way more flexibility than this,
         This function simply renames your first columns to "YO!".
+        ``copy=False`` shares the data with ``df``, as ``rename`` does under
+        Copy-on-Write. With :class:`pandas.MultiIndex` columns the first
+        label is a tuple, which rename only matches against the labels of
+        each level, so nothing is renamed.
     """
+    if not copy:
+        renamed = df.copy(deep=False)
+        # rename maps the labels of each level, which a tuple never matches
+        if not isinstance(df.columns, pd.MultiIndex):
+            # every column labelled like the first, NaN included, keeping the
+            # index name; get_loc gives a position, slice or mask
+            first = np.zeros(len(df.columns), dtype=bool)
+            first[df.columns.get_loc(df.columns[0])] = True
+            renamed.columns = df.columns.where(~first, "YO!")
+        return renamed
     return df.rename(columns={df.columns[0]: "YO!"})
 
 
-def to_numeric(s: pd.Series) -> pd.Series:
+def to_numeric(
+    s: pd.Series,
+    errors: str = "raise",
+    downcast: str | None = None,
+    engine: str = "pandas",
+    chunk_size: int = 1_000_000,
+    max_workers: int | None = None,
+) -> pd.Series:
     """
     Use :func:`pandas.to_numeric`.
 
@@ -107,6 +318,17 @@ def to_numeric(s: pd.Series) -> pd.Series:
     ----------
     s : pandas.Series
         Pandas Series.
+    errors : {"raise", "coerce"}
+        As in :func:`pandas.to_numeric`.
+    downcast : {"integer", "signed", "unsigned", "float"}, optional
+        As in :func:`pandas.to_numeric`, applied once to the whole result.
+    engine : {"pandas", "pyarrow"}
+        Parse the strings of each chunk with :func:`pandas.to_numeric`, or
+        with the :func:`pyarrow.compute.cast` kernels.
+    chunk_size : int
+        Number of elements converted at a time.
+    max_workers : int, optional
+        Convert the chunks on a pool of this many threads.
 
     Returns
     -------
@@ -116,9 +338,104 @@ def to_numeric(s: pd.Series) -> pd.Series:
     .. pandas-compat::
         :func:`pandas.to_numeric`
 
-        No differences.
+        With the default ``engine``, ``chunk_size`` and ``max_workers`` and a
+        Series shorter than ``chunk_size``, there are no differences. Otherwise
+        object and ``str`` Series are converted by chunks, and chunks of
+        strings that the ``pyarrow`` engine cannot parse fall back to pandas,
+        so the ``errors=`` semantics and result dtypes are kept; an error is
+        raised by converting the whole Series again, so its message matches
+        pandas. Integer and float chunks are concatenated as floats, other
+        chunks whose dtypes differ are converted again as a whole.
+        ``errors="ignore"`` and other dtypes, whose results are extension
+        arrays (``Int64``, ``Float64``, ...), are passed to pandas as a whole.
+        The ``pyarrow`` engine parses floats with correct rounding, as
+        :class:`float` does, so a float can differ from the one pandas parses
+        in its last bit.
     """
-    return pd.to_numeric(s)
+    if engine not in ("pandas", "pyarrow"):
+        raise ValueError(f"engine must be 'pandas' or 'pyarrow', got {engine!r}")
+    if (
+        errors == "ignore"
+        or not _numpy_result(s.dtype)
+        or (engine == "pandas" and max_workers is None and len(s) <= chunk_size)
+    ):
+        return pd.to_numeric(s, errors=errors, downcast=downcast)
+
+    convert = _to_numeric_arrow if engine == "pyarrow" else _to_numeric_pandas
+    chunks = [s.iloc[i : i + chunk_size] for i in range(0, len(s), chunk_size)]
+    try:
+        if max_workers is None:
+            values = [convert(chunk, errors) for chunk in chunks]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers) as pool:
+                values = list(pool.map(convert, chunks, [errors] * len(chunks)))
+    except ValueError:
+        # raise the error pandas raises, with the position in s
+        return pd.to_numeric(s, errors=errors, downcast=downcast)
+    dtypes = {v.dtype for v in values}
+    if len(dtypes) > 1 and not all(dtype.kind in "if" for dtype in dtypes):
+        # concatenating, say, uint64 and int64 chunks would give float64;
+        # int64 and float64 ones (a NaN from errors="coerce") give float64,
+        # as pandas does
+        return pd.to_numeric(s, errors=errors, downcast=downcast)
+
+    result = pd.Series(
+        np.concatenate(values) if values else np.array([], dtype=np.int64),
+        index=s.index,
+        name=s.name,
+        copy=False,
+    )
+    if downcast is not None:
+        result = pd.to_numeric(result, downcast=downcast)
+    return result
+
+
+def _numpy_result(dtype) -> bool:
+    """Whether :func:`pandas.to_numeric` converts ``dtype`` to a NumPy dtype."""
+    if dtype == object:
+        return True
+    # "str" (NaN for missing values), not "string" (pd.NA)
+    return isinstance(dtype, pd.StringDtype) and dtype.na_value is not pd.NA
+
+
+def _to_numeric_pandas(chunk, errors):
+    return pd.to_numeric(chunk, errors=errors).to_numpy()
+
+
+def _to_numeric_arrow(chunk, errors):
+    try:
+        array = pa.array(chunk, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # mixed Python objects
+        return _to_numeric_pandas(chunk, errors)
+    if not (pa.types.is_string(array.type) or pa.types.is_large_string(array.type)):
+        return _to_numeric_pandas(chunk, errors)
+
+    try:
+        converted = pc.cast(array, pa.float64())
+    except pa.ArrowInvalid:
+        return _to_numeric_pandas(chunk, errors)
+    if not pc.all(pc.is_finite(converted)).as_py():
+        # Arrow and pandas do not spell NaN and infinity alike
+        return _to_numeric_pandas(chunk, errors)
+    # a failing cast costs more than parsing, so integers are only tried
+    # when every value is integral
+    if pc.all(pc.equal(converted, pc.floor(converted))).as_py():
+        bounds = pc.min_max(converted)
+        low, high = bounds["min"].as_py() or 0, bounds["max"].as_py() or 0
+        # the bounds are rounded to float64
+        if low <= -(2**63) or high >= 2**63:
+            # pandas returns uint64 or objects beyond int64
+            return _to_numeric_pandas(chunk, errors)
+        try:
+            converted = pc.cast(array, pa.int64())
+        except pa.ArrowInvalid:
+            # integral floats, such as "1.0"
+            pass
+    # nulls become NaN, as with pandas
+    return converted.to_numpy(zero_copy_only=False)
 
 
 def empty(df: pd.DataFrame) -> bool:
@@ -143,45 +460,276 @@ def empty(df: pd.DataFrame) -> bool:
     return df.empty
 
 
-def from_arrow(t: pa.Table) -> pd.DataFrame:
+def from_arrow(
+    t: pa.Table,
+    arrow_dtypes: bool = False,
+    use_threads: bool = True,
+    split_blocks: bool = False,
+    self_destruct: bool = False,
+) -> pd.DataFrame:
     """
     Use :meth:`pyarrow.Table.to_pandas`.
 
     Parameters
     ----------
-    s : pandas.Series
-        Pandas Series.
+    t : pyarrow.Table
+        Arrow table.
+    arrow_dtypes : bool
+        Keep the Arrow buffers, as :class:`pandas.ArrowDtype` columns,
+        instead of converting them to NumPy.
+    use_threads : bool
+        Convert the columns in parallel.
+    split_blocks : bool
+        Give every column its own block, so they are not consolidated into
+        2D NumPy arrays.
+    self_destruct : bool
+        Release the memory of each column once converted. ``t`` must not be
+        used afterwards.
 
     Returns
     -------
-    pandas.Series
+    pandas.DataFrame
 
 
-    .. pandas-compat::
+    .. pyarrow-compat::
         :meth:`pyarrow.Table.to_pandas`
 
-        No differences.
+        By default every column is copied into consolidated NumPy blocks, as
+        with ``to_pandas()``, which holds the table twice at the peak.
+        ``arrow_dtypes=True`` passes ``types_mapper=pd.ArrowDtype`` and wraps
+        the Arrow buffers without copying them. ``split_blocks=True`` together
+        with ``self_destruct=True`` frees each Arrow column as soon as it is
+        converted, keeping the peak close to one copy. Use
+        :func:`from_arrow_batches` for data larger than memory.
+    """
+    options = _to_pandas_options(arrow_dtypes, use_threads, split_blocks, self_destruct)
+    return t.to_pandas(**options)
+
+
+def from_arrow_batches(
+    source: str | os.PathLike | pa.RecordBatchReader,
+    columns: list[str] | None = None,
+    arrow_dtypes: bool = False,
+    use_threads: bool = True,
+    split_blocks: bool = False,
+    self_destruct: bool = False,
+) -> Iterator[pd.DataFrame]:
     """
-    return t.to_pandas()
+    Yield a :class:`pandas.DataFrame` per record batch of ``source``.
 
+    Only one batch is converted at a time, so tables larger than memory can
+    be processed.
 
-def ewm(df: pd.DataFrame) -> pd.core.window.ewm.ExponentialMovingWindow:
+    Parameters
+    ----------
+    source : str, os.PathLike or pyarrow.RecordBatchReader
+        Path of an Arrow IPC file or stream, memory-mapped, or a reader.
+    columns : list of str, optional
+        Only convert these columns.
+    arrow_dtypes, use_threads, split_blocks, self_destruct : bool
+        As in :func:`from_arrow`.
+
+    Yields
+    ------
+    pandas.DataFrame
+    """
+    options = _to_pandas_options(arrow_dtypes, use_threads, split_blocks, self_destruct)
+    if isinstance(source, pa.RecordBatchReader):
+        batches = iter(source)
+    else:
+        batches = _read_ipc_batches(source)
+    for batch in batches:
+        if columns is not None:
+            batch = batch.select(columns)
+        yield batch.to_pandas(**options)
+        # drop our reference, so self_destruct can free the batch
+        del batch
+
+
+def _to_pandas_options(arrow_dtypes, use_threads, split_blocks, self_destruct):
+    return {
+        "types_mapper": pd.ArrowDtype if arrow_dtypes else None,
+        "use_threads": use_threads,
+        "split_blocks": split_blocks,
+        "self_destruct": self_destruct,
+    }
+
+
+def _read_ipc_batches(path):
+    with pa.memory_map(os.fspath(path)) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            # not the file format, read it as a stream
+            source.seek(0)
+            yield from pa.ipc.open_stream(source)
+        else:
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+
+
+# ewm decay arguments, in the order of get_center_of_mass
+EWM_PARAMETERS = ("com", "span", "halflife", "alpha")
+
+
+def ewm(
+    df: pd.DataFrame | pd.Series,
+    com: float | list[float] | None = None,
+    span: float | list[float] | None = None,
+    halflife: float | list[float] | None = None,
+    alpha: float | list[float] | None = None,
+    min_periods: int = 0,
+    adjust: bool = True,
+    ignore_na: bool = False,
+    var: bool = False,
+    bias: bool = False,
+) -> pd.core.window.ewm.ExponentialMovingWindow | pd.DataFrame:
     """
     Uses :meth:`pandas.DataFrame.ewm`.
 
     Parameters
     ----------
-    s : pandas.Series
-        Pandas Series.
+    df : pandas.DataFrame or pandas.Series
+        Pandas DataFrame, or Series.
+    com, span, halflife, alpha : float or list of float, optional
+        Decay, as in :meth:`pandas.DataFrame.ewm`. ``com=0.5`` if none is
+        given. Pass a list to compute the means of all of its values at once.
+    min_periods, adjust, ignore_na : optional
+        As in :meth:`pandas.DataFrame.ewm`.
+    var : bool
+        Compute the variances as well as the means of a list.
+    bias : bool
+        As in :meth:`pandas.core.window.ewm.ExponentialMovingWindow.var`.
 
     Returns
     -------
-    pandas.Series
+    pandas.core.window.ewm.ExponentialMovingWindow or pandas.DataFrame
+        The window of a single value, or the means of a list, with a column
+        level for its values first and, with ``var``, one for the
+        ``"mean"`` and ``"var"`` statistics. The columns of a Series are
+        these levels only.
 
 
     .. pandas-compat::
         :meth:`pandas.DataFrame.ewm`
 
-        No differences.
+        A list of values is computed in one pass over a float64 copy of
+        ``df``: the weighted sums are linear filters, run with
+        :func:`scipy.signal.lfilter` on all columns at once, as are the
+        squared deviations from the running means that variances sum up.
+        Results match looping over :meth:`pandas.DataFrame.ewm` to rounding.
+        Columns with missing values, whose weights differ, are still
+        computed by pandas, with one call per value. Needs SciPy.
+    """
+    given = {
+        name: value
+        for name, value in zip(EWM_PARAMETERS, (com, span, halflife, alpha))
+        if value is not None
+    }
+    options = {"min_periods": min_periods, "adjust": adjust, "ignore_na": ignore_na}
+    sequence = (list, tuple, np.ndarray, pd.Index)
+    if not any(isinstance(value, sequence) for value in given.values()):
+        return df.ewm(**(given or {"com": 0.5}), **options)
+    if len(given) > 1:
+        raise ValueError("comass, span, halflife, and alpha are mutually exclusive")
+    if isinstance(df, pd.Series):
+        result = ewm(df.to_frame(), **given, **options, var=var, bias=bias)
+        return result.droplevel(-1, axis=1)
+
+    (name, values), = given.items()
+    alphas = []
+    for v in values:
+        # validated as by pandas
+        arguments = [v if p == name else None for p in EWM_PARAMETERS]
+        alphas.append(1 / (1 + pd.core.window.ewm.get_center_of_mass(*arguments)))
+    stats = ["mean", "var"] if var else ["mean"]
+    # rows last, the layout of a pandas block, so the result is not copied
+    out = np.empty((len(alphas), len(stats), df.shape[1], len(df)))
+
+    numeric = all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes)
+    if numeric and len(df):
+        x = df.to_numpy(dtype=np.float64, na_value=np.nan).T
+        complete = ~np.isnan(x).any(axis=1)
+    else:
+        complete = np.zeros(df.shape[1], dtype=bool)
+    if complete.size and complete.all():
+        _ewm_filter(out, x, alphas, min_periods, adjust, var, bias)
+    elif complete.any():
+        part = np.empty(out.shape[:2] + (complete.sum(), len(df)))
+        _ewm_filter(part, x[complete], alphas, min_periods, adjust, var, bias)
+        out[:, :, complete] = part
+
+    missing = np.flatnonzero(~complete)
+    if len(missing):
+        subset = df.iloc[:, missing]
+        for k, v in enumerate(values):
+            window = subset.ewm(**{name: v}, **options)
+            out[k, 0, missing] = window.mean().to_numpy().T
+            if var:
+                out[k, 1, missing] = window.var(bias=bias).to_numpy().T
+
+    levels, names = [pd.Index(values), df.columns], [name, df.columns.name]
+    if var:
+        levels.insert(1, stats)
+        names.insert(1, "statistic")
+    columns = pd.MultiIndex.from_product(levels, names=names)
+    return pd.DataFrame(
+        out.reshape(len(columns), len(df)).T,
+        index=df.index,
+        columns=columns,
+        copy=False,
+    )
+
+
+def _ewm_filter(out, x, alphas, min_periods, adjust, var, bias):
+    """Fill ``out`` with the weighted means, and variances, of each alpha.
+
+    ``x`` holds a column without missing values per row. With weights
+    decaying by ``1 - alpha`` per step, the weighted sums are
+    ``y[t] = (1 - alpha) * y[t - 1] + b * x[t]``, one
+    :func:`scipy.signal.lfilter` call over all the columns. pandas weighs
+    new observations by ``b = 1`` with ``adjust``, otherwise by
+    ``b = alpha`` after a first weight of 1, which is the initial state.
+
+    The weighted sum of squared deviations from the running mean is updated
+    as pandas does, ``s[t] = (1 - alpha) * s[t - 1] + c[t] * d[t] ** 2``
+    with ``d[t] = x[t] - mean[t - 1]`` and
+    ``c[t] = (1 - alpha) * w[t - 1] * b / w[t]`` for the total weights
+    ``w``: a filter of non-negative terms, which does not cancel when the
+    data trends or shifts.
     """
-    return df.ewm(com=0.5)
+    from scipy.signal import lfilter
+
+    ones = np.ones(x.shape[1])
+    # centered, the sums of large values lose less to rounding
+    center = x.mean(axis=1, keepdims=True)
+    x = x - center
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for k, a in enumerate(alphas):
+            b = 1.0 if adjust else a
+            decay = [1.0, a - 1.0]
+            total, _ = lfilter([b], decay, ones, zi=[1 - b])
+            sums, _ = lfilter([b], decay, x, zi=(1 - b) * x[:, :1])
+            mean = out[k, 0]
+            np.divide(sums, total, out=mean)
+            if var:
+                terms = sums
+                terms[:, 0] = 0.0
+                np.subtract(x[:, 1:], mean[:, :-1], out=terms[:, 1:])
+                terms[:, 1:] **= 2
+                terms[:, 1:] *= (1 - a) * b * total[:-1] / total[1:]
+                squares = lfilter([1.0], decay, terms)
+                if bias:
+                    scale = 1 / total
+                else:
+                    decay2 = [1.0, -((1 - a) ** 2)]
+                    total2, _ = lfilter([b * b], decay2, ones, zi=[1 - b * b])
+                    scale = total / (total * total - total2)
+                cov = out[k, 1]
+                np.multiply(squares, scale, out=cov)
+                if not bias:
+                    # a single observation has no unbiased variance
+                    cov[:, 0] = np.nan
+            mean += center
+    out[..., : max(min_periods, 1) - 1] = np.nan
@@ -4,17 +4,34 @@
 # https://www.sphinx-doc.org/en/master/development/tutorials/todo.html
 from __future__ import annotations
 
-from typing import cast
+import functools
+import hashlib
+import json
+import operator
+import os
+import pickle
+import re
+from typing import NamedTuple, cast
 
 from docutils import nodes
 from docutils.nodes import Element
-from docutils.parsers.rst import Directive
+from docutils.parsers.rst import directives
 from docutils.parsers.rst.directives.admonitions import BaseAdmonition
 from sphinx import addnodes
 from sphinx.domains import Domain
 from sphinx.errors import NoUri
 from sphinx.locale import _ as get_translation_sphinx
+from sphinx.locale import __
+from sphinx.roles import XRefRole
+from sphinx.util import logging
 from sphinx.util.docutils import SphinxDirective, new_document
+from sphinx.util.nodes import make_refnode
+
+import listpages
+import parsecache
+from hooktimings import timed, timing
+
+logger = logging.getLogger(__name__)
 
 
 class PandasCompat(nodes.Admonition, nodes.Element):
@@ -33,150 +50,567 @@ def depart_PandasCompat_node(self, node):
     self.depart_admonition(node)
 
 
-class PandasCompatListDirective(Directive):
+def list_order(argument):
+    return directives.choice(argument, ("docname", "upstream"))
+
+
+class PandasCompatListDirective(SphinxDirective):
+    option_spec = {
+        "group-by": list_order,
+        "sort": list_order,
+        "per-page": directives.positive_int,
+    }
+
+    # the upstream library listed, set for each ``<name>-compat-list``
+    library = "pandas"
+
+    @timed("PandasCompatListDirective.run")
     def run(self):
-        return [PandasCompatList("")]
+        if not self.config.include_pandas_compat:
+            return []
+        domain = cast(PandasCompatDomain, self.env.get_domain("pandascompat"))
+        domain.note_pandascompat_list(self.env.docname)
+        return [
+            PandasCompatList(
+                "",
+                library=self.library,
+                group_by=self.options.get("group-by"),
+                sort=self.options.get("sort"),
+                per_page=self.options.get("per-page"),
+            )
+        ]
 
 
 class PandasCompatDirective(BaseAdmonition, SphinxDirective):
 
     # this enables content in the directive
     has_content = True
+    option_spec = {
+        **BaseAdmonition.option_spec,
+        # leave the note out of the compatsignatures comparison
+        "no-signature": directives.flag,
+    }
+
+    # the upstream library and its display label, set for each ``<name>-compat``
+    library = "pandas"
+    label = "Pandas"
 
+    @timed("PandasCompatDirective.run")
     def run(self):
-        targetid = "PandasCompat-%d" % self.env.new_serialno("PandasCompat")
+        # nothing is parsed nor collected, as if the directive was not there
+        if not self.config.include_pandas_compat:
+            return []
+        prefix = "%sCompat" % self.label.replace(" ", "")
+        targetid = "%s-%d" % (prefix, self.env.new_serialno(prefix))
         targetnode = nodes.target("", "", ids=[targetid])
 
+        title = get_translation_sphinx("%s Compatibility Note") % self.label
         PandasCompat_node = PandasCompat("\n".join(self.content))
-        PandasCompat_node += nodes.title(
-            get_translation_sphinx("Pandas Compatibility Note"),
-            get_translation_sphinx("Pandas Compatibility Note"),
-        )
+        PandasCompat_node += nodes.title(title, title)
         PandasCompat_node["docname"] = self.env.docname
-        PandasCompat_node["target"] = targetnode        
-        self.state.nested_parse(
-            self.content, self.content_offset, PandasCompat_node
-        )
-
-        if not hasattr(self.env, "PandasCompat_all_pandas_compat"):
-            self.env.PandasCompat_all_pandas_compat = []
-
-        self.env.PandasCompat_all_pandas_compat.append(
-            {
-                "docname": self.env.docname,
-                "PandasCompat": PandasCompat_node.deepcopy(),
-                "target": targetnode,
-            }
-        )
+        PandasCompat_node["library"] = self.library
+        PandasCompat_node["targetid"] = targetid
+        PandasCompat_node["no_signature"] = "no-signature" in self.options
+        with timing("PandasCompatDirective.nested_parse", self.env.docname):
+            parsecache.nested_parse(self, PandasCompat_node)
 
         return [targetnode, PandasCompat_node]
 
 
-def purge_PandasCompats(app, env, docname):
-    if not hasattr(env, "PandasCompat_all_pandas_compat"):
-        return
-
-    env.PandasCompat_all_pandas_compat = [
-        PandasCompat
-        for PandasCompat in env.PandasCompat_all_pandas_compat
-        if PandasCompat["docname"] != docname
-    ]
+class PandasCompatEntry(NamedTuple):
+    """A collected compat note, as stored in the pickled environment."""
+
+    docname: str
+    targetid: str
+    library: str
+    upstream: str
+    local: str
+    body: bytes
+    # hash of the rendered body, which does not depend on its position
+    digest: str
+
+    @classmethod
+    def from_node(cls, pandascompat: PandasCompat) -> PandasCompatEntry:
+        # detach the note, so its document is not pickled with it
+        body = pandascompat.deepcopy()
+        for node in body.findall():
+            node.document = None
+        body["ids"].clear()
+        return cls(
+            pandascompat["docname"],
+            pandascompat["targetid"],
+            pandascompat["library"],
+            upstream_target(pandascompat.rawsource),
+            local_object(pandascompat),
+            pickle.dumps(body, pickle.HIGHEST_PROTOCOL),
+            hashlib.sha256(body.pformat().encode()).hexdigest(),
+        )
 
+    def to_node(self) -> PandasCompat:
+        return pickle.loads(self.body)
 
-def merge_PandasCompats(app, env, docnames, other):
-    if not hasattr(env, "PandasCompat_all_pandas_compat"):
-        env.PandasCompat_all_pandas_compat = []
-    if hasattr(other, "PandasCompat_all_pandas_compat"):
-        env.PandasCompat_all_pandas_compat.extend(
-            other.PandasCompat_all_pandas_compat
-        )
+    def to_record(self, builder) -> dict[str, str]:
+        """Return the entry as a row of the compat matrix."""
+        try:
+            uri = builder.get_target_uri(self.docname) + "#" + self.targetid
+        except NoUri:
+            uri = ""
+        # the first child is the title added by the directive
+        text = "\n\n".join(child.astext() for child in self.to_node()[1:])
+        return {
+            "library": self.library,
+            "upstream": self.upstream,
+            "local": self.local,
+            "docname": self.docname,
+            "anchor": self.targetid,
+            "uri": uri,
+            "text": text,
+        }
+
+
+_UPSTREAM_ROLE = re.compile(r"^\s*(?::[\w.-]+)+:`(?P<target>[^`]+)`")
+
+
+def upstream_target(rawsource: str) -> str:
+    """Return the upstream object named by the role on the first line.
+
+    ``":meth:`pandas.DataFrame.reindex`"`` gives
+    ``"pandas.DataFrame.reindex"``; an empty string if there is no role.
+    """
+    match = _UPSTREAM_ROLE.match(rawsource)
+    if not match:
+        return ""
+    target = match.group("target")
+    if target.endswith(">") and "<" in target:
+        target = target[target.rindex("<") + 1 : -1]
+    return normalize_upstream(target)
+
+
+def normalize_upstream(target: str) -> str:
+    return target.strip().lstrip("~!.").removesuffix("()")
+
+
+def local_object(pandascompat: PandasCompat) -> str:
+    """Return the name of the documented object holding the note, if any."""
+    parent = pandascompat.parent
+    while parent is not None and not isinstance(parent, addnodes.desc):
+        parent = parent.parent
+    if parent is None:
+        return ""
+    signature = next(parent.findall(addnodes.desc_signature), None)
+    if signature is None:
+        return ""
+    if signature.get("fullname"):
+        module = signature.get("module")
+        fullname = signature["fullname"]
+        return f"{module}.{fullname}" if module else fullname
+    return signature["ids"][0] if signature["ids"] else ""
+
+
+class PandasCompatXRefRole(XRefRole):
+    """``:pandascompat:compat:`pandas.DataFrame.reindex``` links to its note."""
+
+    def process_link(self, env, refnode, has_explicit_title, title, target):
+        refnode["refdomain"] = "pandascompat"
+        target = normalize_upstream(target)
+        if not has_explicit_title:
+            title = target
+        return title, target
 
 
 class PandasCompatDomain(Domain):
     name = "pandascompat"
     label = "pandascompat"
+    roles = {"compat": PandasCompatXRefRole()}
+
+    def __init__(self, env):
+        super().__init__(env)
+        # Resolved ``pandas-compat-list`` content, built once per write phase.
+        # Kept off ``self.data`` so it is never pickled with the environment.
+        self.rendered_pandascompats = {}
 
     @property
-    def pandascompats(self):
+    def pandascompats(self) -> dict[str, list[PandasCompatEntry]]:
         return self.data.setdefault("pandascompats", {})
 
-    def clear_doc(self, docname):
-        self.pandascompats.pop(docname, None)
+    @property
+    def pandascompat_index(self) -> dict[str, list[PandasCompatEntry]]:
+        """Entries keyed by the upstream object they document."""
+        return self.data.setdefault("pandascompat_index", {})
+
+    @property
+    def pandascompat_lists(self):
+        """Docnames containing a ``pandas-compat-list`` directive."""
+        return self.data.setdefault("pandascompat_lists", set())
+
+    def note_pandascompat_list(self, docname):
+        self.pandascompat_lists.add(docname)
+
+    def content_hash(self) -> str:
+        """Return a hash of every collected compat entry."""
+        digest = hashlib.sha256()
+        for docname in sorted(self.pandascompats):
+            for pandascompat in self.pandascompats[docname]:
+                digest.update(pandascompat.docname.encode())
+                digest.update(b"\0" + pandascompat.targetid.encode())
+                digest.update(b"\0" + pandascompat.library.encode())
+                digest.update(b"\0" + pandascompat.upstream.encode())
+                digest.update(b"\0" + pandascompat.local.encode())
+                # not the pickled body, whose source lines move with any edit
+                # above the note
+                digest.update(b"\0" + pandascompat.digest.encode())
+        return digest.hexdigest()
+
+    def add_pandascompat(self, pandascompat: PandasCompatEntry) -> None:
+        self.pandascompats.setdefault(pandascompat.docname, []).append(pandascompat)
+        self.pandascompat_index.setdefault(pandascompat.upstream, []).append(
+            pandascompat
+        )
 
+    def get_pandascompats(self, library, group_by=None, sort=None):
+        """Return ``(group, entries)`` pairs for a ``<name>-compat-list``.
+
+        Groups and order are read from the docname or upstream keyed tables,
+        so no option needs a scan of every note per key.
+        """
+        if group_by is None:
+            entries = [
+                pandascompat
+                for _, pandascompats in self._ordered(sort)
+                for pandascompat in pandascompats
+                if pandascompat.library == library
+            ]
+            return [(None, entries)]
+
+        groups = []
+        for group, pandascompats in self._ordered(group_by):
+            entries = [
+                pandascompat
+                for pandascompat in pandascompats
+                if pandascompat.library == library
+            ]
+            if sort is not None and sort != group_by:
+                entries.sort(key=operator.attrgetter(sort))
+            if entries:
+                groups.append((group, entries))
+        return groups
+
+    def _ordered(self, key):
+        # Sorted, so the order does not depend on which documents were read
+        # last or by which parallel worker.
+        if key == "upstream":
+            return [
+                (upstream, sorted(entries, key=operator.attrgetter("docname")))
+                for upstream, entries in sorted(self.pandascompat_index.items())
+            ]
+        return sorted(self.pandascompats.items())
+
+    @timed("PandasCompatDomain.clear_doc")
+    def clear_doc(self, docname):
+        self.rendered_pandascompats.clear()
+        for pandascompat in self.pandascompats.pop(docname, ()):
+            entries = self.pandascompat_index[pandascompat.upstream]
+            entries.remove(pandascompat)
+            if not entries:
+                del self.pandascompat_index[pandascompat.upstream]
+        self.pandascompat_lists.discard(docname)
+
+    @timed("PandasCompatDomain.merge_domaindata")
     def merge_domaindata(self, docnames, otherdata):
+        self.rendered_pandascompats.clear()
+        # workers only hold the docnames they collected notes for
+        pandascompats = otherdata.get("pandascompats", {})
         for docname in docnames:
-            self.pandascompats[docname] = otherdata["pandascompats"][docname]
-
+            if docname in pandascompats:
+                self.pandascompats.setdefault(docname, [])
+                for pandascompat in pandascompats[docname]:
+                    self.add_pandascompat(pandascompat)
+            if docname in otherdata.get("pandascompat_lists", ()):
+                self.pandascompat_lists.add(docname)
+
+    @timed("PandasCompatDomain.process_doc")
     def process_doc(self, env, docname, document):
-        pandascompats = self.pandascompats.setdefault(docname, [])
+        if not env.config.include_pandas_compat:
+            return
+        self.rendered_pandascompats.clear()
+        self.pandascompats.setdefault(docname, [])
         for pandascompat in document.findall(PandasCompat):
             env.app.emit("pandascompat-defined", pandascompat)
-            pandascompats.append(pandascompat)
+            self.add_pandascompat(PandasCompatEntry.from_node(pandascompat))
+
+    def resolve_xref(self, env, fromdocname, builder, typ, target, node, contnode):
+        pandascompats = self.pandascompat_index.get(target)
+        if not pandascompats:
+            if typ == "compat":
+                logger.warning(
+                    __("no compat note for %r"),
+                    target,
+                    type="ref",
+                    subtype="compat",
+                    location=node,
+                )
+            return None
+        pandascompat = pandascompats[0]
+        return make_refnode(
+            builder,
+            fromdocname,
+            pandascompat.docname,
+            pandascompat.targetid,
+            contnode,
+            target,
+        )
+
+    def resolve_any_xref(self, env, fromdocname, builder, target, node, contnode):
+        # "any" tries every domain, so a missing note is not warned about
+        refnode = self.resolve_xref(
+            env, fromdocname, builder, "any", target, node, contnode
+        )
+        return [] if refnode is None else [("pandascompat:compat", refnode)]
+
+
+def skip_missing_compat_warning(app, domain, node):
+    """Keep nitpicky builds from warning again about a missing note."""
+    if domain is not None and domain.name == "pandascompat":
+        return True
+    return None
+
+
+@timed("get_outdated_pandascompat_lists")
+def get_outdated_pandascompat_lists(app, env):
+    """Rewrite the pages hosting a ``pandas-compat-list`` when notes changed.
+
+    The hash of the collected entries is kept in the environment, so pages
+    are only rewritten when a note was added, removed or edited.
+    """
+    domain = cast(PandasCompatDomain, env.get_domain("pandascompat"))
+    content_hash = domain.content_hash()
+    if domain.data.get("content_hash") == content_hash:
+        return []
+    domain.data["content_hash"] = content_hash
+    return sorted(domain.pandascompat_lists)
 
 
 class PandasCompatListProcessor:
     def __init__(self, app, doctree, docname):
+        self.app = app
         self.builder = app.builder
         self.config = app.config
         self.env = app.env
         self.domain = cast(PandasCompatDomain, app.env.get_domain("pandascompat"))
-        self.document = new_document("")
         self.process(doctree, docname)
 
+    @timed("PandasCompatListProcessor.process")
     def process(self, doctree: nodes.document, docname: str) -> None:
-        pandascompats = [v for vals in self.domain.pandascompats.values() for v in vals]
-        for node in doctree.findall(PandasCompatList):
-            if not self.config.include_pandas_compat:
-                node.parent.remove(node)
-                continue
+        if docname not in self.domain.pandascompat_lists:
+            return
 
-            content: list[Element | None] = [nodes.target()] if node.get("ids") else []
-
-            for pandascompat in pandascompats:
-                # Create a copy of the pandascompat node
-                new_pandascompat = pandascompat.deepcopy()
-                new_pandascompat["ids"].clear()
+        compat_lists = list(doctree.findall(PandasCompatList))
+        if not compat_lists:
+            return
 
-                self.resolve_reference(new_pandascompat, docname)
-                content.append(new_pandascompat)
+        for index, node in enumerate(compat_lists):
+            content: list[Element | None] = [nodes.target()] if node.get("ids") else []
 
-                ref = self.create_reference(pandascompat, docname)
-                content.append(ref)
+            groups = self.domain.get_pandascompats(
+                node["library"], node.get("group_by"), node.get("sort")
+            )
+            items = [
+                (group, pandascompat)
+                for group, pandascompats in groups
+                for pandascompat in pandascompats
+            ]
+            per_page = node.get("per_page")
+            if per_page:
+                # every page resolves its own notes, so they are never all
+                # held at once
+                render = self.render_entries
+            else:
+                render = functools.partial(
+                    self.render_entries, rendered=self.render(docname)
+                )
+            tag = "%s-compat" % node["library"]
+            if index:
+                tag += "-%d" % (index + 1)
+            content.extend(
+                listpages.paginate(self.app, docname, tag, items, per_page, render)
+            )
 
             node.replace_self(content)
 
+    def render_entries(self, items, pagename, rendered=None):
+        """Return the content listing ``(group, entry)`` *items* on *pagename*.
+
+        Without *rendered*, the notes are resolved for this call only.
+        """
+        if rendered is None:
+            notes = self.resolve_references(
+                [pandascompat.to_node() for _, pandascompat in items], pagename
+            )
+        else:
+            notes = [rendered[pandascompat].deepcopy() for _, pandascompat in items]
+
+        content = []
+        previous = None
+        for (group, pandascompat), note in zip(items, notes):
+            if group and group != previous:
+                content.append(nodes.rubric(group, group))
+            previous = group
+            content.append(note)
+            content.append(self.create_reference(pandascompat, pagename))
+        return content
+
+    @timed("PandasCompatListProcessor.render")
+    def render(self, docname: str) -> dict[PandasCompatEntry, PandasCompat]:
+        """Return the resolved list content, building it on first use.
+
+        Resolved references are relative to the page hosting the list, and
+        one to that page itself is only its anchor, so the content is built
+        for one page and not shared with its siblings. It holds the notes of
+        every upstream library, so all lists on a page share one resolve pass.
+        """
+        key = (self.builder.name, docname)
+        if key not in self.domain.rendered_pandascompats:
+            # only the page being written is kept
+            self.domain.rendered_pandascompats.clear()
+            pandascompats = [
+                v for _, vals in self.domain._ordered("docname") for v in vals
+            ]
+            new_pandascompats = self.resolve_references(
+                [pandascompat.to_node() for pandascompat in pandascompats], docname
+            )
+            self.domain.rendered_pandascompats[key] = dict(
+                zip(pandascompats, new_pandascompats)
+            )
+        return self.domain.rendered_pandascompats[key]
+
     def create_reference(self, pandascompat, docname):
         para = nodes.paragraph()
         newnode = nodes.reference("", "")
         innernode = nodes.emphasis(
             get_translation_sphinx("[source]"), get_translation_sphinx("[source]")
         )
-        newnode["refdocname"] = pandascompat["docname"]
+        newnode["refdocname"] = pandascompat.docname
         try:
             newnode["refuri"] = self.builder.get_relative_uri(
-                docname, pandascompat["docname"]
-            ) + "#" + pandascompat["target"]["refid"]
+                docname, pandascompat.docname
+            ) + "#" + pandascompat.targetid
         except NoUri:
             # ignore if no URI can be determined, e.g. for LaTeX output
-            pass        
+            pass
         newnode.append(innernode)
         para += newnode
         return para
 
-    def resolve_reference(self, todo, docname: str) -> None:
-        """Resolve references in the todo content."""
-        for node in todo.findall(addnodes.pending_xref):
-            if "refdoc" in node:
-                node["refdoc"] = docname
+    @timed("PandasCompatListProcessor.resolve_references")
+    def resolve_references(
+        self, pandascompats: list[PandasCompat], docname: str
+    ) -> list[PandasCompat]:
+        """Resolve references in the pandascompat contents in a single pass."""
+        for pandascompat in pandascompats:
+            for node in pandascompat.findall(addnodes.pending_xref):
+                if "refdoc" in node:
+                    node["refdoc"] = docname
 
         # Note: To resolve references, it is needed to wrap it with document node
-        self.document += todo
-        self.env.resolve_references(self.document, docname, self.builder)
-        self.document.remove(todo)
+        document = new_document("")
+        document.extend(pandascompats)
+        self.env.resolve_references(document, docname, self.builder)
+        resolved = document.children[:]
+        del document[:]
+        return resolved
+
+
+MATRIX_BATCH_SIZE = 1024
+
+
+def write_compat_matrix(app, exception):
+    """Write every compat entry to ``compat_matrix`` in the output directory.
+
+    Rows are streamed from the domain data, one entry at a time, as JSON
+    Lines, or as Parquet (needs pyarrow) if the file name ends in
+    ``.parquet``.
+    """
+    filename = app.config.compat_matrix
+    if not filename or exception is not None:
+        return
+
+    domain = cast(PandasCompatDomain, app.env.get_domain("pandascompat"))
+    records = (
+        pandascompat.to_record(app.builder)
+        for _, pandascompats in domain._ordered("docname")
+        for pandascompat in pandascompats
+    )
+    path = os.path.join(app.outdir, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if filename.endswith(".parquet"):
+        write_parquet(path, records)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    logger.info(__("compat matrix written to %s"), path)
+
+
+def write_parquet(path, records):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            (name, pa.string())
+            for name in (
+                "library", "upstream", "local", "docname", "anchor", "uri", "text"
+            )
+        ]
+    )
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == MATRIX_BATCH_SIZE:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                batch.clear()
+        # an empty batch still leaves a readable file with the schema
+        writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+
+
+# registered whatever compat_upstreams holds, its entries taking precedence
+DEFAULT_UPSTREAMS = {"pandas": "Pandas"}
+
+
+def register_upstreams(app, config):
+    """Add ``<name>-compat`` and ``<name>-compat-list`` for each upstream.
+
+    All upstreams share one domain, one collection pass and one list
+    processor, so declaring another upstream adds no per-page work. The
+    pandas pair is always there, so existing ``pandas-compat`` directives
+    keep working when ``compat_upstreams`` does not list pandas.
+    """
+    upstreams = {**DEFAULT_UPSTREAMS, **config.compat_upstreams}
+    for library, label in upstreams.items():
+        prefix = "%sCompat" % label.replace(" ", "")
+        directive = type(
+            f"{prefix}Directive",
+            (PandasCompatDirective,),
+            {"library": library, "label": label},
+        )
+        list_directive = type(
+            f"{prefix}ListDirective",
+            (PandasCompatListDirective,),
+            {"library": library},
+        )
+        app.add_directive(f"{library}-compat", directive, override=True)
+        app.add_directive(f"{library}-compat-list", list_directive, override=True)
 
 
 def setup(app):
-    app.add_config_value("include_pandas_compat", False, "html")
+    app.setup_extension("hooktimings")
+    app.setup_extension("listpages")
+    app.setup_extension("parsecache")
+    # "env": turning notes off must drop the ones already collected
+    app.add_config_value("include_pandas_compat", False, "env")
+    app.add_config_value("compat_upstreams", DEFAULT_UPSTREAMS, "env", dict)
+    app.add_config_value("compat_matrix", "", "", str)
     app.add_node(PandasCompatList)
     app.add_node(
         PandasCompat,
@@ -186,13 +620,16 @@ def setup(app):
         man=(visit_PandasCompat_node, depart_PandasCompat_node),
         texinfo=(visit_PandasCompat_node, depart_PandasCompat_node),
     )
-    app.add_directive("pandas-compat", PandasCompatDirective)
-    app.add_directive("pandas-compat-list", PandasCompatListDirective)
-    app.add_domain(PandasCompatDomain) 
+    app.add_domain(PandasCompatDomain)
+    app.connect("config-inited", register_upstreams)
+    app.connect("env-get-updated", get_outdated_pandascompat_lists)
+    app.connect("warn-missing-reference", skip_missing_compat_warning)
     app.connect("doctree-resolved", PandasCompatListProcessor)
+    app.connect("build-finished", write_compat_matrix)
 
     return {
         "version": "0.1",
+        "env_version": 6,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
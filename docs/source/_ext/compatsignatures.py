@@ -0,0 +1,298 @@
+"""Add the parameter differences with the upstream object to compat notes.
+
+For every ``<name>-compat`` note inside a documented function, the signature
+of the function is compared with the one of the upstream object named on
+the first line of the note, and the differences are appended to the note.
+``self`` is not compared. When the upstream object is a method and the
+local one a function, the first parameter of the function is the data the
+method works on and is not compared either. A note with the
+``:no-signature:`` option is left as it is.
+
+Upstream signatures are cached in the doctree directory, one file per
+object in a directory per library version, so they are only introspected
+again after the library was upgraded. Files are replaced atomically, so
+parallel workers can share the cache. The versions each document was
+compared against are kept in the environment, so upgrading a library
+reads the documents comparing with it again.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.metadata
+import inspect
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from docutils import nodes
+from sphinx.locale import _
+from sphinx.transforms import SphinxTransform
+from sphinx.util import logging
+
+from PandasCompat import PandasCompat, local_object, upstream_target
+
+if TYPE_CHECKING:
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+    from sphinx.util.typing import ExtensionMetadata
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRNAME = "compat_signatures"
+
+# name -> repr of the default, or None
+Parameters = dict[str, "str | None"]
+
+
+class Signature(NamedTuple):
+    parameters: Parameters
+    # whether the object is a method, whose self is left out
+    method: bool
+
+
+def import_object(name: str) -> Any:
+    """Return the object named by a dotted *name*, or None."""
+    parts = name.split(".")
+    for i in range(len(parts), 0, -1):
+        try:
+            obj = importlib.import_module(".".join(parts[:i]))
+        except ImportError:
+            continue
+        try:
+            for attr in parts[i:]:
+                obj = getattr(obj, attr)
+        except AttributeError:
+            return None
+        return obj
+    return None
+
+
+def is_method(name: str) -> bool:
+    """Whether *name* is a method taking ``self``, looked up on its class."""
+    owner, _, attr = name.rpartition(".")
+    cls = import_object(owner) if owner else None
+    if not inspect.isclass(cls):
+        return False
+    # class methods come bound, static methods take no self
+    attribute = inspect.getattr_static(cls, attr, None)
+    return (
+        callable(attribute)
+        and not inspect.isclass(attribute)
+        and not isinstance(attribute, (staticmethod, classmethod))
+    )
+
+
+def get_parameters(name: str) -> Signature | None:
+    """Introspect the parameters of *name*, without ``self``."""
+    obj = import_object(name)
+    if obj is None or not callable(obj):
+        return None
+    try:
+        signature = inspect.signature(obj)
+    except (TypeError, ValueError):
+        return None
+    method = is_method(name)
+    params = list(signature.parameters.values())[1 if method else 0 :]
+    return Signature(
+        {
+            param.name: None if param.default is param.empty else repr(param.default)
+            for param in params
+        },
+        method,
+    )
+
+
+def library_version(library: str) -> str | None:
+    try:
+        return importlib.metadata.version(library)
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    distributions = importlib.metadata.packages_distributions().get(library)
+    if distributions:
+        return importlib.metadata.version(distributions[0])
+    return None
+
+
+class SignatureCache:
+    """Upstream parameters, on disk per library version and in memory."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.signatures: dict[str, Signature | None] = {}
+        self.versions: dict[str, str | None] = {}
+
+    def version(self, library: str) -> str | None:
+        if library not in self.versions:
+            self.versions[library] = library_version(library)
+        return self.versions[library]
+
+    def get(self, target: str) -> Signature | None:
+        if target in self.signatures:
+            return self.signatures[target]
+
+        library = target.partition(".")[0]
+        version = self.version(library)
+        path = self.directory / f"{library}-{version}" / f"{target}.json"
+        if version is not None:
+            try:
+                data = json.loads(path.read_text())
+                self.signatures[target] = (
+                    None
+                    if data["parameters"] is None
+                    else Signature(data["parameters"], data["method"])
+                )
+                return self.signatures[target]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        signature = self.signatures[target] = get_parameters(target)
+        if version is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                if signature is None:
+                    json.dump({"parameters": None}, f)
+                else:
+                    json.dump(signature._asdict(), f)
+            os.replace(tmp, path)
+        return signature
+
+
+# set up at builder-inited, before parallel read workers are forked
+_cache: SignatureCache | None = None
+
+
+def literals(label: str, names: list[str]) -> nodes.list_item:
+    para = nodes.paragraph("", label)
+    for i, name in enumerate(names):
+        if i:
+            para += nodes.Text(", ")
+        para += nodes.literal(name, name)
+    return nodes.list_item("", para)
+
+
+def diff_parameters(local: Parameters, upstream: Parameters) -> list[nodes.list_item]:
+    """Return list items describing how *local* differs from *upstream*."""
+    items = []
+    missing = [name for name in upstream if name not in local]
+    if missing:
+        items.append(literals(_("Not supported: "), missing))
+    extra = [name for name in local if name not in upstream]
+    if extra:
+        items.append(literals(_("Not in upstream: "), extra))
+    for name, default in local.items():
+        if name in upstream and upstream[name] != default:
+            para = nodes.paragraph("", _("Default of "))
+            para += nodes.literal(name, name)
+            para += nodes.Text(_(" is "))
+            para += nodes.literal(str(default), str(default))
+            para += nodes.Text(_(" instead of "))
+            para += nodes.literal(str(upstream[name]), str(upstream[name]))
+            items.append(nodes.list_item("", para))
+    return items
+
+
+class CompatSignatureDiff(SphinxTransform):
+    """Append the parameter differences to every compat note."""
+
+    # before SphinxDomains, so the differences are collected with the note
+    default_priority = 840
+
+    def apply(self, **kwargs: Any) -> None:
+        if _cache is None:
+            return
+        for pandascompat in self.document.findall(PandasCompat):
+            if pandascompat.get("no_signature"):
+                continue
+            local = local_object(pandascompat)
+            upstream = upstream_target(pandascompat.rawsource)
+            if not local or not upstream:
+                continue
+
+            library = upstream.partition(".")[0]
+            versions = self.env.compat_signature_versions
+            versions.setdefault(self.env.docname, {})[library] = _cache.version(
+                library
+            )
+            local_signature = get_parameters(local)
+            upstream_signature = _cache.get(upstream)
+            if local_signature is None or upstream_signature is None:
+                logger.debug(
+                    "cannot compare the signatures of %s and %s", local, upstream
+                )
+                continue
+
+            local_parameters = local_signature.parameters
+            if upstream_signature.method and not local_signature.method:
+                # the data the upstream method works on
+                local_parameters = dict(list(local_parameters.items())[1:])
+            items = diff_parameters(local_parameters, upstream_signature.parameters)
+            title = _("Signature differences:") if items else _("Same parameters.")
+            pandascompat += nodes.paragraph("", "", nodes.strong(title, title))
+            if items:
+                pandascompat += nodes.bullet_list("", *items, bullet="-")
+
+
+def init_cache(app: Sphinx) -> None:
+    global _cache
+
+    # docname -> {library: version} of the upstream objects compared with
+    if not hasattr(app.env, "compat_signature_versions"):
+        app.env.compat_signature_versions = {}
+    if not app.config.include_pandas_compat:
+        _cache = None
+        return
+    _cache = SignatureCache(Path(app.doctreedir, CACHE_DIRNAME))
+
+
+def purge_versions(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+    env.compat_signature_versions.pop(docname, None)
+
+
+def merge_versions(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+) -> None:
+    for docname in docnames:
+        if docname in other.compat_signature_versions:
+            env.compat_signature_versions[docname] = (
+                other.compat_signature_versions[docname]
+            )
+
+
+def get_upgraded_docs(
+    app: Sphinx,
+    env: BuildEnvironment,
+    added: set[str],
+    changed: set[str],
+    removed: set[str],
+) -> list[str]:
+    """Read again the documents compared with a library since upgraded."""
+    if _cache is None:
+        return []
+    return [
+        docname
+        for docname, versions in env.compat_signature_versions.items()
+        if docname not in removed
+        and any(
+            _cache.version(library) != version
+            for library, version in versions.items()
+        )
+    ]
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.setup_extension("PandasCompat")
+    app.add_transform(CompatSignatureDiff)
+    app.connect("builder-inited", init_cache)
+    app.connect("env-purge-doc", purge_versions)
+    app.connect("env-merge-info", merge_versions)
+    app.connect("env-get-outdated", get_upgraded_docs)
+    return {
+        "version": "0.1",
+        "env_version": 2,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -0,0 +1,99 @@
+"""Write a report of the Python environment the docs were built with.
+
+Enabled with ``env_report = True``. The report lists the installed
+distributions (or ``conda list`` in a conda environment) and is cached in the
+doctree directory, keyed by a fingerprint of the installed distributions, so
+it is only regenerated after the environment changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sphinx.locale import __
+from sphinx.util import logging
+
+if TYPE_CHECKING:
+    from sphinx.application import Sphinx
+    from sphinx.util.typing import ExtensionMetadata
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "env_report.json"
+REPORT_FILENAME = "_environment.txt"
+
+
+def is_conda() -> bool:
+    return "CONDA_DEFAULT_ENV" in os.environ or "conda" in sys.executable
+
+
+def installed_distributions() -> list[tuple[str, str]]:
+    return sorted(
+        {(dist.name or "", dist.version) for dist in importlib.metadata.distributions()}
+    )
+
+
+def fingerprint(distributions: list[tuple[str, str]]) -> str:
+    digest = hashlib.sha256(f"{sys.executable}\0{sys.version}".encode())
+    for name, version in distributions:
+        digest.update(f"\0{name}=={version}".encode())
+    return digest.hexdigest()
+
+
+def make_report(distributions: list[tuple[str, str]]) -> str:
+    header = f"python {sys.version} ({sys.executable})\n\n"
+    if is_conda():
+        result = subprocess.run(
+            [os.environ.get("CONDA_EXE", "conda"), "list"],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            return header + "conda environment:\n" + result.stdout
+
+    width = max((len(name) for name, _ in distributions), default=0)
+    lines = [f"{name:<{width}} {version}" for name, version in distributions]
+    return header + "pip environment:\n" + "\n".join(lines) + "\n"
+
+
+def write_env_report(app: Sphinx) -> None:
+    if not app.config.env_report:
+        return
+
+    distributions = installed_distributions()
+    key = fingerprint(distributions)
+    cache_path = Path(app.doctreedir, CACHE_FILENAME)
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        cached = {}
+
+    if cached.get("fingerprint") == key:
+        report = cached["report"]
+    else:
+        report = make_report(distributions)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"fingerprint": key, "report": report}))
+
+    report_path = Path(app.outdir, REPORT_FILENAME)
+    if not report_path.is_file() or report_path.read_text() != report:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(report)
+        logger.info(__("environment report written to %s"), report_path)
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.add_config_value("env_report", False, "", bool)
+    app.connect("builder-inited", write_env_report)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -0,0 +1,207 @@
+"""Time the directives, domain hooks and processors of the local extensions.
+
+Enabled with ``hook_timings = True``. Every function decorated with
+:func:`timed`, and every block wrapped in :func:`timing`, records its call
+count and its cumulative and maximum time per docname. At ``build-finished``
+a report sorted by cumulative time is written to ``hook_timings.txt`` and
+``hook_timings.json`` in the output directory.
+
+Timings live on the environment, so the ones taken by parallel read workers
+are sent back and merged like any other environment data.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sphinx.locale import __
+from sphinx.util import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+    from sphinx.util.typing import ExtensionMetadata
+
+logger = logging.getLogger(__name__)
+
+# hook -> docname -> [calls, total, max, self]; None while disabled
+_timings: dict[str, dict[str, list[float]]] | None = None
+# time spent in nested timings, one entry per active timing
+_children: list[float] = []
+
+REPORT_LIMIT = 20
+
+
+class timing:
+    """Context manager timing a block as *hook* for *docname*."""
+
+    __slots__ = ("hook", "docname", "start")
+
+    def __init__(self, hook: str, docname: str) -> None:
+        self.hook = hook
+        self.docname = docname
+
+    def __enter__(self) -> None:
+        if _timings is not None:
+            _children.append(0.0)
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if _timings is None or not _children:
+            return
+        elapsed = time.perf_counter() - self.start
+        children = _children.pop()
+        if _children:
+            _children[-1] += elapsed
+
+        stats = _timings.setdefault(self.hook, {}).setdefault(
+            self.docname, [0, 0.0, 0.0, 0.0]
+        )
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        stats[3] += elapsed - children
+
+
+def timed(hook: str) -> Callable[[Callable], Callable]:
+    """Decorate a function so its calls are timed as *hook*.
+
+    The docname is taken from a ``docname`` parameter if the function has
+    one, otherwise from ``self.env.docname`` (e.g. for directives).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        params = list(inspect.signature(func).parameters)
+        index = params.index("docname") if "docname" in params else None
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _timings is None:
+                return func(*args, **kwargs)
+            if index is None:
+                env = getattr(args[0], "env", None) if args else None
+                docname = getattr(env, "docname", "")
+            elif "docname" in kwargs:
+                docname = kwargs["docname"]
+            else:
+                docname = args[index]
+            with timing(hook, docname):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def start_timings(app: Sphinx) -> None:
+    global _timings
+
+    _children.clear()
+    if app.config.hook_timings:
+        _timings = app.env.hook_timings = {}
+    else:
+        _timings = None
+        if hasattr(app.env, "hook_timings"):
+            del app.env.hook_timings
+
+
+def merge_timings(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+) -> None:
+    if _timings is None:
+        return
+    # a worker's copy also holds what was timed before it was forked, so only
+    # the documents it read are taken, replacing the main process' numbers
+    for hook, per_doc in getattr(other, "hook_timings", {}).items():
+        merged = _timings.setdefault(hook, {})
+        for docname in docnames:
+            if docname in per_doc:
+                merged[docname] = per_doc[docname]
+
+
+def make_report(timings: dict[str, dict[str, list[float]]]) -> dict[str, Any]:
+    hooks = []
+    documents: dict[str, dict[str, Any]] = {}
+    for hook, per_doc in timings.items():
+        hooks.append(
+            {
+                "hook": hook,
+                "calls": sum(stats[0] for stats in per_doc.values()),
+                "total": sum(stats[1] for stats in per_doc.values()),
+                "max": max(stats[2] for stats in per_doc.values()),
+            }
+        )
+        for docname, (calls, total, maximum, own) in per_doc.items():
+            document = documents.setdefault(
+                docname, {"docname": docname, "total": 0.0, "hooks": {}}
+            )
+            # nested timings are already part of their parent's total
+            document["total"] += own
+            document["hooks"][hook] = {"calls": calls, "total": total, "max": maximum}
+
+    return {
+        "hooks": sorted(hooks, key=lambda row: row["total"], reverse=True),
+        "documents": sorted(
+            documents.values(), key=lambda row: row["total"], reverse=True
+        ),
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    width = max((len(row["hook"]) for row in report["hooks"]), default=4)
+    lines = [
+        "Hooks (inclusive time, seconds)",
+        "",
+        f"{'hook':<{width}} {'calls':>8} {'total':>10} {'max':>10}",
+    ]
+    for row in report["hooks"]:
+        lines.append(
+            f"{row['hook']:<{width}} {row['calls']:>8} "
+            f"{row['total']:>10.4f} {row['max']:>10.4f}"
+        )
+
+    documents = report["documents"][:REPORT_LIMIT]
+    width = max((len(row["docname"] or "-") for row in documents), default=7)
+    lines += [
+        "",
+        f"Slowest {len(documents)} documents (seconds)",
+        "",
+        f"{'docname':<{width}} {'total':>10}  slowest hook",
+    ]
+    for row in documents:
+        slowest = max(row["hooks"], key=lambda hook: row["hooks"][hook]["total"])
+        lines.append(
+            f"{row['docname'] or '-':<{width}} {row['total']:>10.4f}  {slowest}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_report(app: Sphinx, exception: Exception | None) -> None:
+    if _timings is None or exception is not None:
+        return
+
+    report = make_report(_timings)
+    outdir = Path(app.outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    (outdir / "hook_timings.json").write_text(json.dumps(report, indent=2) + "\n")
+    (outdir / "hook_timings.txt").write_text(format_report(report))
+    logger.info(__("hook timings written to %s"), outdir / "hook_timings.txt")
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.add_config_value("hook_timings", False, "", bool)
+    app.connect("builder-inited", start_timings)
+    app.connect("env-merge-info", merge_timings)
+    app.connect("build-finished", write_report)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -0,0 +1,222 @@
+"""Serve intersphinx inventories from a local, vendored cache.
+
+Every remote inventory in :confval:`intersphinx_mapping` is stored once in
+``intersphinx_cache_dir`` as ``<name>.inv``, next to a ``manifest.json``
+recording where and when it was fetched. An inventory is only downloaded
+again when ``intersphinx_cache_ttl`` (in days) expires or its entry in
+``intersphinx_cache_versions`` changes; with ``intersphinx_cache_offline``
+the network is never used. The decoded inventories are pickled in the
+doctree directory, so builds skip both the download and the parsing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import posixpath
+import time
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sphinx.ext.intersphinx import InventoryAdapter
+from sphinx.locale import __
+from sphinx.util import logging, requests
+from sphinx.util.inventory import InventoryFile
+
+if TYPE_CHECKING:
+    from sphinx.application import Sphinx
+    from sphinx.util.typing import ExtensionMetadata
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+class InventoryCache:
+    """Vendored ``objects.inv`` files and their decoded form."""
+
+    def __init__(self, directory: Path, decoded_dir: Path) -> None:
+        self.directory = directory
+        self.decoded_dir = decoded_dir
+        try:
+            self.manifest: dict[str, dict[str, Any]] = json.loads(
+                (directory / MANIFEST_FILENAME).read_text()
+            )
+        except FileNotFoundError:
+            self.manifest = {}
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.inv"
+
+    def is_fresh(
+        self, name: str, uri: str, version: str | None, ttl: float | None, now: int
+    ) -> bool:
+        entry = self.manifest.get(name)
+        if entry is None or not self.path(name).is_file():
+            return False
+        if entry["uri"] != uri or entry.get("version") != version:
+            return False
+        return ttl is None or now - entry["fetched"] < ttl * 86400
+
+    def fetch(
+        self,
+        name: str,
+        uri: str,
+        location: str,
+        version: str | None,
+        timeout: float | None,
+        now: int,
+    ) -> None:
+        response = requests.get(location, timeout=timeout)
+        response.raise_for_status()
+        raw_data = response.content
+        # refuse to vendor anything that is not a valid inventory
+        InventoryFile.loads(raw_data, uri=uri)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path(name).write_bytes(raw_data)
+        self.manifest[name] = {
+            "uri": uri,
+            "location": location,
+            "version": version,
+            "fetched": now,
+        }
+        (self.directory / MANIFEST_FILENAME).write_text(
+            json.dumps(self.manifest, indent=2, sort_keys=True) + "\n"
+        )
+
+    def key(self, name: str, uri: str) -> str:
+        """Identify the decoded form of an inventory.
+
+        Decoded entries embed links joined with *uri*, so it is part of the key.
+        """
+        digest = hashlib.sha256(uri.encode())
+        digest.update(self.path(name).read_bytes())
+        return digest.hexdigest()
+
+    def load(self, name: str, uri: str, key: str) -> dict[str, Any]:
+        decoded = self.decoded_dir / f"{name}-{key[:16]}.pickle"
+        try:
+            with open(decoded, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        data = InventoryFile.loads(self.path(name).read_bytes(), uri=uri).data
+        self.decoded_dir.mkdir(parents=True, exist_ok=True)
+        with open(decoded, "wb") as f:
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        return data
+
+
+def load_vendored_inventories(app: Sphinx) -> None:
+    """Seed the intersphinx cache before ``sphinx.ext.intersphinx`` loads it.
+
+    Seeded entries are stamped with the current time, so intersphinx
+    considers them fresh and does not fetch them itself.
+    """
+    config = app.config
+    if not config.intersphinx_cache_dir:
+        return
+
+    cache = InventoryCache(
+        Path(app.confdir, config.intersphinx_cache_dir),
+        Path(app.doctreedir, "intersphinx_decoded"),
+    )
+    inventories = InventoryAdapter(app.env)
+    # name -> key of the decoded inventory already held by the environment
+    seeded: dict[str, str] = getattr(app.env, "intersphinx_cache_seeded", {})
+    now = int(time.time())
+    updated = False
+
+    for name, (uri, locations) in config.intersphinx_mapping.values():
+        location = locations[0] if locations else None
+        if location is None:
+            location = posixpath.join(uri, "objects.inv")
+        if "://" not in location:
+            # local inventories are already offline
+            continue
+
+        version = config.intersphinx_cache_versions.get(name)
+        if not config.intersphinx_cache_offline and not cache.is_fresh(
+            name, uri, version, config.intersphinx_cache_ttl, now
+        ):
+            logger.info(
+                __("refreshing intersphinx inventory '%s' from %s ..."), name, location
+            )
+            try:
+                cache.fetch(
+                    name, uri, location, version, config.intersphinx_timeout, now
+                )
+            except Exception as err:
+                logger.warning(
+                    __("failed to refresh intersphinx inventory '%s': %s"), name, err
+                )
+
+        if not cache.path(name).is_file():
+            if config.intersphinx_cache_offline:
+                logger.warning(
+                    __("no vendored intersphinx inventory for '%s' in %s"),
+                    name,
+                    cache.directory,
+                )
+                # an empty entry keeps intersphinx from going to the network;
+                # expire_placeholders backdates it once intersphinx is done
+                inventories.cache[uri] = (name, now, {})
+                seeded.pop(name, None)
+                updated = True
+            continue
+
+        key = cache.key(name, uri)
+        if seeded.get(name) == key and uri in inventories.cache:
+            inventories.cache[uri] = (name, now, inventories.cache[uri][2])
+            continue
+        inventories.cache[uri] = (name, now, cache.load(name, uri, key))
+        seeded[name] = key
+        updated = True
+
+    app.env.intersphinx_cache_seeded = seeded
+    if updated:
+        # same merge as sphinx.ext.intersphinx.load_mappings
+        inventories.clear()
+        for name, _expiry, invdata in sorted(
+            inventories.cache.values(), key=itemgetter(0, 1)
+        ):
+            inventories.named_inventory[name] = invdata
+            for objtype, objects in invdata.items():
+                inventories.main_inventory.setdefault(objtype, {}).update(objects)
+
+
+def expire_placeholders(app: Sphinx) -> None:
+    """Mark the empty entries of missing offline inventories as expired.
+
+    They only keep this build from fetching. Stamped with the current time,
+    they would still count as fresh for ``intersphinx_cache_limit`` days
+    once back online, leaving the references to them unresolved.
+    """
+    if not app.config.intersphinx_cache_offline:
+        return
+    cache = InventoryAdapter(app.env).cache
+    for uri, (name, _expiry, invdata) in list(cache.items()):
+        if not invdata:
+            cache[uri] = (name, 0, invdata)
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.setup_extension("sphinx.ext.intersphinx")
+    app.add_config_value("intersphinx_cache_dir", "", "", str)
+    app.add_config_value("intersphinx_cache_ttl", None, "", (int, float))
+    app.add_config_value("intersphinx_cache_versions", {}, "", dict)
+    app.add_config_value("intersphinx_cache_offline", False, "", bool)
+
+    # before sphinx.ext.intersphinx.load_mappings (priority 500)
+    app.connect("builder-inited", load_vendored_inventories, priority=400)
+    # once sphinx.ext.intersphinx.load_mappings has read the cache
+    app.connect("builder-inited", expire_placeholders, priority=600)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -0,0 +1,153 @@
+"""Split long collected lists across generated pages.
+
+``todolist`` and ``<name>-compat-list`` accept ``:per-page: N``. With an HTML
+builder, the page hosting the list keeps the first *N* entries and the others
+are written to ``<docname>-<tag>-<n>`` pages, each with links to the rest.
+Every extra page is built from its own doctree when it is written, so only
+one page worth of entries is held in memory at a time. Other builders get
+the whole list on the hosting page.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from docutils import nodes
+from sphinx.builders.html import StandaloneHTMLBuilder
+from sphinx.locale import _
+from sphinx.util.docutils import new_document
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+    from docutils.nodes import Node
+    from sphinx.application import Sphinx
+    from sphinx.util.typing import ExtensionMetadata
+
+
+class ListPage(NamedTuple):
+    """An extra page of a list, rendered when ``html-collect-pages`` fires."""
+
+    pagename: str
+    pagenames: list[str]
+    titles: list[str]
+    entries: Sequence[Any]
+    render: Callable[[Sequence[Any], str], list[Node]]
+
+
+# extra pages noted while the hosting pages are written
+_pending: list[ListPage] = []
+
+
+def paginate(
+    app: Sphinx,
+    docname: str,
+    tag: str,
+    entries: Sequence[Any],
+    per_page: int | None,
+    render: Callable[[Sequence[Any], str], list[Node]],
+) -> list[Node]:
+    """Return the content of the list on *docname*.
+
+    ``render(entries, pagename)`` builds the nodes for *entries* as shown on
+    *pagename*. The pages after the first are noted, and rendered later by
+    :func:`collect_pages`.
+    """
+    if (
+        not per_page
+        or len(entries) <= per_page
+        or not isinstance(app.builder, StandaloneHTMLBuilder)
+    ):
+        return render(entries, docname)
+
+    chunks = [entries[i : i + per_page] for i in range(0, len(entries), per_page)]
+    pagenames = [docname] + [
+        f"{docname}-{tag}-{number}" for number in range(2, len(chunks) + 1)
+    ]
+    title = app.env.titles[docname].astext()
+    titles = [title] + [
+        _("%s (page %d of %d)") % (title, number, len(chunks))
+        for number in range(2, len(chunks) + 1)
+    ]
+    for pagename, chunk in zip(pagenames[1:], chunks[1:]):
+        _pending.append(ListPage(pagename, pagenames, titles, chunk, render))
+
+    return render(chunks[0], docname) + [navigation(app, docname, pagenames)]
+
+
+def navigation(app: Sphinx, pagename: str, pagenames: list[str]) -> nodes.paragraph:
+    para = nodes.paragraph(classes=["list-pages"])
+    para += nodes.Text(_("Pages:"))
+    for number, other in enumerate(pagenames, start=1):
+        para += nodes.Text(" ")
+        if other == pagename:
+            para += nodes.strong(str(number), str(number))
+        else:
+            para += nodes.reference(
+                str(number),
+                str(number),
+                internal=True,
+                refuri=app.builder.get_relative_uri(pagename, other),
+            )
+    return para
+
+
+def clear_pending(app: Sphinx) -> None:
+    _pending.clear()
+
+
+def collect_pages(app: Sphinx) -> Iterator[tuple[str, dict[str, Any], str]]:
+    builder = app.builder
+    while _pending:
+        page = _pending.pop(0)
+        index = page.pagenames.index(page.pagename)
+        title = page.titles[index]
+
+        section = nodes.section(ids=[nodes.make_id(page.pagename)])
+        section += nodes.title(title, title)
+        section.extend(page.render(page.entries, page.pagename))
+        section += navigation(app, page.pagename, page.pagenames)
+        document = new_document(page.pagename, builder.docsettings)
+        document += section
+
+        # the same as StandaloneHTMLBuilder.write_doc; render_partial would
+        # apply docutils' admonition transform, which only knows its own nodes
+        builder.current_docname = page.pagename
+        visitor = builder.create_translator(document, builder)
+        document.walkabout(visitor)
+        body = "".join(visitor.fragment)
+
+        def link(other: int) -> dict[str, str]:
+            return {
+                "link": builder.get_relative_uri(page.pagename, page.pagenames[other]),
+                "title": page.titles[other],
+            }
+
+        yield (
+            page.pagename,
+            {
+                "title": title,
+                "body": body,
+                "parents": [link(0)],
+                "prev": link(index - 1),
+                "next": link(index + 1) if index + 1 < len(page.pagenames) else None,
+                "meta": None,
+                "metatags": "",
+                "rellinks": builder.globalcontext["rellinks"][:],
+                "sourcename": "",
+                "toc": "",
+                "display_toc": False,
+                "page_source_suffix": "",
+            },
+            "page.html",
+        )
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.connect("builder-inited", clear_pending)
+    app.connect("html-collect-pages", collect_pages)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
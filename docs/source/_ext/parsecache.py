@@ -0,0 +1,266 @@
+"""Cache the content parsed by the ``<name>-compat`` and ``todo`` directives.
+
+The body of a note is parsed again every time its page is read, although
+most notes live in docstrings that rarely change. The parsed nodes are
+stored in the doctree directory, one file per document, each note keyed by
+a hash of its content and of the reference context it is parsed in. The
+files also depend on the versions of Sphinx, docutils and every loaded
+extension. They survive an environment reset, and a note is only reused
+for the exact same content. A file is replaced atomically once its document
+is read, with the notes found in this read only.
+
+Content that does more than produce nodes is parsed every time: anything
+with ids or names (targets, index entries, footnotes, nested notes), parse
+errors, pending transforms, includes, and directives changing the current
+module, role or domain. Disable the cache with ``parse_cache = False``.
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import TYPE_CHECKING, NamedTuple
+
+import docutils
+import sphinx
+from docutils import nodes
+
+if TYPE_CHECKING:
+    from docutils.nodes import Element, Node
+    from sphinx.application import Sphinx
+    from sphinx.util.docutils import SphinxDirective
+    from sphinx.util.typing import ExtensionMetadata
+
+CACHE_DIRNAME = "parse_cache"
+
+# bump when the layout of the cached files changes
+CACHE_FORMAT = 2
+
+
+class Entry(NamedTuple):
+    """Parsed content, as it was stored."""
+
+    offset: int
+    source: str
+    # pickled list of detached nodes, only unpickled when used
+    children: bytes
+    # the source and line the parse left the document at, which are given
+    # to the nodes added next without their own
+    end_source: str | None
+    end_line: int | None
+
+
+class ParseCache:
+    """Parsed directive content, on disk per document."""
+
+    def __init__(self, directory: str, salt: bytes) -> None:
+        self.directory = directory
+        self.salt = salt
+        # the document being read, its stored entries and the ones used
+        self.docname: str | None = None
+        self.stored: dict[str, Entry] = {}
+        self.used: dict[str, Entry | None] = {}
+
+    def path(self, docname: str) -> str:
+        # plain strings, Path objects cost more than the parsing saved
+        digest = hashlib.sha256(self.salt + docname.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pickle")
+
+    def key(self, directive: SphinxDirective) -> str:
+        env = directive.env
+        current = env.current_document
+        digest = hashlib.sha256()
+        for part in (
+            directive.name,
+            sorted(env.ref_context.items()),
+            current.default_role,
+            current.default_domain and current.default_domain.name,
+            current.highlight_language,
+            "\n".join(directive.content),
+        ):
+            digest.update(repr(part).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, docname: str, key: str) -> Entry | None:
+        if docname != self.docname:
+            self.docname = docname
+            self.stored = self.load(docname)
+            self.used = {}
+        if key not in self.used:
+            self.used[key] = self.stored.get(key)
+        return self.used[key]
+
+    def add(self, key: str, entry: Entry) -> None:
+        self.used[key] = entry
+
+    def load(self, docname: str) -> dict[str, Entry]:
+        try:
+            with open(self.path(docname), "rb") as f:
+                # much faster than pickle.load on the file
+                data = f.read()
+            return pickle.loads(data)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            return {}
+
+    def save(self, docname: str) -> None:
+        """Store the entries used while *docname* was read, when changed."""
+        if docname != self.docname:
+            return
+        used = {key: entry for key, entry in self.used.items() if entry is not None}
+        if used != self.stored:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(used, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path(docname))
+        self.docname = None
+        self.stored = {}
+        self.used = {}
+
+
+# set up at builder-inited, before parallel read workers are forked
+_cache: ParseCache | None = None
+
+
+def context(directive: SphinxDirective) -> tuple:
+    """What parsing may change besides the nodes it returns."""
+    env = directive.env
+    current = env.current_document
+    return (
+        dict(env.ref_context),
+        current.default_role,
+        current.default_domain,
+        current.highlight_language,
+        len(env.dependencies[env.docname]),
+    )
+
+
+def cacheable(children: list[Node]) -> bool:
+    for child in children:
+        for node in child.findall(nodes.Element):
+            if isinstance(
+                node, (nodes.system_message, nodes.problematic, nodes.pending)
+            ):
+                return False
+            if node["ids"] or node["names"] or "refname" in node or "refid" in node:
+                return False
+    return True
+
+
+def dumps(children: list[Node]) -> bytes:
+    """Pickle *children* without their parent and document, which are only
+    cleared while pickling; a detached copy costs more to make."""
+    parents = [(child, child.parent) for child in children]
+    documents = [
+        (descendant, descendant.document)
+        for child in children
+        for descendant in child.findall()
+    ]
+    try:
+        for child, _ in parents:
+            child.parent = None
+        for descendant, _ in documents:
+            descendant.document = None
+        return pickle.dumps(children, pickle.HIGHEST_PROTOCOL)
+    finally:
+        for child, parent in parents:
+            child.parent = parent
+        for descendant, document in documents:
+            descendant.document = document
+
+
+def nested_parse(directive: SphinxDirective, node: Element) -> None:
+    """Parse the content of *directive* into *node*, through the cache."""
+    content = directive.content
+    offset = directive.content_offset
+    if _cache is None or not content:
+        directive.state.nested_parse(content, offset, node)
+        return
+
+    key = _cache.key(directive)
+    source = content.source(0)
+    entry = _cache.get(directive.env.docname, key)
+    if entry is not None:
+        document = directive.state.document
+        # the nodes are small but many; with a large heap, collections
+        # triggered while unpickling them cost more than the parsing saved
+        gc.disable()
+        try:
+            children = pickle.loads(entry.children)
+        finally:
+            gc.enable()
+        shift = offset - entry.offset
+        for child in children:
+            for descendant in child.findall():
+                descendant.document = document
+            for element in child.findall(nodes.Element):
+                if element.source == entry.source:
+                    element.source = source
+                # a node without a line keeps none
+                if element.line is not None:
+                    element.line += shift
+            # not node.extend, which gives the current line to the children
+            # without one
+            child.parent = node
+        node.children.extend(children)
+        document.current_source = (
+            source if entry.end_source == entry.source else entry.end_source
+        )
+        document.current_line = (
+            None if entry.end_line is None else entry.end_line + shift
+        )
+        return
+
+    before = context(directive)
+    start = len(node)
+    directive.state.nested_parse(content, offset, node)
+    children = node.children[start:]
+    if context(directive) == before and cacheable(children):
+        document = directive.state.document
+        _cache.add(
+            key,
+            Entry(
+                offset,
+                source,
+                dumps(children),
+                document.current_source,
+                document.current_line,
+            ),
+        )
+
+
+def init_cache(app: Sphinx) -> None:
+    global _cache
+
+    if not app.config.parse_cache:
+        _cache = None
+        return
+    versions = [
+        CACHE_FORMAT,
+        sphinx.__version__,
+        docutils.__version__,
+        sorted((name, ext.version) for name, ext in app.extensions.items()),
+        app.config.default_role,
+    ]
+    directory = os.path.join(os.fspath(app.doctreedir), CACHE_DIRNAME)
+    _cache = ParseCache(directory, repr(versions).encode())
+
+
+def save_document(app: Sphinx, doctree: nodes.document) -> None:
+    if _cache is not None:
+        _cache.save(app.env.docname)
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.add_config_value("parse_cache", True, "", bool)
+    app.connect("builder-inited", init_cache)
+    app.connect("doctree-read", save_document)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -13,7 +13,10 @@ from typing import TYPE_CHECKING, Any, ClassVar, cast
 
 from docutils import nodes
 from docutils.parsers.rst import directives
-from docutils.parsers.rst.directives.admonitions import BaseAdmonition
+from docutils.parsers.rst.directives.admonitions import (
+    BaseAdmonition,
+    normalize_options,
+)
 
 import sphinx
 from sphinx import addnodes
@@ -23,6 +26,10 @@ from sphinx.locale import _, __
 from sphinx.util import logging, texescape
 from sphinx.util.docutils import SphinxDirective, new_document
 
+import listpages
+import parsecache
+from hooktimings import timed
+
 if TYPE_CHECKING:
     from docutils.nodes import Element, Node
 
@@ -58,22 +65,24 @@ class Todo(BaseAdmonition, SphinxDirective):
         "name": directives.unchanged,
     }
 
+    @timed("Todo.run")
     def run(self) -> list[Node]:
+        # nothing is parsed nor collected, as if the directive was not there
+        if not self.config.todo_include_todos and not self.config.todo_emit_warnings:
+            return []
         if not self.options.get("class"):
             self.options["class"] = ["admonition-todo"]
 
-        (todo,) = super().run()
-        if isinstance(todo, nodes.system_message):
-            return [todo]
-        elif isinstance(todo, todo_node):
-            todo.insert(0, nodes.title(text=_("Todo")))
-            todo["docname"] = self.env.docname
-            self.add_name(todo)
-            self.set_source_info(todo)
-            self.state.document.note_explicit_target(todo)
-            return [todo]
-        else:
-            raise RuntimeError  # never reached here
+        # BaseAdmonition.run, with the content parsed through the cache
+        self.assert_has_content()
+        todo = todo_node("\n".join(self.content), **normalize_options(self.options))
+        todo += nodes.title(text=_("Todo"))
+        parsecache.nested_parse(self, todo)
+        todo["docname"] = self.env.docname
+        self.add_name(todo)
+        self.set_source_info(todo)
+        self.state.document.note_explicit_target(todo)
+        return [todo]
 
 
 class TodoDomain(Domain):
@@ -84,20 +93,39 @@ class TodoDomain(Domain):
     def todos(self) -> dict[str, list[todo_node]]:
         return self.data.setdefault("todos", {})
 
+    @property
+    def todolists(self) -> set[str]:
+        """Docnames containing a ``todolist`` directive."""
+        return self.data.setdefault("todolists", set())
+
+    def note_todolist(self, docname: str) -> None:
+        self.todolists.add(docname)
+
+    @timed("TodoDomain.clear_doc")
     def clear_doc(self, docname: str) -> None:
         self.todos.pop(docname, None)
+        self.todolists.discard(docname)
 
+    @timed("TodoDomain.merge_domaindata")
     def merge_domaindata(self, docnames: list[str], otherdata: dict[str, Any]) -> None:
+        # workers only hold the docnames they collected todos for
+        todos = otherdata.get("todos", {})
         for docname in docnames:
-            self.todos[docname] = otherdata["todos"][docname]
+            if docname in todos:
+                self.todos[docname] = todos[docname]
+            if docname in otherdata.get("todolists", ()):
+                self.todolists.add(docname)
 
+    @timed("TodoDomain.process_doc")
     def process_doc(
         self, env: BuildEnvironment, docname: str, document: nodes.document
     ) -> None:
+        if not env.config.todo_include_todos and not env.config.todo_emit_warnings:
+            return
         todos = self.todos.setdefault(docname, [])
         for todo in document.findall(todo_node):
             env.app.emit("todo-defined", todo)
-            todos.append(todo)
+            todos.append(detach_todo(todo))
 
             if env.config.todo_emit_warnings:
                 logger.warning(
@@ -105,6 +133,18 @@ class TodoDomain(Domain):
                 )
 
 
+def detach_todo(todo: todo_node) -> todo_node:
+    """Return a copy of *todo* that does not reference its document.
+
+    Domain data is pickled with the environment, and sent back by every
+    worker of a parallel read; the live node would drag its doctree along.
+    """
+    new_todo = todo.deepcopy()
+    for node in new_todo.findall():
+        node.document = None
+    return new_todo
+
+
 class TodoList(SphinxDirective):
     """
     A list of all todo entries.
@@ -114,50 +154,79 @@ class TodoList(SphinxDirective):
     required_arguments = 0
     optional_arguments = 0
     final_argument_whitespace = False
-    option_spec: ClassVar[OptionSpec] = {}
+    option_spec: ClassVar[OptionSpec] = {
+        "per-page": directives.positive_int,
+    }
 
+    @timed("TodoList.run")
     def run(self) -> list[Node]:
+        if not self.config.todo_include_todos:
+            return []
         # Simply insert an empty todolist node which will be replaced later
         # when process_todo_nodes is called
-        return [todolist("")]
+        domain = cast(TodoDomain, self.env.get_domain("todo"))
+        domain.note_todolist(self.env.docname)
+        return [todolist("", per_page=self.options.get("per-page"))]
 
 
 class TodoListProcessor:
     def __init__(self, app: Sphinx, doctree: nodes.document, docname: str) -> None:
+        self.app = app
         self.builder = app.builder
         self.config = app.config
         self.env = app.env
         self.domain = cast(TodoDomain, app.env.get_domain("todo"))
-        self.document = new_document("")
 
         self.process(doctree, docname)
 
+    @timed("TodoListProcessor.process")
     def process(self, doctree: nodes.document, docname: str) -> None:
+        if docname not in self.domain.todolists:
+            return
+
+        self.document = new_document("")
+        # sorted, so the order does not depend on the parallel read workers
         todos: list[todo_node] = functools.reduce(
-            operator.iadd, self.domain.todos.values(), []
+            operator.iadd,
+            (self.domain.todos[docname] for docname in sorted(self.domain.todos)),
+            [],
         )
-        for node in list(doctree.findall(todolist)):
-            if not self.config.todo_include_todos:
-                node.parent.remove(node)
-                continue
-
+        for index, node in enumerate(list(doctree.findall(todolist))):
             if node.get("ids"):
                 content: list[Element] = [nodes.target()]
             else:
                 content = []
 
-            for todo in todos:
-                # Create a copy of the todo node
-                new_todo = todo.deepcopy()
-                new_todo["ids"].clear()
+            tag = "todo-%d" % (index + 1) if index else "todo"
+            content.extend(
+                listpages.paginate(
+                    self.app,
+                    docname,
+                    tag,
+                    todos,
+                    node.get("per_page"),
+                    self.render_todos,
+                )
+            )
 
-                self.resolve_reference(new_todo, docname)
-                content.append(new_todo)
+            node.replace_self(content)
 
-                todo_ref = self.create_todo_reference(todo, docname)
-                content.append(todo_ref)
+    def render_todos(self, todos: list[todo_node], pagename: str) -> list[Element]:
+        new_todos = []
+        for todo in todos:
+            # Create a copy of the todo node
+            new_todo = todo.deepcopy()
+            new_todo["ids"].clear()
+            new_todos.append(new_todo)
 
-            node.replace_self(content)
+        content: list[Element] = []
+        new_todos = self.resolve_references(new_todos, pagename)
+        for todo, new_todo in zip(todos, new_todos):
+            content.append(new_todo)
+
+            todo_ref = self.create_todo_reference(todo, pagename)
+            content.append(todo_ref)
+        return content
 
     def create_todo_reference(self, todo: todo_node, docname: str) -> nodes.paragraph:
         if self.config.todo_link_only:
@@ -191,16 +260,20 @@ class TodoListProcessor:
 
         return para
 
-    def resolve_reference(self, todo: todo_node, docname: str) -> None:
-        """Resolve references in the todo content."""
-        for node in todo.findall(addnodes.pending_xref):
-            if "refdoc" in node:
-                node["refdoc"] = docname
+    @timed("TodoListProcessor.resolve_references")
+    def resolve_references(self, todos: list[todo_node], docname: str) -> list[Node]:
+        """Resolve references in the todo contents in a single pass."""
+        for todo in todos:
+            for node in todo.findall(addnodes.pending_xref):
+                if "refdoc" in node:
+                    node["refdoc"] = docname
 
         # Note: To resolve references, it is needed to wrap it with document node
-        self.document += todo
+        self.document.extend(todos)
         self.env.resolve_references(self.document, docname, self.builder)
-        self.document.remove(todo)
+        resolved = self.document.children[:]
+        del self.document[:]
+        return resolved
 
 
 def visit_todo_node(self: HTML5Translator, node: todo_node) -> None:
@@ -232,10 +305,14 @@ def latex_depart_todo_node(self: LaTeXTranslator, node: todo_node) -> None:
 
 
 def setup(app: Sphinx) -> ExtensionMetadata:
+    app.setup_extension("hooktimings")
+    app.setup_extension("listpages")
+    app.setup_extension("parsecache")
     app.add_event("todo-defined")
-    app.add_config_value("todo_include_todos", False, "html")
+    # "env": turning todos off must drop the ones already collected
+    app.add_config_value("todo_include_todos", False, "env")
     app.add_config_value("todo_link_only", False, "html")
-    app.add_config_value("todo_emit_warnings", False, "html")
+    app.add_config_value("todo_emit_warnings", False, "env")
 
     app.add_node(todolist)
     app.add_node(
@@ -253,6 +330,7 @@ def setup(app: Sphinx) -> ExtensionMetadata:
     app.connect("doctree-resolved", TodoListProcessor)
     return {
         "version": sphinx.__display_version__,
-        "env_version": 2,
+        "env_version": 4,
         "parallel_read_safe": True,
+        "parallel_write_safe": True,
     }
@@ -1,16 +1,8 @@
 import os
 import pathlib
-import subprocess
 import sys
 sys.path.insert(0, pathlib.Path(__file__).parents[2].resolve().as_posix())
 sys.path.append(os.path.abspath("./_ext"))
-print(f"{sys.path=}")
-if "CONDA_DEFAULT_ENV" in os.environ or "conda" in sys.executable:
-    print("conda environment:")
-    subprocess.run([os.environ.get("CONDA_EXE", "conda"), "list"])
-else:
-    print("pip environment:")
-    subprocess.run([sys.executable, "-m", "pip", "list"])
 project = "compatsphinxext"
 copyright = "2024, RAPIDS contrib"
 author = "RAPIDS contrib"
@@ -21,8 +13,11 @@ extensions = [
     "sphinx.ext.autosummary",
     "sphinx.ext.githubpages",
     "sphinx.ext.intersphinx",
+    "intersphinx_cache",
     "PandasCompat",
+    "compatsignatures",
     "todo",
+    "envreport",
 ]
 
 exclude_patterns = []
@@ -36,10 +31,34 @@ templates_path = ["_templates"]
 
 include_pandas_compat = True
 
+# every compat note, one JSON object per line, for coverage dashboards
+compat_matrix = "compat_matrix.jsonl"
+
+compat_upstreams = {
+    "pandas": "Pandas",
+    "networkx": "NetworkX",
+    "numpy": "NumPy",
+    "pyarrow": "PyArrow",
+}
+
 todo_include_todos = True
 
 autosummary_generate = True
 
+# build with ``-D env_report=1`` to write _environment.txt with the
+# installed packages; it is cached until the environment changes
+env_report = False
+
+# build with ``-D hook_timings=1`` to write hook_timings.txt/.json with the
+# time spent in each directive, domain hook and list processor
+hook_timings = False
+
+# inventories are served from _inventories/ and only refreshed when their
+# version in intersphinx_cache_versions changes; a missing one is fetched
+# there first. ``-D intersphinx_cache_offline=1`` never fetches them
+intersphinx_cache_dir = "_inventories"
+intersphinx_cache_versions = {}
+
 intersphinx_mapping = {
     "pandas": (
         "https://pandas.pydata.org/pandas-docs/stable/",
@@ -1,28 +1,138 @@
 #!/bin/sh
-# ./make_files.sh
+# ./make_files.sh [--check]
+#
+# Each file is written next to its target first, and only replaces it when
+# the content differs, so unchanged files keep their mtime and the next
+# Sphinx build only reads the documents that changed.
+# With --check nothing is written nor built: the files that would change
+# are listed, and the exit status is 1 if there are any. CI runs it, so a
+# file edited in place must be copied into its heredoc here.
+
+check=0
+case "$1" in
+    --check) check=1 ;;
+    "") ;;
+    *) echo "usage: $0 [--check]" >&2; exit 2 ;;
+esac
+drift=0
+
+# update FILE: write stdin to FILE, unless FILE already has that content
+update() {
+    tmp="$1.tmp.$$"
+    if [ "$check" = 1 ]; then
+        tmp=$(mktemp)
+    fi
+    cat >"$tmp"
+    if cmp -s "$tmp" "$1"; then
+        rm -f "$tmp"
+    elif [ "$check" = 1 ]; then
+        echo "would update $1"
+        rm -f "$tmp"
+        drift=1
+    else
+        echo "updated $1"
+        mv "$tmp" "$1"
+    fi
+}
 
-cat <<'EOF' >README.rst
+update README.rst <<'EOF'
 compatsphinxext
 ===============
 
 blah blah blah
 EOF
 
-cat <<'EOF' >compatsphinxext.py
-import networkx as nx
-import pandas as pd
+update compatsphinxext.py <<'EOF'
+from __future__ import annotations
+
+import importlib
+import os
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+
+class _LazyModule:
+    """Stand in for the module ``name`` until an attribute is looked up.
+
+    The module is then imported and replaces this object in the globals, so
+    importing compatsphinxext, as every autodoc worker does, stays fast.
+    """
+
+    def __init__(self, alias: str, name: str) -> None:
+        self._alias = alias
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
+
+
+if TYPE_CHECKING:
+    import networkx as nx
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import scipy.sparse
+else:
+    nx = _LazyModule("nx", "networkx")
+    np = _LazyModule("np", "numpy")
+    pd = _LazyModule("pd", "pandas")
+    pa = _LazyModule("pa", "pyarrow")
+    pc = _LazyModule("pc", "pyarrow.compute")
+
+
+# (ingredient, meal) pairs per country
+RECIPES = {
+    "italy": [
+        ("eggs", "omelette"),
+        ("tomato", "pasta salad"),
+        ("pasta", "spaghetti bolognese"),
+        ("beef", "spaghetti bolognese"),
+        ("bell pepper", "stir fry"),
+    ],
+    "japan": [
+        ("rice", "sushi"),
+        ("salmon", "sushi"),
+        ("noodles", "ramen"),
+        ("pork", "ramen"),
+        ("tofu", "miso soup"),
+    ],
+    "mexico": [
+        ("tortilla", "tacos"),
+        ("beef", "tacos"),
+        ("beans", "burrito"),
+        ("rice", "burrito"),
+        ("avocado", "guacamole"),
+    ],
+}
 
 
-def create_meal_df(n: int = 5, country: str = "italy") -> pd.DataFrame:
+def create_meal_df(
+    n: int = 5,
+    country: str = "italy",
+    seed: int | None = 0,
+    dtype_backend: str = "numpy",
+) -> pd.DataFrame:
     """
     Return a :class:`pandas.DataFrame` of ingredients and meals.
 
+    Rows are drawn at random from the recipes of ``country``.
+
     Parameters
     ----------
     n : int
         Length of the data.
     country : str
-        Home country of food.
+        Home country of food, one of the keys of ``RECIPES``.
+    seed : int, optional
+        Seed of the random number generator, None for fresh entropy.
+    dtype_backend : {"numpy", "pyarrow"}
+        Return ``category`` columns, or Arrow dictionary-encoded columns.
 
     Returns
     -------
@@ -32,37 +142,138 @@ def create_meal_df(n: int = 5, country: str = "italy") -> pd.DataFrame:
     .. todo::
         Fix this and checkout :class:`pandas.DataFrame`.
     """
-    ingredients = ['eggs', 'tomato', 'pasta', 'beef', 'bell pepper']
-    meals = ['omelette', 'pasta salad', 'spaghetti bolognese', 'spaghetti bolognese', 'stir fry']
-    return pd.DataFrame({'ingredient': ingredients, 'meal': meals})
+    ingredient_codes, meal_codes, ingredients, meals = _sample_recipes(
+        n, country, seed
+    )
+    if dtype_backend == "pyarrow":
+        columns = {
+            "ingredient": _arrow_dictionary(ingredient_codes, ingredients),
+            "meal": _arrow_dictionary(meal_codes, meals),
+        }
+    elif dtype_backend == "numpy":
+        columns = {
+            "ingredient": pd.Categorical.from_codes(ingredient_codes, ingredients),
+            "meal": pd.Categorical.from_codes(meal_codes, meals),
+        }
+    else:
+        raise ValueError(
+            f"dtype_backend must be 'numpy' or 'pyarrow', got {dtype_backend!r}"
+        )
+    return pd.DataFrame(columns, copy=False)
+
+
+def _sample_recipes(n, country, seed):
+    """Return ingredient and meal codes for ``n`` random recipe rows.
+
+    Codes are the smallest integer type holding the vocabularies, so a row
+    takes two bytes.
+    """
+    try:
+        recipes = RECIPES[country]
+    except KeyError:
+        raise ValueError(
+            f"unknown country {country!r}, expected one of {sorted(RECIPES)}"
+        ) from None
+
+    ingredients = sorted({ingredient for ingredient, _ in recipes})
+    meals = sorted({meal for _, meal in recipes})
+    dtype = np.min_scalar_type(-max(len(ingredients), len(meals)))
+    recipe_ingredient = np.array(
+        [ingredients.index(ingredient) for ingredient, _ in recipes], dtype=dtype
+    )
+    recipe_meal = np.array([meals.index(meal) for _, meal in recipes], dtype=dtype)
+
+    rng = np.random.default_rng(seed)
+    # recipes can outnumber both vocabularies
+    rows = rng.integers(
+        0, len(recipes), size=n, dtype=np.min_scalar_type(-len(recipes))
+    )
+    return recipe_ingredient[rows], recipe_meal[rows], ingredients, meals
 
 
-def create_meal_g(n: int = 5, country: str = "italy") -> nx.DiGraph:
+def _arrow_dictionary(codes, values):
+    array = pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(values))
+    return pd.arrays.ArrowExtensionArray(array)
+
+
+def create_meal_g(
+    n: int = 5,
+    country: str = "italy",
+    seed: int | None = 0,
+    sparse: bool = False,
+) -> nx.DiGraph | tuple[scipy.sparse.csr_array, np.ndarray]:
     """
     Return a :class:`networkx.DiGraph` of ingredients and meals.
 
+    The ``n`` rows of :func:`create_meal_df` become edges from an ingredient
+    to a meal, weighted by how many rows they appear in.
+
     Parameters
     ----------
     n : int
         Length of the data.
     country : str
         Home country of food.
+    seed : int, optional
+        Seed of the random number generator, None for fresh entropy.
+    sparse : bool
+        Return a :class:`scipy.sparse.csr_array` adjacency matrix of the
+        weights and the array of node labels instead, for graphs too large
+        for NetworkX. Needs SciPy.
 
     Returns
     -------
-    networkx.DiGraph
+    networkx.DiGraph or (scipy.sparse.csr_array, numpy.ndarray)
 
 
     .. todo::
         Fix this and checkout :class:`networkx.DiGraph`.
+
+    .. networkx-compat::
+        :func:`networkx.from_pandas_edgelist`
+
+        Edges always point from an ingredient to a meal.
+    """
+    sources, targets, weights, labels = _meal_edges(n, country, seed)
+    if sparse:
+        import scipy.sparse
+
+        adjacency = scipy.sparse.csr_array(
+            (weights, (sources, targets)), shape=(len(labels), len(labels))
+        )
+        return adjacency, labels
+
+    g = nx.DiGraph()
+    names = labels.tolist()
+    g.add_edges_from(
+        (names[source], names[target], {"weight": weight})
+        for source, target, weight in zip(
+            sources.tolist(), targets.tolist(), weights.tolist()
+        )
+    )
+    return g
+
+
+def _meal_edges(n, country, seed):
+    """Return the ingredient to meal edges of ``n`` rows, and node labels.
+
+    Nodes are numbered ingredients first, then meals. Rows are counted with
+    one ``bincount`` over the pair codes, so the cost is linear in ``n``
+    and the edges are unique.
     """
-    ingredients = ['eggs', 'tomato', 'pasta', 'beef', 'bell pepper']
-    meals = ['omelette', 'pasta salad', 'spaghetti bolognese', 'spaghetti bolognese', 'stir fry']
-    df = pd.DataFrame({'ingredient': ingredients, 'meal': meals})
-    return nx.from_pandas_edgelist(df, source="ingredient", target="meal", create_using=nx.DiGraph)
+    ingredient_codes, meal_codes, ingredients, meals = _sample_recipes(
+        n, country, seed
+    )
+    pairs = ingredient_codes.astype(np.intp) * len(meals) + meal_codes
+    counts = np.bincount(pairs, minlength=len(ingredients) * len(meals))
+    edges = np.flatnonzero(counts)
+    sources = edges // len(meals)
+    targets = len(ingredients) + edges % len(meals)
+    labels = np.array(ingredients + meals)
+    return sources, targets, counts[edges], labels
 
 
-def reindex(df: pd.DataFrame) -> pd.DataFrame:
+def reindex(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Use :meth:`pandas.DataFrame.reindex` and drop the first row of the
     :class:`pandas.DataFrame`.
@@ -71,6 +282,10 @@ def reindex(df: pd.DataFrame) -> pd.DataFrame:
     ----------
     df : pandas.DataFrame
         Pandas DataFrame.
+    copy : bool
+        Reindex on ``range(1, len(df))``, which copies every column. With
+        False, drop the first row by position instead, returning a view of
+        the data of ``df``.
 
     Returns
     -------
@@ -80,12 +295,19 @@ def reindex(df: pd.DataFrame) -> pd.DataFrame:
     .. pandas-compat::
         :meth:`pandas.DataFrame.reindex`
 
-        This function has no args or kwargs compared to the pandas version.
+        This function has no args or kwargs compared to the pandas version,
+        except ``copy``. ``copy=False`` slices by position, so it matches
+        the reindex only for a default :class:`pandas.RangeIndex`. Under
+        Copy-on-Write (always on from pandas 3.0) the view is copied on the
+        first write to either frame; without it, writing to the result
+        also modifies ``df``.
     """
+    if not copy:
+        return df.iloc[1:]
     return df.reindex(range(1, len(df)))
 
 
-def rename(df: pd.DataFrame) -> pd.DataFrame:
+def rename(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Use :meth:`pandas.DataFrame.rename` and rename the first
     column of :class:`pandas.DataFrame` "YO!".
@@ -94,6 +316,9 @@ def rename(df: pd.DataFrame) -> pd.DataFrame:
     ----------
     df : pandas.DataFrame
         Pandas DataFrame.
+    copy : bool
+        With False, only the column labels of a shallow copy are replaced,
+        so the data is never copied, even without Copy-on-Write.
 
     Returns
     -------
@@ -105,35 +330,501 @@ def rename(df: pd.DataFrame) -> pd.DataFrame:
 
         Unlike pandas rename, which offers way more flexibility than this,
         This function simply renames your first columns to "YO!".
+        ``copy=False`` shares the data with ``df``, as ``rename`` does under
+        Copy-on-Write. With :class:`pandas.MultiIndex` columns the first
+        label is a tuple, which rename only matches against the labels of
+        each level, so nothing is renamed.
     """
+    if not copy:
+        renamed = df.copy(deep=False)
+        # rename maps the labels of each level, which a tuple never matches
+        if not isinstance(df.columns, pd.MultiIndex):
+            # every column labelled like the first, NaN included, keeping the
+            # index name; get_loc gives a position, slice or mask
+            first = np.zeros(len(df.columns), dtype=bool)
+            first[df.columns.get_loc(df.columns[0])] = True
+            renamed.columns = df.columns.where(~first, "YO!")
+        return renamed
     return df.rename(columns={df.columns[0]: "YO!"})
+
+
+def to_numeric(
+    s: pd.Series,
+    errors: str = "raise",
+    downcast: str | None = None,
+    engine: str = "pandas",
+    chunk_size: int = 1_000_000,
+    max_workers: int | None = None,
+) -> pd.Series:
+    """
+    Use :func:`pandas.to_numeric`.
+
+    Parameters
+    ----------
+    s : pandas.Series
+        Pandas Series.
+    errors : {"raise", "coerce"}
+        As in :func:`pandas.to_numeric`.
+    downcast : {"integer", "signed", "unsigned", "float"}, optional
+        As in :func:`pandas.to_numeric`, applied once to the whole result.
+    engine : {"pandas", "pyarrow"}
+        Parse the strings of each chunk with :func:`pandas.to_numeric`, or
+        with the :func:`pyarrow.compute.cast` kernels.
+    chunk_size : int
+        Number of elements converted at a time.
+    max_workers : int, optional
+        Convert the chunks on a pool of this many threads.
+
+    Returns
+    -------
+    pandas.Series
+
+
+    .. pandas-compat::
+        :func:`pandas.to_numeric`
+
+        With the default ``engine``, ``chunk_size`` and ``max_workers`` and a
+        Series shorter than ``chunk_size``, there are no differences. Otherwise
+        object and ``str`` Series are converted by chunks, and chunks of
+        strings that the ``pyarrow`` engine cannot parse fall back to pandas,
+        so the ``errors=`` semantics and result dtypes are kept; an error is
+        raised by converting the whole Series again, so its message matches
+        pandas. Integer and float chunks are concatenated as floats, other
+        chunks whose dtypes differ are converted again as a whole.
+        ``errors="ignore"`` and other dtypes, whose results are extension
+        arrays (``Int64``, ``Float64``, ...), are passed to pandas as a whole.
+        The ``pyarrow`` engine parses floats with correct rounding, as
+        :class:`float` does, so a float can differ from the one pandas parses
+        in its last bit.
+    """
+    if engine not in ("pandas", "pyarrow"):
+        raise ValueError(f"engine must be 'pandas' or 'pyarrow', got {engine!r}")
+    if (
+        errors == "ignore"
+        or not _numpy_result(s.dtype)
+        or (engine == "pandas" and max_workers is None and len(s) <= chunk_size)
+    ):
+        return pd.to_numeric(s, errors=errors, downcast=downcast)
+
+    convert = _to_numeric_arrow if engine == "pyarrow" else _to_numeric_pandas
+    chunks = [s.iloc[i : i + chunk_size] for i in range(0, len(s), chunk_size)]
+    try:
+        if max_workers is None:
+            values = [convert(chunk, errors) for chunk in chunks]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers) as pool:
+                values = list(pool.map(convert, chunks, [errors] * len(chunks)))
+    except ValueError:
+        # raise the error pandas raises, with the position in s
+        return pd.to_numeric(s, errors=errors, downcast=downcast)
+    dtypes = {v.dtype for v in values}
+    if len(dtypes) > 1 and not all(dtype.kind in "if" for dtype in dtypes):
+        # concatenating, say, uint64 and int64 chunks would give float64;
+        # int64 and float64 ones (a NaN from errors="coerce") give float64,
+        # as pandas does
+        return pd.to_numeric(s, errors=errors, downcast=downcast)
+
+    result = pd.Series(
+        np.concatenate(values) if values else np.array([], dtype=np.int64),
+        index=s.index,
+        name=s.name,
+        copy=False,
+    )
+    if downcast is not None:
+        result = pd.to_numeric(result, downcast=downcast)
+    return result
+
+
+def _numpy_result(dtype) -> bool:
+    """Whether :func:`pandas.to_numeric` converts ``dtype`` to a NumPy dtype."""
+    if dtype == object:
+        return True
+    # "str" (NaN for missing values), not "string" (pd.NA)
+    return isinstance(dtype, pd.StringDtype) and dtype.na_value is not pd.NA
+
+
+def _to_numeric_pandas(chunk, errors):
+    return pd.to_numeric(chunk, errors=errors).to_numpy()
+
+
+def _to_numeric_arrow(chunk, errors):
+    try:
+        array = pa.array(chunk, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # mixed Python objects
+        return _to_numeric_pandas(chunk, errors)
+    if not (pa.types.is_string(array.type) or pa.types.is_large_string(array.type)):
+        return _to_numeric_pandas(chunk, errors)
+
+    try:
+        converted = pc.cast(array, pa.float64())
+    except pa.ArrowInvalid:
+        return _to_numeric_pandas(chunk, errors)
+    if not pc.all(pc.is_finite(converted)).as_py():
+        # Arrow and pandas do not spell NaN and infinity alike
+        return _to_numeric_pandas(chunk, errors)
+    # a failing cast costs more than parsing, so integers are only tried
+    # when every value is integral
+    if pc.all(pc.equal(converted, pc.floor(converted))).as_py():
+        bounds = pc.min_max(converted)
+        low, high = bounds["min"].as_py() or 0, bounds["max"].as_py() or 0
+        # the bounds are rounded to float64
+        if low <= -(2**63) or high >= 2**63:
+            # pandas returns uint64 or objects beyond int64
+            return _to_numeric_pandas(chunk, errors)
+        try:
+            converted = pc.cast(array, pa.int64())
+        except pa.ArrowInvalid:
+            # integral floats, such as "1.0"
+            pass
+    # nulls become NaN, as with pandas
+    return converted.to_numpy(zero_copy_only=False)
+
+
+def empty(df: pd.DataFrame) -> bool:
+    """
+    Use :attr:`pandas.DataFrame.empty`.
+
+    Parameters
+    ----------
+    s : pandas.Series
+        Pandas Series.
+
+    Returns
+    -------
+    pandas.Series
+
+
+    .. pandas-compat::
+        :attr:`pandas.DataFrame.empty`
+
+        No differences.
+    """
+    return df.empty
+
+
+def from_arrow(
+    t: pa.Table,
+    arrow_dtypes: bool = False,
+    use_threads: bool = True,
+    split_blocks: bool = False,
+    self_destruct: bool = False,
+) -> pd.DataFrame:
+    """
+    Use :meth:`pyarrow.Table.to_pandas`.
+
+    Parameters
+    ----------
+    t : pyarrow.Table
+        Arrow table.
+    arrow_dtypes : bool
+        Keep the Arrow buffers, as :class:`pandas.ArrowDtype` columns,
+        instead of converting them to NumPy.
+    use_threads : bool
+        Convert the columns in parallel.
+    split_blocks : bool
+        Give every column its own block, so they are not consolidated into
+        2D NumPy arrays.
+    self_destruct : bool
+        Release the memory of each column once converted. ``t`` must not be
+        used afterwards.
+
+    Returns
+    -------
+    pandas.DataFrame
+
+
+    .. pyarrow-compat::
+        :meth:`pyarrow.Table.to_pandas`
+
+        By default every column is copied into consolidated NumPy blocks, as
+        with ``to_pandas()``, which holds the table twice at the peak.
+        ``arrow_dtypes=True`` passes ``types_mapper=pd.ArrowDtype`` and wraps
+        the Arrow buffers without copying them. ``split_blocks=True`` together
+        with ``self_destruct=True`` frees each Arrow column as soon as it is
+        converted, keeping the peak close to one copy. Use
+        :func:`from_arrow_batches` for data larger than memory.
+    """
+    options = _to_pandas_options(arrow_dtypes, use_threads, split_blocks, self_destruct)
+    return t.to_pandas(**options)
+
+
+def from_arrow_batches(
+    source: str | os.PathLike | pa.RecordBatchReader,
+    columns: list[str] | None = None,
+    arrow_dtypes: bool = False,
+    use_threads: bool = True,
+    split_blocks: bool = False,
+    self_destruct: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a :class:`pandas.DataFrame` per record batch of ``source``.
+
+    Only one batch is converted at a time, so tables larger than memory can
+    be processed.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or pyarrow.RecordBatchReader
+        Path of an Arrow IPC file or stream, memory-mapped, or a reader.
+    columns : list of str, optional
+        Only convert these columns.
+    arrow_dtypes, use_threads, split_blocks, self_destruct : bool
+        As in :func:`from_arrow`.
+
+    Yields
+    ------
+    pandas.DataFrame
+    """
+    options = _to_pandas_options(arrow_dtypes, use_threads, split_blocks, self_destruct)
+    if isinstance(source, pa.RecordBatchReader):
+        batches = iter(source)
+    else:
+        batches = _read_ipc_batches(source)
+    for batch in batches:
+        if columns is not None:
+            batch = batch.select(columns)
+        yield batch.to_pandas(**options)
+        # drop our reference, so self_destruct can free the batch
+        del batch
+
+
+def _to_pandas_options(arrow_dtypes, use_threads, split_blocks, self_destruct):
+    return {
+        "types_mapper": pd.ArrowDtype if arrow_dtypes else None,
+        "use_threads": use_threads,
+        "split_blocks": split_blocks,
+        "self_destruct": self_destruct,
+    }
+
+
+def _read_ipc_batches(path):
+    with pa.memory_map(os.fspath(path)) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            # not the file format, read it as a stream
+            source.seek(0)
+            yield from pa.ipc.open_stream(source)
+        else:
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+
+
+# ewm decay arguments, in the order of get_center_of_mass
+EWM_PARAMETERS = ("com", "span", "halflife", "alpha")
+
+
+def ewm(
+    df: pd.DataFrame | pd.Series,
+    com: float | list[float] | None = None,
+    span: float | list[float] | None = None,
+    halflife: float | list[float] | None = None,
+    alpha: float | list[float] | None = None,
+    min_periods: int = 0,
+    adjust: bool = True,
+    ignore_na: bool = False,
+    var: bool = False,
+    bias: bool = False,
+) -> pd.core.window.ewm.ExponentialMovingWindow | pd.DataFrame:
+    """
+    Uses :meth:`pandas.DataFrame.ewm`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame or pandas.Series
+        Pandas DataFrame, or Series.
+    com, span, halflife, alpha : float or list of float, optional
+        Decay, as in :meth:`pandas.DataFrame.ewm`. ``com=0.5`` if none is
+        given. Pass a list to compute the means of all of its values at once.
+    min_periods, adjust, ignore_na : optional
+        As in :meth:`pandas.DataFrame.ewm`.
+    var : bool
+        Compute the variances as well as the means of a list.
+    bias : bool
+        As in :meth:`pandas.core.window.ewm.ExponentialMovingWindow.var`.
+
+    Returns
+    -------
+    pandas.core.window.ewm.ExponentialMovingWindow or pandas.DataFrame
+        The window of a single value, or the means of a list, with a column
+        level for its values first and, with ``var``, one for the
+        ``"mean"`` and ``"var"`` statistics. The columns of a Series are
+        these levels only.
+
+
+    .. pandas-compat::
+        :meth:`pandas.DataFrame.ewm`
+
+        A list of values is computed in one pass over a float64 copy of
+        ``df``: the weighted sums are linear filters, run with
+        :func:`scipy.signal.lfilter` on all columns at once, as are the
+        squared deviations from the running means that variances sum up.
+        Results match looping over :meth:`pandas.DataFrame.ewm` to rounding.
+        Columns with missing values, whose weights differ, are still
+        computed by pandas, with one call per value. Needs SciPy.
+    """
+    given = {
+        name: value
+        for name, value in zip(EWM_PARAMETERS, (com, span, halflife, alpha))
+        if value is not None
+    }
+    options = {"min_periods": min_periods, "adjust": adjust, "ignore_na": ignore_na}
+    sequence = (list, tuple, np.ndarray, pd.Index)
+    if not any(isinstance(value, sequence) for value in given.values()):
+        return df.ewm(**(given or {"com": 0.5}), **options)
+    if len(given) > 1:
+        raise ValueError("comass, span, halflife, and alpha are mutually exclusive")
+    if isinstance(df, pd.Series):
+        result = ewm(df.to_frame(), **given, **options, var=var, bias=bias)
+        return result.droplevel(-1, axis=1)
+
+    (name, values), = given.items()
+    alphas = []
+    for v in values:
+        # validated as by pandas
+        arguments = [v if p == name else None for p in EWM_PARAMETERS]
+        alphas.append(1 / (1 + pd.core.window.ewm.get_center_of_mass(*arguments)))
+    stats = ["mean", "var"] if var else ["mean"]
+    # rows last, the layout of a pandas block, so the result is not copied
+    out = np.empty((len(alphas), len(stats), df.shape[1], len(df)))
+
+    numeric = all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes)
+    if numeric and len(df):
+        x = df.to_numpy(dtype=np.float64, na_value=np.nan).T
+        complete = ~np.isnan(x).any(axis=1)
+    else:
+        complete = np.zeros(df.shape[1], dtype=bool)
+    if complete.size and complete.all():
+        _ewm_filter(out, x, alphas, min_periods, adjust, var, bias)
+    elif complete.any():
+        part = np.empty(out.shape[:2] + (complete.sum(), len(df)))
+        _ewm_filter(part, x[complete], alphas, min_periods, adjust, var, bias)
+        out[:, :, complete] = part
+
+    missing = np.flatnonzero(~complete)
+    if len(missing):
+        subset = df.iloc[:, missing]
+        for k, v in enumerate(values):
+            window = subset.ewm(**{name: v}, **options)
+            out[k, 0, missing] = window.mean().to_numpy().T
+            if var:
+                out[k, 1, missing] = window.var(bias=bias).to_numpy().T
+
+    levels, names = [pd.Index(values), df.columns], [name, df.columns.name]
+    if var:
+        levels.insert(1, stats)
+        names.insert(1, "statistic")
+    columns = pd.MultiIndex.from_product(levels, names=names)
+    return pd.DataFrame(
+        out.reshape(len(columns), len(df)).T,
+        index=df.index,
+        columns=columns,
+        copy=False,
+    )
+
+
+def _ewm_filter(out, x, alphas, min_periods, adjust, var, bias):
+    """Fill ``out`` with the weighted means, and variances, of each alpha.
+
+    ``x`` holds a column without missing values per row. With weights
+    decaying by ``1 - alpha`` per step, the weighted sums are
+    ``y[t] = (1 - alpha) * y[t - 1] + b * x[t]``, one
+    :func:`scipy.signal.lfilter` call over all the columns. pandas weighs
+    new observations by ``b = 1`` with ``adjust``, otherwise by
+    ``b = alpha`` after a first weight of 1, which is the initial state.
+
+    The weighted sum of squared deviations from the running mean is updated
+    as pandas does, ``s[t] = (1 - alpha) * s[t - 1] + c[t] * d[t] ** 2``
+    with ``d[t] = x[t] - mean[t - 1]`` and
+    ``c[t] = (1 - alpha) * w[t - 1] * b / w[t]`` for the total weights
+    ``w``: a filter of non-negative terms, which does not cancel when the
+    data trends or shifts.
+    """
+    from scipy.signal import lfilter
+
+    ones = np.ones(x.shape[1])
+    # centered, the sums of large values lose less to rounding
+    center = x.mean(axis=1, keepdims=True)
+    x = x - center
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for k, a in enumerate(alphas):
+            b = 1.0 if adjust else a
+            decay = [1.0, a - 1.0]
+            total, _ = lfilter([b], decay, ones, zi=[1 - b])
+            sums, _ = lfilter([b], decay, x, zi=(1 - b) * x[:, :1])
+            mean = out[k, 0]
+            np.divide(sums, total, out=mean)
+            if var:
+                terms = sums
+                terms[:, 0] = 0.0
+                np.subtract(x[:, 1:], mean[:, :-1], out=terms[:, 1:])
+                terms[:, 1:] **= 2
+                terms[:, 1:] *= (1 - a) * b * total[:-1] / total[1:]
+                squares = lfilter([1.0], decay, terms)
+                if bias:
+                    scale = 1 / total
+                else:
+                    decay2 = [1.0, -((1 - a) ** 2)]
+                    total2, _ = lfilter([b * b], decay2, ones, zi=[1 - b * b])
+                    scale = total / (total * total - total2)
+                cov = out[k, 1]
+                np.multiply(squares, scale, out=cov)
+                if not bias:
+                    # a single observation has no unbiased variance
+                    cov[:, 0] = np.nan
+            mean += center
+    out[..., : max(min_periods, 1) - 1] = np.nan
 EOF
 
-mkdir -p docs/source
-mkdir -p docs/source/_static
-mkdir -p docs/source/_templates
-mkdir -p docs/source/_ext
+if [ "$check" = 0 ]; then
+    mkdir -p docs/source
+    mkdir -p docs/source/_static
+    mkdir -p docs/source/_templates
+    mkdir -p docs/source/_ext
+fi
+
 
 # current cudf pandas compat sphinx extension
 # https://github.com/rapidsai/cudf/blob/branch-24.06/docs/cudf/source/_ext/PandasCompat.py
-cat <<'EOF' >docs/source/_ext/PandasCompat.py
+update docs/source/_ext/PandasCompat.py <<'EOF'
 # Copyright (c) 2021-2022, NVIDIA CORPORATION
 
 # This file is adapted from official sphinx tutorial for `todo` extension:
 # https://www.sphinx-doc.org/en/master/development/tutorials/todo.html
 from __future__ import annotations
 
-from typing import cast
+import functools
+import hashlib
+import json
+import operator
+import os
+import pickle
+import re
+from typing import NamedTuple, cast
 
 from docutils import nodes
 from docutils.nodes import Element
-from docutils.parsers.rst import Directive
+from docutils.parsers.rst import directives
 from docutils.parsers.rst.directives.admonitions import BaseAdmonition
 from sphinx import addnodes
 from sphinx.domains import Domain
 from sphinx.errors import NoUri
 from sphinx.locale import _ as get_translation_sphinx
+from sphinx.locale import __
+from sphinx.roles import XRefRole
+from sphinx.util import logging
 from sphinx.util.docutils import SphinxDirective, new_document
+from sphinx.util.nodes import make_refnode
+
+import listpages
+import parsecache
+from hooktimings import timed, timing
+
+logger = logging.getLogger(__name__)
 
 
 class PandasCompat(nodes.Admonition, nodes.Element):
@@ -152,117 +843,438 @@ def depart_PandasCompat_node(self, node):
     self.depart_admonition(node)
 
 
-class PandasCompatListDirective(Directive):
+def list_order(argument):
+    return directives.choice(argument, ("docname", "upstream"))
+
+
+class PandasCompatListDirective(SphinxDirective):
+    option_spec = {
+        "group-by": list_order,
+        "sort": list_order,
+        "per-page": directives.positive_int,
+    }
+
+    # the upstream library listed, set for each ``<name>-compat-list``
+    library = "pandas"
+
+    @timed("PandasCompatListDirective.run")
     def run(self):
-        return [PandasCompatList("")]
+        if not self.config.include_pandas_compat:
+            return []
+        domain = cast(PandasCompatDomain, self.env.get_domain("pandascompat"))
+        domain.note_pandascompat_list(self.env.docname)
+        return [
+            PandasCompatList(
+                "",
+                library=self.library,
+                group_by=self.options.get("group-by"),
+                sort=self.options.get("sort"),
+                per_page=self.options.get("per-page"),
+            )
+        ]
 
 
 class PandasCompatDirective(BaseAdmonition, SphinxDirective):
 
     # this enables content in the directive
     has_content = True
+    option_spec = {
+        **BaseAdmonition.option_spec,
+        # leave the note out of the compatsignatures comparison
+        "no-signature": directives.flag,
+    }
+
+    # the upstream library and its display label, set for each ``<name>-compat``
+    library = "pandas"
+    label = "Pandas"
 
+    @timed("PandasCompatDirective.run")
     def run(self):
-        targetid = "PandasCompat-%d" % self.env.new_serialno("PandasCompat")
+        # nothing is parsed nor collected, as if the directive was not there
+        if not self.config.include_pandas_compat:
+            return []
+        prefix = "%sCompat" % self.label.replace(" ", "")
+        targetid = "%s-%d" % (prefix, self.env.new_serialno(prefix))
         targetnode = nodes.target("", "", ids=[targetid])
 
+        title = get_translation_sphinx("%s Compatibility Note") % self.label
         PandasCompat_node = PandasCompat("\n".join(self.content))
-        PandasCompat_node += nodes.title(
-            get_translation_sphinx("Pandas Compatibility Note"),
-            get_translation_sphinx("Pandas Compatibility Note"),
-        )
+        PandasCompat_node += nodes.title(title, title)
         PandasCompat_node["docname"] = self.env.docname
-        PandasCompat_node["target"] = targetnode        
-        self.state.nested_parse(
-            self.content, self.content_offset, PandasCompat_node
-        )
+        PandasCompat_node["library"] = self.library
+        PandasCompat_node["targetid"] = targetid
+        PandasCompat_node["no_signature"] = "no-signature" in self.options
+        with timing("PandasCompatDirective.nested_parse", self.env.docname):
+            parsecache.nested_parse(self, PandasCompat_node)
 
-        if not hasattr(self.env, "PandasCompat_all_pandas_compat"):
-            self.env.PandasCompat_all_pandas_compat = []
+        return [targetnode, PandasCompat_node]
 
-        self.env.PandasCompat_all_pandas_compat.append(
-            {
-                "docname": self.env.docname,
-                "PandasCompat": PandasCompat_node.deepcopy(),
-                "target": targetnode,
-            }
+
+class PandasCompatEntry(NamedTuple):
+    """A collected compat note, as stored in the pickled environment."""
+
+    docname: str
+    targetid: str
+    library: str
+    upstream: str
+    local: str
+    body: bytes
+    # hash of the rendered body, which does not depend on its position
+    digest: str
+
+    @classmethod
+    def from_node(cls, pandascompat: PandasCompat) -> PandasCompatEntry:
+        # detach the note, so its document is not pickled with it
+        body = pandascompat.deepcopy()
+        for node in body.findall():
+            node.document = None
+        body["ids"].clear()
+        return cls(
+            pandascompat["docname"],
+            pandascompat["targetid"],
+            pandascompat["library"],
+            upstream_target(pandascompat.rawsource),
+            local_object(pandascompat),
+            pickle.dumps(body, pickle.HIGHEST_PROTOCOL),
+            hashlib.sha256(body.pformat().encode()).hexdigest(),
         )
 
-        return [targetnode, PandasCompat_node]
+    def to_node(self) -> PandasCompat:
+        return pickle.loads(self.body)
 
+    def to_record(self, builder) -> dict[str, str]:
+        """Return the entry as a row of the compat matrix."""
+        try:
+            uri = builder.get_target_uri(self.docname) + "#" + self.targetid
+        except NoUri:
+            uri = ""
+        # the first child is the title added by the directive
+        text = "\n\n".join(child.astext() for child in self.to_node()[1:])
+        return {
+            "library": self.library,
+            "upstream": self.upstream,
+            "local": self.local,
+            "docname": self.docname,
+            "anchor": self.targetid,
+            "uri": uri,
+            "text": text,
+        }
 
-def purge_PandasCompats(app, env, docname):
-    if not hasattr(env, "PandasCompat_all_pandas_compat"):
-        return
 
-    env.PandasCompat_all_pandas_compat = [
-        PandasCompat
-        for PandasCompat in env.PandasCompat_all_pandas_compat
-        if PandasCompat["docname"] != docname
-    ]
+_UPSTREAM_ROLE = re.compile(r"^\s*(?::[\w.-]+)+:`(?P<target>[^`]+)`")
 
 
-def merge_PandasCompats(app, env, docnames, other):
-    if not hasattr(env, "PandasCompat_all_pandas_compat"):
-        env.PandasCompat_all_pandas_compat = []
-    if hasattr(other, "PandasCompat_all_pandas_compat"):
-        env.PandasCompat_all_pandas_compat.extend(
-            other.PandasCompat_all_pandas_compat
-        )
+def upstream_target(rawsource: str) -> str:
+    """Return the upstream object named by the role on the first line.
+
+    ``":meth:`pandas.DataFrame.reindex`"`` gives
+    ``"pandas.DataFrame.reindex"``; an empty string if there is no role.
+    """
+    match = _UPSTREAM_ROLE.match(rawsource)
+    if not match:
+        return ""
+    target = match.group("target")
+    if target.endswith(">") and "<" in target:
+        target = target[target.rindex("<") + 1 : -1]
+    return normalize_upstream(target)
+
+
+def normalize_upstream(target: str) -> str:
+    return target.strip().lstrip("~!.").removesuffix("()")
+
+
+def local_object(pandascompat: PandasCompat) -> str:
+    """Return the name of the documented object holding the note, if any."""
+    parent = pandascompat.parent
+    while parent is not None and not isinstance(parent, addnodes.desc):
+        parent = parent.parent
+    if parent is None:
+        return ""
+    signature = next(parent.findall(addnodes.desc_signature), None)
+    if signature is None:
+        return ""
+    if signature.get("fullname"):
+        module = signature.get("module")
+        fullname = signature["fullname"]
+        return f"{module}.{fullname}" if module else fullname
+    return signature["ids"][0] if signature["ids"] else ""
+
+
+class PandasCompatXRefRole(XRefRole):
+    """``:pandascompat:compat:`pandas.DataFrame.reindex``` links to its note."""
+
+    def process_link(self, env, refnode, has_explicit_title, title, target):
+        refnode["refdomain"] = "pandascompat"
+        target = normalize_upstream(target)
+        if not has_explicit_title:
+            title = target
+        return title, target
 
 
 class PandasCompatDomain(Domain):
     name = "pandascompat"
     label = "pandascompat"
+    roles = {"compat": PandasCompatXRefRole()}
+
+    def __init__(self, env):
+        super().__init__(env)
+        # Resolved ``pandas-compat-list`` content, built once per write phase.
+        # Kept off ``self.data`` so it is never pickled with the environment.
+        self.rendered_pandascompats = {}
 
     @property
-    def pandascompats(self):
+    def pandascompats(self) -> dict[str, list[PandasCompatEntry]]:
         return self.data.setdefault("pandascompats", {})
 
-    def clear_doc(self, docname):
-        self.pandascompats.pop(docname, None)
+    @property
+    def pandascompat_index(self) -> dict[str, list[PandasCompatEntry]]:
+        """Entries keyed by the upstream object they document."""
+        return self.data.setdefault("pandascompat_index", {})
+
+    @property
+    def pandascompat_lists(self):
+        """Docnames containing a ``pandas-compat-list`` directive."""
+        return self.data.setdefault("pandascompat_lists", set())
+
+    def note_pandascompat_list(self, docname):
+        self.pandascompat_lists.add(docname)
+
+    def content_hash(self) -> str:
+        """Return a hash of every collected compat entry."""
+        digest = hashlib.sha256()
+        for docname in sorted(self.pandascompats):
+            for pandascompat in self.pandascompats[docname]:
+                digest.update(pandascompat.docname.encode())
+                digest.update(b"\0" + pandascompat.targetid.encode())
+                digest.update(b"\0" + pandascompat.library.encode())
+                digest.update(b"\0" + pandascompat.upstream.encode())
+                digest.update(b"\0" + pandascompat.local.encode())
+                # not the pickled body, whose source lines move with any edit
+                # above the note
+                digest.update(b"\0" + pandascompat.digest.encode())
+        return digest.hexdigest()
+
+    def add_pandascompat(self, pandascompat: PandasCompatEntry) -> None:
+        self.pandascompats.setdefault(pandascompat.docname, []).append(pandascompat)
+        self.pandascompat_index.setdefault(pandascompat.upstream, []).append(
+            pandascompat
+        )
 
+    def get_pandascompats(self, library, group_by=None, sort=None):
+        """Return ``(group, entries)`` pairs for a ``<name>-compat-list``.
+
+        Groups and order are read from the docname or upstream keyed tables,
+        so no option needs a scan of every note per key.
+        """
+        if group_by is None:
+            entries = [
+                pandascompat
+                for _, pandascompats in self._ordered(sort)
+                for pandascompat in pandascompats
+                if pandascompat.library == library
+            ]
+            return [(None, entries)]
+
+        groups = []
+        for group, pandascompats in self._ordered(group_by):
+            entries = [
+                pandascompat
+                for pandascompat in pandascompats
+                if pandascompat.library == library
+            ]
+            if sort is not None and sort != group_by:
+                entries.sort(key=operator.attrgetter(sort))
+            if entries:
+                groups.append((group, entries))
+        return groups
+
+    def _ordered(self, key):
+        # Sorted, so the order does not depend on which documents were read
+        # last or by which parallel worker.
+        if key == "upstream":
+            return [
+                (upstream, sorted(entries, key=operator.attrgetter("docname")))
+                for upstream, entries in sorted(self.pandascompat_index.items())
+            ]
+        return sorted(self.pandascompats.items())
+
+    @timed("PandasCompatDomain.clear_doc")
+    def clear_doc(self, docname):
+        self.rendered_pandascompats.clear()
+        for pandascompat in self.pandascompats.pop(docname, ()):
+            entries = self.pandascompat_index[pandascompat.upstream]
+            entries.remove(pandascompat)
+            if not entries:
+                del self.pandascompat_index[pandascompat.upstream]
+        self.pandascompat_lists.discard(docname)
+
+    @timed("PandasCompatDomain.merge_domaindata")
     def merge_domaindata(self, docnames, otherdata):
+        self.rendered_pandascompats.clear()
+        # workers only hold the docnames they collected notes for
+        pandascompats = otherdata.get("pandascompats", {})
         for docname in docnames:
-            self.pandascompats[docname] = otherdata["pandascompats"][docname]
-
+            if docname in pandascompats:
+                self.pandascompats.setdefault(docname, [])
+                for pandascompat in pandascompats[docname]:
+                    self.add_pandascompat(pandascompat)
+            if docname in otherdata.get("pandascompat_lists", ()):
+                self.pandascompat_lists.add(docname)
+
+    @timed("PandasCompatDomain.process_doc")
     def process_doc(self, env, docname, document):
-        pandascompats = self.pandascompats.setdefault(docname, [])
+        if not env.config.include_pandas_compat:
+            return
+        self.rendered_pandascompats.clear()
+        self.pandascompats.setdefault(docname, [])
         for pandascompat in document.findall(PandasCompat):
             env.app.emit("pandascompat-defined", pandascompat)
-            pandascompats.append(pandascompat)
+            self.add_pandascompat(PandasCompatEntry.from_node(pandascompat))
+
+    def resolve_xref(self, env, fromdocname, builder, typ, target, node, contnode):
+        pandascompats = self.pandascompat_index.get(target)
+        if not pandascompats:
+            if typ == "compat":
+                logger.warning(
+                    __("no compat note for %r"),
+                    target,
+                    type="ref",
+                    subtype="compat",
+                    location=node,
+                )
+            return None
+        pandascompat = pandascompats[0]
+        return make_refnode(
+            builder,
+            fromdocname,
+            pandascompat.docname,
+            pandascompat.targetid,
+            contnode,
+            target,
+        )
+
+    def resolve_any_xref(self, env, fromdocname, builder, target, node, contnode):
+        # "any" tries every domain, so a missing note is not warned about
+        refnode = self.resolve_xref(
+            env, fromdocname, builder, "any", target, node, contnode
+        )
+        return [] if refnode is None else [("pandascompat:compat", refnode)]
+
+
+def skip_missing_compat_warning(app, domain, node):
+    """Keep nitpicky builds from warning again about a missing note."""
+    if domain is not None and domain.name == "pandascompat":
+        return True
+    return None
+
+
+@timed("get_outdated_pandascompat_lists")
+def get_outdated_pandascompat_lists(app, env):
+    """Rewrite the pages hosting a ``pandas-compat-list`` when notes changed.
+
+    The hash of the collected entries is kept in the environment, so pages
+    are only rewritten when a note was added, removed or edited.
+    """
+    domain = cast(PandasCompatDomain, env.get_domain("pandascompat"))
+    content_hash = domain.content_hash()
+    if domain.data.get("content_hash") == content_hash:
+        return []
+    domain.data["content_hash"] = content_hash
+    return sorted(domain.pandascompat_lists)
 
 
 class PandasCompatListProcessor:
     def __init__(self, app, doctree, docname):
+        self.app = app
         self.builder = app.builder
         self.config = app.config
         self.env = app.env
         self.domain = cast(PandasCompatDomain, app.env.get_domain("pandascompat"))
-        self.document = new_document("")
         self.process(doctree, docname)
 
+    @timed("PandasCompatListProcessor.process")
     def process(self, doctree: nodes.document, docname: str) -> None:
-        pandascompats = [v for vals in self.domain.pandascompats.values() for v in vals]
-        for node in doctree.findall(PandasCompatList):
-            if not self.config.include_pandas_compat:
-                node.parent.remove(node)
-                continue
+        if docname not in self.domain.pandascompat_lists:
+            return
 
+        compat_lists = list(doctree.findall(PandasCompatList))
+        if not compat_lists:
+            return
+
+        for index, node in enumerate(compat_lists):
             content: list[Element | None] = [nodes.target()] if node.get("ids") else []
 
-            for pandascompat in pandascompats:
-                # Create a copy of the pandascompat node
-                new_pandascompat = pandascompat.deepcopy()
-                new_pandascompat["ids"].clear()
+            groups = self.domain.get_pandascompats(
+                node["library"], node.get("group_by"), node.get("sort")
+            )
+            items = [
+                (group, pandascompat)
+                for group, pandascompats in groups
+                for pandascompat in pandascompats
+            ]
+            per_page = node.get("per_page")
+            if per_page:
+                # every page resolves its own notes, so they are never all
+                # held at once
+                render = self.render_entries
+            else:
+                render = functools.partial(
+                    self.render_entries, rendered=self.render(docname)
+                )
+            tag = "%s-compat" % node["library"]
+            if index:
+                tag += "-%d" % (index + 1)
+            content.extend(
+                listpages.paginate(self.app, docname, tag, items, per_page, render)
+            )
 
-                self.resolve_reference(new_pandascompat, docname)
-                content.append(new_pandascompat)
+            node.replace_self(content)
 
-                ref = self.create_reference(pandascompat, docname)
-                content.append(ref)
+    def render_entries(self, items, pagename, rendered=None):
+        """Return the content listing ``(group, entry)`` *items* on *pagename*.
 
-            node.replace_self(content)
+        Without *rendered*, the notes are resolved for this call only.
+        """
+        if rendered is None:
+            notes = self.resolve_references(
+                [pandascompat.to_node() for _, pandascompat in items], pagename
+            )
+        else:
+            notes = [rendered[pandascompat].deepcopy() for _, pandascompat in items]
+
+        content = []
+        previous = None
+        for (group, pandascompat), note in zip(items, notes):
+            if group and group != previous:
+                content.append(nodes.rubric(group, group))
+            previous = group
+            content.append(note)
+            content.append(self.create_reference(pandascompat, pagename))
+        return content
+
+    @timed("PandasCompatListProcessor.render")
+    def render(self, docname: str) -> dict[PandasCompatEntry, PandasCompat]:
+        """Return the resolved list content, building it on first use.
+
+        Resolved references are relative to the page hosting the list, and
+        one to that page itself is only its anchor, so the content is built
+        for one page and not shared with its siblings. It holds the notes of
+        every upstream library, so all lists on a page share one resolve pass.
+        """
+        key = (self.builder.name, docname)
+        if key not in self.domain.rendered_pandascompats:
+            # only the page being written is kept
+            self.domain.rendered_pandascompats.clear()
+            pandascompats = [
+                v for _, vals in self.domain._ordered("docname") for v in vals
+            ]
+            new_pandascompats = self.resolve_references(
+                [pandascompat.to_node() for pandascompat in pandascompats], docname
+            )
+            self.domain.rendered_pandascompats[key] = dict(
+                zip(pandascompats, new_pandascompats)
+            )
+        return self.domain.rendered_pandascompats[key]
 
     def create_reference(self, pandascompat, docname):
         para = nodes.paragraph()
@@ -270,33 +1282,128 @@ class PandasCompatListProcessor:
         innernode = nodes.emphasis(
             get_translation_sphinx("[source]"), get_translation_sphinx("[source]")
         )
-        newnode["refdocname"] = pandascompat["docname"]
+        newnode["refdocname"] = pandascompat.docname
         try:
             newnode["refuri"] = self.builder.get_relative_uri(
-                docname, pandascompat["docname"]
-            )
-            newnode["refuri"] += "#" + pandascompat["target"]["refid"]
+                docname, pandascompat.docname
+            ) + "#" + pandascompat.targetid
         except NoUri:
             # ignore if no URI can be determined, e.g. for LaTeX output
-            pass        
+            pass
         newnode.append(innernode)
         para += newnode
         return para
 
-    def resolve_reference(self, todo, docname: str) -> None:
-        """Resolve references in the todo content."""
-        for node in todo.findall(addnodes.pending_xref):
-            if "refdoc" in node:
-                node["refdoc"] = docname
+    @timed("PandasCompatListProcessor.resolve_references")
+    def resolve_references(
+        self, pandascompats: list[PandasCompat], docname: str
+    ) -> list[PandasCompat]:
+        """Resolve references in the pandascompat contents in a single pass."""
+        for pandascompat in pandascompats:
+            for node in pandascompat.findall(addnodes.pending_xref):
+                if "refdoc" in node:
+                    node["refdoc"] = docname
 
         # Note: To resolve references, it is needed to wrap it with document node
-        self.document += todo
-        self.env.resolve_references(self.document, docname, self.builder)
-        self.document.remove(todo)
+        document = new_document("")
+        document.extend(pandascompats)
+        self.env.resolve_references(document, docname, self.builder)
+        resolved = document.children[:]
+        del document[:]
+        return resolved
+
+
+MATRIX_BATCH_SIZE = 1024
+
+
+def write_compat_matrix(app, exception):
+    """Write every compat entry to ``compat_matrix`` in the output directory.
+
+    Rows are streamed from the domain data, one entry at a time, as JSON
+    Lines, or as Parquet (needs pyarrow) if the file name ends in
+    ``.parquet``.
+    """
+    filename = app.config.compat_matrix
+    if not filename or exception is not None:
+        return
+
+    domain = cast(PandasCompatDomain, app.env.get_domain("pandascompat"))
+    records = (
+        pandascompat.to_record(app.builder)
+        for _, pandascompats in domain._ordered("docname")
+        for pandascompat in pandascompats
+    )
+    path = os.path.join(app.outdir, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if filename.endswith(".parquet"):
+        write_parquet(path, records)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    logger.info(__("compat matrix written to %s"), path)
+
+
+def write_parquet(path, records):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            (name, pa.string())
+            for name in (
+                "library", "upstream", "local", "docname", "anchor", "uri", "text"
+            )
+        ]
+    )
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == MATRIX_BATCH_SIZE:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                batch.clear()
+        # an empty batch still leaves a readable file with the schema
+        writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+
+
+# registered whatever compat_upstreams holds, its entries taking precedence
+DEFAULT_UPSTREAMS = {"pandas": "Pandas"}
+
+
+def register_upstreams(app, config):
+    """Add ``<name>-compat`` and ``<name>-compat-list`` for each upstream.
+
+    All upstreams share one domain, one collection pass and one list
+    processor, so declaring another upstream adds no per-page work. The
+    pandas pair is always there, so existing ``pandas-compat`` directives
+    keep working when ``compat_upstreams`` does not list pandas.
+    """
+    upstreams = {**DEFAULT_UPSTREAMS, **config.compat_upstreams}
+    for library, label in upstreams.items():
+        prefix = "%sCompat" % label.replace(" ", "")
+        directive = type(
+            f"{prefix}Directive",
+            (PandasCompatDirective,),
+            {"library": library, "label": label},
+        )
+        list_directive = type(
+            f"{prefix}ListDirective",
+            (PandasCompatListDirective,),
+            {"library": library},
+        )
+        app.add_directive(f"{library}-compat", directive, override=True)
+        app.add_directive(f"{library}-compat-list", list_directive, override=True)
 
 
 def setup(app):
-    app.add_config_value("include_pandas_compat", False, "html")
+    app.setup_extension("hooktimings")
+    app.setup_extension("listpages")
+    app.setup_extension("parsecache")
+    # "env": turning notes off must drop the ones already collected
+    app.add_config_value("include_pandas_compat", False, "env")
+    app.add_config_value("compat_upstreams", DEFAULT_UPSTREAMS, "env", dict)
+    app.add_config_value("compat_matrix", "", "", str)
     app.add_node(PandasCompatList)
     app.add_node(
         PandasCompat,
@@ -306,13 +1413,16 @@ def setup(app):
         man=(visit_PandasCompat_node, depart_PandasCompat_node),
         texinfo=(visit_PandasCompat_node, depart_PandasCompat_node),
     )
-    app.add_directive("pandas-compat", PandasCompatDirective)
-    app.add_directive("pandas-compat-list", PandasCompatListDirective)
-    app.add_domain(PandasCompatDomain) 
+    app.add_domain(PandasCompatDomain)
+    app.connect("config-inited", register_upstreams)
+    app.connect("env-get-updated", get_outdated_pandascompat_lists)
+    app.connect("warn-missing-reference", skip_missing_compat_warning)
     app.connect("doctree-resolved", PandasCompatListProcessor)
+    app.connect("build-finished", write_compat_matrix)
 
     return {
         "version": "0.1",
+        "env_version": 6,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
@@ -321,7 +1431,7 @@ EOF
 # current sphinx todo extension
 # https://github.com/sphinx-doc/sphinx/blob/master/sphinx/ext/todo.py
 # but blackened
-cat <<'EOF' >docs/source/_ext/todo.py
+update docs/source/_ext/todo.py <<'EOF'
 """Allow todos to be inserted into your documentation.
 
 Inclusion of todos can be switched of by a configuration variable.
@@ -337,7 +1447,10 @@ from typing import TYPE_CHECKING, Any, ClassVar, cast
 
 from docutils import nodes
 from docutils.parsers.rst import directives
-from docutils.parsers.rst.directives.admonitions import BaseAdmonition
+from docutils.parsers.rst.directives.admonitions import (
+    BaseAdmonition,
+    normalize_options,
+)
 
 import sphinx
 from sphinx import addnodes
@@ -347,6 +1460,10 @@ from sphinx.locale import _, __
 from sphinx.util import logging, texescape
 from sphinx.util.docutils import SphinxDirective, new_document
 
+import listpages
+import parsecache
+from hooktimings import timed
+
 if TYPE_CHECKING:
     from docutils.nodes import Element, Node
 
@@ -382,22 +1499,24 @@ class Todo(BaseAdmonition, SphinxDirective):
         "name": directives.unchanged,
     }
 
+    @timed("Todo.run")
     def run(self) -> list[Node]:
+        # nothing is parsed nor collected, as if the directive was not there
+        if not self.config.todo_include_todos and not self.config.todo_emit_warnings:
+            return []
         if not self.options.get("class"):
             self.options["class"] = ["admonition-todo"]
 
-        (todo,) = super().run()
-        if isinstance(todo, nodes.system_message):
-            return [todo]
-        elif isinstance(todo, todo_node):
-            todo.insert(0, nodes.title(text=_("Todo")))
-            todo["docname"] = self.env.docname
-            self.add_name(todo)
-            self.set_source_info(todo)
-            self.state.document.note_explicit_target(todo)
-            return [todo]
-        else:
-            raise RuntimeError  # never reached here
+        # BaseAdmonition.run, with the content parsed through the cache
+        self.assert_has_content()
+        todo = todo_node("\n".join(self.content), **normalize_options(self.options))
+        todo += nodes.title(text=_("Todo"))
+        parsecache.nested_parse(self, todo)
+        todo["docname"] = self.env.docname
+        self.add_name(todo)
+        self.set_source_info(todo)
+        self.state.document.note_explicit_target(todo)
+        return [todo]
 
 
 class TodoDomain(Domain):
@@ -408,20 +1527,39 @@ class TodoDomain(Domain):
     def todos(self) -> dict[str, list[todo_node]]:
         return self.data.setdefault("todos", {})
 
+    @property
+    def todolists(self) -> set[str]:
+        """Docnames containing a ``todolist`` directive."""
+        return self.data.setdefault("todolists", set())
+
+    def note_todolist(self, docname: str) -> None:
+        self.todolists.add(docname)
+
+    @timed("TodoDomain.clear_doc")
     def clear_doc(self, docname: str) -> None:
         self.todos.pop(docname, None)
+        self.todolists.discard(docname)
 
+    @timed("TodoDomain.merge_domaindata")
     def merge_domaindata(self, docnames: list[str], otherdata: dict[str, Any]) -> None:
+        # workers only hold the docnames they collected todos for
+        todos = otherdata.get("todos", {})
         for docname in docnames:
-            self.todos[docname] = otherdata["todos"][docname]
+            if docname in todos:
+                self.todos[docname] = todos[docname]
+            if docname in otherdata.get("todolists", ()):
+                self.todolists.add(docname)
 
+    @timed("TodoDomain.process_doc")
     def process_doc(
         self, env: BuildEnvironment, docname: str, document: nodes.document
     ) -> None:
+        if not env.config.todo_include_todos and not env.config.todo_emit_warnings:
+            return
         todos = self.todos.setdefault(docname, [])
         for todo in document.findall(todo_node):
             env.app.emit("todo-defined", todo)
-            todos.append(todo)
+            todos.append(detach_todo(todo))
 
             if env.config.todo_emit_warnings:
                 logger.warning(
@@ -429,6 +1567,18 @@ class TodoDomain(Domain):
                 )
 
 
+def detach_todo(todo: todo_node) -> todo_node:
+    """Return a copy of *todo* that does not reference its document.
+
+    Domain data is pickled with the environment, and sent back by every
+    worker of a parallel read; the live node would drag its doctree along.
+    """
+    new_todo = todo.deepcopy()
+    for node in new_todo.findall():
+        node.document = None
+    return new_todo
+
+
 class TodoList(SphinxDirective):
     """
     A list of all todo entries.
@@ -438,50 +1588,79 @@ class TodoList(SphinxDirective):
     required_arguments = 0
     optional_arguments = 0
     final_argument_whitespace = False
-    option_spec: ClassVar[OptionSpec] = {}
+    option_spec: ClassVar[OptionSpec] = {
+        "per-page": directives.positive_int,
+    }
 
+    @timed("TodoList.run")
     def run(self) -> list[Node]:
+        if not self.config.todo_include_todos:
+            return []
         # Simply insert an empty todolist node which will be replaced later
         # when process_todo_nodes is called
-        return [todolist("")]
+        domain = cast(TodoDomain, self.env.get_domain("todo"))
+        domain.note_todolist(self.env.docname)
+        return [todolist("", per_page=self.options.get("per-page"))]
 
 
 class TodoListProcessor:
     def __init__(self, app: Sphinx, doctree: nodes.document, docname: str) -> None:
+        self.app = app
         self.builder = app.builder
         self.config = app.config
         self.env = app.env
         self.domain = cast(TodoDomain, app.env.get_domain("todo"))
-        self.document = new_document("")
 
         self.process(doctree, docname)
 
+    @timed("TodoListProcessor.process")
     def process(self, doctree: nodes.document, docname: str) -> None:
+        if docname not in self.domain.todolists:
+            return
+
+        self.document = new_document("")
+        # sorted, so the order does not depend on the parallel read workers
         todos: list[todo_node] = functools.reduce(
-            operator.iadd, self.domain.todos.values(), []
+            operator.iadd,
+            (self.domain.todos[docname] for docname in sorted(self.domain.todos)),
+            [],
         )
-        for node in list(doctree.findall(todolist)):
-            if not self.config.todo_include_todos:
-                node.parent.remove(node)
-                continue
-
+        for index, node in enumerate(list(doctree.findall(todolist))):
             if node.get("ids"):
                 content: list[Element] = [nodes.target()]
             else:
                 content = []
 
-            for todo in todos:
-                # Create a copy of the todo node
-                new_todo = todo.deepcopy()
-                new_todo["ids"].clear()
+            tag = "todo-%d" % (index + 1) if index else "todo"
+            content.extend(
+                listpages.paginate(
+                    self.app,
+                    docname,
+                    tag,
+                    todos,
+                    node.get("per_page"),
+                    self.render_todos,
+                )
+            )
 
-                self.resolve_reference(new_todo, docname)
-                content.append(new_todo)
+            node.replace_self(content)
 
-                todo_ref = self.create_todo_reference(todo, docname)
-                content.append(todo_ref)
+    def render_todos(self, todos: list[todo_node], pagename: str) -> list[Element]:
+        new_todos = []
+        for todo in todos:
+            # Create a copy of the todo node
+            new_todo = todo.deepcopy()
+            new_todo["ids"].clear()
+            new_todos.append(new_todo)
 
-            node.replace_self(content)
+        content: list[Element] = []
+        new_todos = self.resolve_references(new_todos, pagename)
+        for todo, new_todo in zip(todos, new_todos):
+            content.append(new_todo)
+
+            todo_ref = self.create_todo_reference(todo, pagename)
+            content.append(todo_ref)
+        return content
 
     def create_todo_reference(self, todo: todo_node, docname: str) -> nodes.paragraph:
         if self.config.todo_link_only:
@@ -515,16 +1694,20 @@ class TodoListProcessor:
 
         return para
 
-    def resolve_reference(self, todo: todo_node, docname: str) -> None:
-        """Resolve references in the todo content."""
-        for node in todo.findall(addnodes.pending_xref):
-            if "refdoc" in node:
-                node["refdoc"] = docname
+    @timed("TodoListProcessor.resolve_references")
+    def resolve_references(self, todos: list[todo_node], docname: str) -> list[Node]:
+        """Resolve references in the todo contents in a single pass."""
+        for todo in todos:
+            for node in todo.findall(addnodes.pending_xref):
+                if "refdoc" in node:
+                    node["refdoc"] = docname
 
         # Note: To resolve references, it is needed to wrap it with document node
-        self.document += todo
+        self.document.extend(todos)
         self.env.resolve_references(self.document, docname, self.builder)
-        self.document.remove(todo)
+        resolved = self.document.children[:]
+        del self.document[:]
+        return resolved
 
 
 def visit_todo_node(self: HTML5Translator, node: todo_node) -> None:
@@ -556,10 +1739,14 @@ def latex_depart_todo_node(self: LaTeXTranslator, node: todo_node) -> None:
 
 
 def setup(app: Sphinx) -> ExtensionMetadata:
+    app.setup_extension("hooktimings")
+    app.setup_extension("listpages")
+    app.setup_extension("parsecache")
     app.add_event("todo-defined")
-    app.add_config_value("todo_include_todos", False, "html")
+    # "env": turning todos off must drop the ones already collected
+    app.add_config_value("todo_include_todos", False, "env")
     app.add_config_value("todo_link_only", False, "html")
-    app.add_config_value("todo_emit_warnings", False, "html")
+    app.add_config_value("todo_emit_warnings", False, "env")
 
     app.add_node(todolist)
     app.add_node(
@@ -577,51 +1764,1337 @@ def setup(app: Sphinx) -> ExtensionMetadata:
     app.connect("doctree-resolved", TodoListProcessor)
     return {
         "version": sphinx.__display_version__,
-        "env_version": 2,
+        "env_version": 4,
         "parallel_read_safe": True,
+        "parallel_write_safe": True,
     }
 EOF
 
-cat <<'EOF' >docs/source/conf.py
-import os
-import pathlib
-import subprocess
-import sys
-sys.path.insert(0, pathlib.Path(__file__).parents[2].resolve().as_posix())
-sys.path.append(os.path.abspath("./_ext"))
-print(f"{sys.path=}")
-if "CONDA_DEFAULT_ENV" in os.environ or "conda" in sys.executable:
-    print("conda environment:")
-    subprocess.run([os.environ.get("CONDA_EXE", "conda"), "list"])
-else:
-    print("pip environment:")
-    subprocess.run([sys.executable, "-m", "pip", "list"])
-project = "compatsphinxext"
-copyright = "2024, RAPIDS contrib"
-author = "RAPIDS contrib"
+update docs/source/_ext/compatsignatures.py <<'EOF'
+"""Add the parameter differences with the upstream object to compat notes.
+
+For every ``<name>-compat`` note inside a documented function, the signature
+of the function is compared with the one of the upstream object named on
+the first line of the note, and the differences are appended to the note.
+``self`` is not compared. When the upstream object is a method and the
+local one a function, the first parameter of the function is the data the
+method works on and is not compared either. A note with the
+``:no-signature:`` option is left as it is.
+
+Upstream signatures are cached in the doctree directory, one file per
+object in a directory per library version, so they are only introspected
+again after the library was upgraded. Files are replaced atomically, so
+parallel workers can share the cache. The versions each document was
+compared against are kept in the environment, so upgrading a library
+reads the documents comparing with it again.
+"""
 
-extensions = [
-    "numpydoc",
-    "sphinx.ext.autodoc",
-    "sphinx.ext.autosummary",
-    "sphinx.ext.githubpages",
-    "sphinx.ext.intersphinx",
-    "PandasCompat",
-    "todo",
-]
+from __future__ import annotations
+
+import importlib
+import importlib.metadata
+import inspect
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from docutils import nodes
+from sphinx.locale import _
+from sphinx.transforms import SphinxTransform
+from sphinx.util import logging
+
+from PandasCompat import PandasCompat, local_object, upstream_target
+
+if TYPE_CHECKING:
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+    from sphinx.util.typing import ExtensionMetadata
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRNAME = "compat_signatures"
+
+# name -> repr of the default, or None
+Parameters = dict[str, "str | None"]
+
+
+class Signature(NamedTuple):
+    parameters: Parameters
+    # whether the object is a method, whose self is left out
+    method: bool
+
+
+def import_object(name: str) -> Any:
+    """Return the object named by a dotted *name*, or None."""
+    parts = name.split(".")
+    for i in range(len(parts), 0, -1):
+        try:
+            obj = importlib.import_module(".".join(parts[:i]))
+        except ImportError:
+            continue
+        try:
+            for attr in parts[i:]:
+                obj = getattr(obj, attr)
+        except AttributeError:
+            return None
+        return obj
+    return None
+
+
+def is_method(name: str) -> bool:
+    """Whether *name* is a method taking ``self``, looked up on its class."""
+    owner, _, attr = name.rpartition(".")
+    cls = import_object(owner) if owner else None
+    if not inspect.isclass(cls):
+        return False
+    # class methods come bound, static methods take no self
+    attribute = inspect.getattr_static(cls, attr, None)
+    return (
+        callable(attribute)
+        and not inspect.isclass(attribute)
+        and not isinstance(attribute, (staticmethod, classmethod))
+    )
+
+
+def get_parameters(name: str) -> Signature | None:
+    """Introspect the parameters of *name*, without ``self``."""
+    obj = import_object(name)
+    if obj is None or not callable(obj):
+        return None
+    try:
+        signature = inspect.signature(obj)
+    except (TypeError, ValueError):
+        return None
+    method = is_method(name)
+    params = list(signature.parameters.values())[1 if method else 0 :]
+    return Signature(
+        {
+            param.name: None if param.default is param.empty else repr(param.default)
+            for param in params
+        },
+        method,
+    )
+
+
+def library_version(library: str) -> str | None:
+    try:
+        return importlib.metadata.version(library)
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    distributions = importlib.metadata.packages_distributions().get(library)
+    if distributions:
+        return importlib.metadata.version(distributions[0])
+    return None
+
+
+class SignatureCache:
+    """Upstream parameters, on disk per library version and in memory."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.signatures: dict[str, Signature | None] = {}
+        self.versions: dict[str, str | None] = {}
+
+    def version(self, library: str) -> str | None:
+        if library not in self.versions:
+            self.versions[library] = library_version(library)
+        return self.versions[library]
+
+    def get(self, target: str) -> Signature | None:
+        if target in self.signatures:
+            return self.signatures[target]
+
+        library = target.partition(".")[0]
+        version = self.version(library)
+        path = self.directory / f"{library}-{version}" / f"{target}.json"
+        if version is not None:
+            try:
+                data = json.loads(path.read_text())
+                self.signatures[target] = (
+                    None
+                    if data["parameters"] is None
+                    else Signature(data["parameters"], data["method"])
+                )
+                return self.signatures[target]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        signature = self.signatures[target] = get_parameters(target)
+        if version is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                if signature is None:
+                    json.dump({"parameters": None}, f)
+                else:
+                    json.dump(signature._asdict(), f)
+            os.replace(tmp, path)
+        return signature
+
+
+# set up at builder-inited, before parallel read workers are forked
+_cache: SignatureCache | None = None
+
+
+def literals(label: str, names: list[str]) -> nodes.list_item:
+    para = nodes.paragraph("", label)
+    for i, name in enumerate(names):
+        if i:
+            para += nodes.Text(", ")
+        para += nodes.literal(name, name)
+    return nodes.list_item("", para)
+
+
+def diff_parameters(local: Parameters, upstream: Parameters) -> list[nodes.list_item]:
+    """Return list items describing how *local* differs from *upstream*."""
+    items = []
+    missing = [name for name in upstream if name not in local]
+    if missing:
+        items.append(literals(_("Not supported: "), missing))
+    extra = [name for name in local if name not in upstream]
+    if extra:
+        items.append(literals(_("Not in upstream: "), extra))
+    for name, default in local.items():
+        if name in upstream and upstream[name] != default:
+            para = nodes.paragraph("", _("Default of "))
+            para += nodes.literal(name, name)
+            para += nodes.Text(_(" is "))
+            para += nodes.literal(str(default), str(default))
+            para += nodes.Text(_(" instead of "))
+            para += nodes.literal(str(upstream[name]), str(upstream[name]))
+            items.append(nodes.list_item("", para))
+    return items
+
+
+class CompatSignatureDiff(SphinxTransform):
+    """Append the parameter differences to every compat note."""
+
+    # before SphinxDomains, so the differences are collected with the note
+    default_priority = 840
+
+    def apply(self, **kwargs: Any) -> None:
+        if _cache is None:
+            return
+        for pandascompat in self.document.findall(PandasCompat):
+            if pandascompat.get("no_signature"):
+                continue
+            local = local_object(pandascompat)
+            upstream = upstream_target(pandascompat.rawsource)
+            if not local or not upstream:
+                continue
+
+            library = upstream.partition(".")[0]
+            versions = self.env.compat_signature_versions
+            versions.setdefault(self.env.docname, {})[library] = _cache.version(
+                library
+            )
+            local_signature = get_parameters(local)
+            upstream_signature = _cache.get(upstream)
+            if local_signature is None or upstream_signature is None:
+                logger.debug(
+                    "cannot compare the signatures of %s and %s", local, upstream
+                )
+                continue
+
+            local_parameters = local_signature.parameters
+            if upstream_signature.method and not local_signature.method:
+                # the data the upstream method works on
+                local_parameters = dict(list(local_parameters.items())[1:])
+            items = diff_parameters(local_parameters, upstream_signature.parameters)
+            title = _("Signature differences:") if items else _("Same parameters.")
+            pandascompat += nodes.paragraph("", "", nodes.strong(title, title))
+            if items:
+                pandascompat += nodes.bullet_list("", *items, bullet="-")
+
+
+def init_cache(app: Sphinx) -> None:
+    global _cache
+
+    # docname -> {library: version} of the upstream objects compared with
+    if not hasattr(app.env, "compat_signature_versions"):
+        app.env.compat_signature_versions = {}
+    if not app.config.include_pandas_compat:
+        _cache = None
+        return
+    _cache = SignatureCache(Path(app.doctreedir, CACHE_DIRNAME))
+
+
+def purge_versions(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+    env.compat_signature_versions.pop(docname, None)
+
+
+def merge_versions(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+) -> None:
+    for docname in docnames:
+        if docname in other.compat_signature_versions:
+            env.compat_signature_versions[docname] = (
+                other.compat_signature_versions[docname]
+            )
+
+
+def get_upgraded_docs(
+    app: Sphinx,
+    env: BuildEnvironment,
+    added: set[str],
+    changed: set[str],
+    removed: set[str],
+) -> list[str]:
+    """Read again the documents compared with a library since upgraded."""
+    if _cache is None:
+        return []
+    return [
+        docname
+        for docname, versions in env.compat_signature_versions.items()
+        if docname not in removed
+        and any(
+            _cache.version(library) != version
+            for library, version in versions.items()
+        )
+    ]
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.setup_extension("PandasCompat")
+    app.add_transform(CompatSignatureDiff)
+    app.connect("builder-inited", init_cache)
+    app.connect("env-purge-doc", purge_versions)
+    app.connect("env-merge-info", merge_versions)
+    app.connect("env-get-outdated", get_upgraded_docs)
+    return {
+        "version": "0.1",
+        "env_version": 2,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
+EOF
+
+update docs/source/_ext/envreport.py <<'EOF'
+"""Write a report of the Python environment the docs were built with.
+
+Enabled with ``env_report = True``. The report lists the installed
+distributions (or ``conda list`` in a conda environment) and is cached in the
+doctree directory, keyed by a fingerprint of the installed distributions, so
+it is only regenerated after the environment changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sphinx.locale import __
+from sphinx.util import logging
+
+if TYPE_CHECKING:
+    from sphinx.application import Sphinx
+    from sphinx.util.typing import ExtensionMetadata
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "env_report.json"
+REPORT_FILENAME = "_environment.txt"
+
+
+def is_conda() -> bool:
+    return "CONDA_DEFAULT_ENV" in os.environ or "conda" in sys.executable
+
+
+def installed_distributions() -> list[tuple[str, str]]:
+    return sorted(
+        {(dist.name or "", dist.version) for dist in importlib.metadata.distributions()}
+    )
+
+
+def fingerprint(distributions: list[tuple[str, str]]) -> str:
+    digest = hashlib.sha256(f"{sys.executable}\0{sys.version}".encode())
+    for name, version in distributions:
+        digest.update(f"\0{name}=={version}".encode())
+    return digest.hexdigest()
+
+
+def make_report(distributions: list[tuple[str, str]]) -> str:
+    header = f"python {sys.version} ({sys.executable})\n\n"
+    if is_conda():
+        result = subprocess.run(
+            [os.environ.get("CONDA_EXE", "conda"), "list"],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            return header + "conda environment:\n" + result.stdout
+
+    width = max((len(name) for name, _ in distributions), default=0)
+    lines = [f"{name:<{width}} {version}" for name, version in distributions]
+    return header + "pip environment:\n" + "\n".join(lines) + "\n"
+
+
+def write_env_report(app: Sphinx) -> None:
+    if not app.config.env_report:
+        return
+
+    distributions = installed_distributions()
+    key = fingerprint(distributions)
+    cache_path = Path(app.doctreedir, CACHE_FILENAME)
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        cached = {}
+
+    if cached.get("fingerprint") == key:
+        report = cached["report"]
+    else:
+        report = make_report(distributions)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"fingerprint": key, "report": report}))
+
+    report_path = Path(app.outdir, REPORT_FILENAME)
+    if not report_path.is_file() or report_path.read_text() != report:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(report)
+        logger.info(__("environment report written to %s"), report_path)
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.add_config_value("env_report", False, "", bool)
+    app.connect("builder-inited", write_env_report)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
+EOF
+
+update docs/source/_ext/hooktimings.py <<'EOF'
+"""Time the directives, domain hooks and processors of the local extensions.
+
+Enabled with ``hook_timings = True``. Every function decorated with
+:func:`timed`, and every block wrapped in :func:`timing`, records its call
+count and its cumulative and maximum time per docname. At ``build-finished``
+a report sorted by cumulative time is written to ``hook_timings.txt`` and
+``hook_timings.json`` in the output directory.
+
+Timings live on the environment, so the ones taken by parallel read workers
+are sent back and merged like any other environment data.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sphinx.locale import __
+from sphinx.util import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+    from sphinx.util.typing import ExtensionMetadata
+
+logger = logging.getLogger(__name__)
+
+# hook -> docname -> [calls, total, max, self]; None while disabled
+_timings: dict[str, dict[str, list[float]]] | None = None
+# time spent in nested timings, one entry per active timing
+_children: list[float] = []
+
+REPORT_LIMIT = 20
+
+
+class timing:
+    """Context manager timing a block as *hook* for *docname*."""
+
+    __slots__ = ("hook", "docname", "start")
+
+    def __init__(self, hook: str, docname: str) -> None:
+        self.hook = hook
+        self.docname = docname
+
+    def __enter__(self) -> None:
+        if _timings is not None:
+            _children.append(0.0)
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if _timings is None or not _children:
+            return
+        elapsed = time.perf_counter() - self.start
+        children = _children.pop()
+        if _children:
+            _children[-1] += elapsed
+
+        stats = _timings.setdefault(self.hook, {}).setdefault(
+            self.docname, [0, 0.0, 0.0, 0.0]
+        )
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        stats[3] += elapsed - children
+
+
+def timed(hook: str) -> Callable[[Callable], Callable]:
+    """Decorate a function so its calls are timed as *hook*.
+
+    The docname is taken from a ``docname`` parameter if the function has
+    one, otherwise from ``self.env.docname`` (e.g. for directives).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        params = list(inspect.signature(func).parameters)
+        index = params.index("docname") if "docname" in params else None
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _timings is None:
+                return func(*args, **kwargs)
+            if index is None:
+                env = getattr(args[0], "env", None) if args else None
+                docname = getattr(env, "docname", "")
+            elif "docname" in kwargs:
+                docname = kwargs["docname"]
+            else:
+                docname = args[index]
+            with timing(hook, docname):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def start_timings(app: Sphinx) -> None:
+    global _timings
+
+    _children.clear()
+    if app.config.hook_timings:
+        _timings = app.env.hook_timings = {}
+    else:
+        _timings = None
+        if hasattr(app.env, "hook_timings"):
+            del app.env.hook_timings
+
+
+def merge_timings(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+) -> None:
+    if _timings is None:
+        return
+    # a worker's copy also holds what was timed before it was forked, so only
+    # the documents it read are taken, replacing the main process' numbers
+    for hook, per_doc in getattr(other, "hook_timings", {}).items():
+        merged = _timings.setdefault(hook, {})
+        for docname in docnames:
+            if docname in per_doc:
+                merged[docname] = per_doc[docname]
+
+
+def make_report(timings: dict[str, dict[str, list[float]]]) -> dict[str, Any]:
+    hooks = []
+    documents: dict[str, dict[str, Any]] = {}
+    for hook, per_doc in timings.items():
+        hooks.append(
+            {
+                "hook": hook,
+                "calls": sum(stats[0] for stats in per_doc.values()),
+                "total": sum(stats[1] for stats in per_doc.values()),
+                "max": max(stats[2] for stats in per_doc.values()),
+            }
+        )
+        for docname, (calls, total, maximum, own) in per_doc.items():
+            document = documents.setdefault(
+                docname, {"docname": docname, "total": 0.0, "hooks": {}}
+            )
+            # nested timings are already part of their parent's total
+            document["total"] += own
+            document["hooks"][hook] = {"calls": calls, "total": total, "max": maximum}
+
+    return {
+        "hooks": sorted(hooks, key=lambda row: row["total"], reverse=True),
+        "documents": sorted(
+            documents.values(), key=lambda row: row["total"], reverse=True
+        ),
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    width = max((len(row["hook"]) for row in report["hooks"]), default=4)
+    lines = [
+        "Hooks (inclusive time, seconds)",
+        "",
+        f"{'hook':<{width}} {'calls':>8} {'total':>10} {'max':>10}",
+    ]
+    for row in report["hooks"]:
+        lines.append(
+            f"{row['hook']:<{width}} {row['calls']:>8} "
+            f"{row['total']:>10.4f} {row['max']:>10.4f}"
+        )
+
+    documents = report["documents"][:REPORT_LIMIT]
+    width = max((len(row["docname"] or "-") for row in documents), default=7)
+    lines += [
+        "",
+        f"Slowest {len(documents)} documents (seconds)",
+        "",
+        f"{'docname':<{width}} {'total':>10}  slowest hook",
+    ]
+    for row in documents:
+        slowest = max(row["hooks"], key=lambda hook: row["hooks"][hook]["total"])
+        lines.append(
+            f"{row['docname'] or '-':<{width}} {row['total']:>10.4f}  {slowest}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_report(app: Sphinx, exception: Exception | None) -> None:
+    if _timings is None or exception is not None:
+        return
+
+    report = make_report(_timings)
+    outdir = Path(app.outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    (outdir / "hook_timings.json").write_text(json.dumps(report, indent=2) + "\n")
+    (outdir / "hook_timings.txt").write_text(format_report(report))
+    logger.info(__("hook timings written to %s"), outdir / "hook_timings.txt")
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.add_config_value("hook_timings", False, "", bool)
+    app.connect("builder-inited", start_timings)
+    app.connect("env-merge-info", merge_timings)
+    app.connect("build-finished", write_report)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
+EOF
+
+update docs/source/_ext/intersphinx_cache.py <<'EOF'
+"""Serve intersphinx inventories from a local, vendored cache.
+
+Every remote inventory in :confval:`intersphinx_mapping` is stored once in
+``intersphinx_cache_dir`` as ``<name>.inv``, next to a ``manifest.json``
+recording where and when it was fetched. An inventory is only downloaded
+again when ``intersphinx_cache_ttl`` (in days) expires or its entry in
+``intersphinx_cache_versions`` changes; with ``intersphinx_cache_offline``
+the network is never used. The decoded inventories are pickled in the
+doctree directory, so builds skip both the download and the parsing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import posixpath
+import time
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sphinx.ext.intersphinx import InventoryAdapter
+from sphinx.locale import __
+from sphinx.util import logging, requests
+from sphinx.util.inventory import InventoryFile
+
+if TYPE_CHECKING:
+    from sphinx.application import Sphinx
+    from sphinx.util.typing import ExtensionMetadata
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+class InventoryCache:
+    """Vendored ``objects.inv`` files and their decoded form."""
+
+    def __init__(self, directory: Path, decoded_dir: Path) -> None:
+        self.directory = directory
+        self.decoded_dir = decoded_dir
+        try:
+            self.manifest: dict[str, dict[str, Any]] = json.loads(
+                (directory / MANIFEST_FILENAME).read_text()
+            )
+        except FileNotFoundError:
+            self.manifest = {}
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.inv"
+
+    def is_fresh(
+        self, name: str, uri: str, version: str | None, ttl: float | None, now: int
+    ) -> bool:
+        entry = self.manifest.get(name)
+        if entry is None or not self.path(name).is_file():
+            return False
+        if entry["uri"] != uri or entry.get("version") != version:
+            return False
+        return ttl is None or now - entry["fetched"] < ttl * 86400
+
+    def fetch(
+        self,
+        name: str,
+        uri: str,
+        location: str,
+        version: str | None,
+        timeout: float | None,
+        now: int,
+    ) -> None:
+        response = requests.get(location, timeout=timeout)
+        response.raise_for_status()
+        raw_data = response.content
+        # refuse to vendor anything that is not a valid inventory
+        InventoryFile.loads(raw_data, uri=uri)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path(name).write_bytes(raw_data)
+        self.manifest[name] = {
+            "uri": uri,
+            "location": location,
+            "version": version,
+            "fetched": now,
+        }
+        (self.directory / MANIFEST_FILENAME).write_text(
+            json.dumps(self.manifest, indent=2, sort_keys=True) + "\n"
+        )
+
+    def key(self, name: str, uri: str) -> str:
+        """Identify the decoded form of an inventory.
+
+        Decoded entries embed links joined with *uri*, so it is part of the key.
+        """
+        digest = hashlib.sha256(uri.encode())
+        digest.update(self.path(name).read_bytes())
+        return digest.hexdigest()
+
+    def load(self, name: str, uri: str, key: str) -> dict[str, Any]:
+        decoded = self.decoded_dir / f"{name}-{key[:16]}.pickle"
+        try:
+            with open(decoded, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        data = InventoryFile.loads(self.path(name).read_bytes(), uri=uri).data
+        self.decoded_dir.mkdir(parents=True, exist_ok=True)
+        with open(decoded, "wb") as f:
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        return data
+
+
+def load_vendored_inventories(app: Sphinx) -> None:
+    """Seed the intersphinx cache before ``sphinx.ext.intersphinx`` loads it.
+
+    Seeded entries are stamped with the current time, so intersphinx
+    considers them fresh and does not fetch them itself.
+    """
+    config = app.config
+    if not config.intersphinx_cache_dir:
+        return
+
+    cache = InventoryCache(
+        Path(app.confdir, config.intersphinx_cache_dir),
+        Path(app.doctreedir, "intersphinx_decoded"),
+    )
+    inventories = InventoryAdapter(app.env)
+    # name -> key of the decoded inventory already held by the environment
+    seeded: dict[str, str] = getattr(app.env, "intersphinx_cache_seeded", {})
+    now = int(time.time())
+    updated = False
+
+    for name, (uri, locations) in config.intersphinx_mapping.values():
+        location = locations[0] if locations else None
+        if location is None:
+            location = posixpath.join(uri, "objects.inv")
+        if "://" not in location:
+            # local inventories are already offline
+            continue
+
+        version = config.intersphinx_cache_versions.get(name)
+        if not config.intersphinx_cache_offline and not cache.is_fresh(
+            name, uri, version, config.intersphinx_cache_ttl, now
+        ):
+            logger.info(
+                __("refreshing intersphinx inventory '%s' from %s ..."), name, location
+            )
+            try:
+                cache.fetch(
+                    name, uri, location, version, config.intersphinx_timeout, now
+                )
+            except Exception as err:
+                logger.warning(
+                    __("failed to refresh intersphinx inventory '%s': %s"), name, err
+                )
+
+        if not cache.path(name).is_file():
+            if config.intersphinx_cache_offline:
+                logger.warning(
+                    __("no vendored intersphinx inventory for '%s' in %s"),
+                    name,
+                    cache.directory,
+                )
+                # an empty entry keeps intersphinx from going to the network;
+                # expire_placeholders backdates it once intersphinx is done
+                inventories.cache[uri] = (name, now, {})
+                seeded.pop(name, None)
+                updated = True
+            continue
+
+        key = cache.key(name, uri)
+        if seeded.get(name) == key and uri in inventories.cache:
+            inventories.cache[uri] = (name, now, inventories.cache[uri][2])
+            continue
+        inventories.cache[uri] = (name, now, cache.load(name, uri, key))
+        seeded[name] = key
+        updated = True
+
+    app.env.intersphinx_cache_seeded = seeded
+    if updated:
+        # same merge as sphinx.ext.intersphinx.load_mappings
+        inventories.clear()
+        for name, _expiry, invdata in sorted(
+            inventories.cache.values(), key=itemgetter(0, 1)
+        ):
+            inventories.named_inventory[name] = invdata
+            for objtype, objects in invdata.items():
+                inventories.main_inventory.setdefault(objtype, {}).update(objects)
+
+
+def expire_placeholders(app: Sphinx) -> None:
+    """Mark the empty entries of missing offline inventories as expired.
+
+    They only keep this build from fetching. Stamped with the current time,
+    they would still count as fresh for ``intersphinx_cache_limit`` days
+    once back online, leaving the references to them unresolved.
+    """
+    if not app.config.intersphinx_cache_offline:
+        return
+    cache = InventoryAdapter(app.env).cache
+    for uri, (name, _expiry, invdata) in list(cache.items()):
+        if not invdata:
+            cache[uri] = (name, 0, invdata)
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.setup_extension("sphinx.ext.intersphinx")
+    app.add_config_value("intersphinx_cache_dir", "", "", str)
+    app.add_config_value("intersphinx_cache_ttl", None, "", (int, float))
+    app.add_config_value("intersphinx_cache_versions", {}, "", dict)
+    app.add_config_value("intersphinx_cache_offline", False, "", bool)
+
+    # before sphinx.ext.intersphinx.load_mappings (priority 500)
+    app.connect("builder-inited", load_vendored_inventories, priority=400)
+    # once sphinx.ext.intersphinx.load_mappings has read the cache
+    app.connect("builder-inited", expire_placeholders, priority=600)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
+EOF
+
+update docs/source/_ext/listpages.py <<'EOF'
+"""Split long collected lists across generated pages.
+
+``todolist`` and ``<name>-compat-list`` accept ``:per-page: N``. With an HTML
+builder, the page hosting the list keeps the first *N* entries and the others
+are written to ``<docname>-<tag>-<n>`` pages, each with links to the rest.
+Every extra page is built from its own doctree when it is written, so only
+one page worth of entries is held in memory at a time. Other builders get
+the whole list on the hosting page.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from docutils import nodes
+from sphinx.builders.html import StandaloneHTMLBuilder
+from sphinx.locale import _
+from sphinx.util.docutils import new_document
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+    from docutils.nodes import Node
+    from sphinx.application import Sphinx
+    from sphinx.util.typing import ExtensionMetadata
+
+
+class ListPage(NamedTuple):
+    """An extra page of a list, rendered when ``html-collect-pages`` fires."""
+
+    pagename: str
+    pagenames: list[str]
+    titles: list[str]
+    entries: Sequence[Any]
+    render: Callable[[Sequence[Any], str], list[Node]]
+
+
+# extra pages noted while the hosting pages are written
+_pending: list[ListPage] = []
+
+
+def paginate(
+    app: Sphinx,
+    docname: str,
+    tag: str,
+    entries: Sequence[Any],
+    per_page: int | None,
+    render: Callable[[Sequence[Any], str], list[Node]],
+) -> list[Node]:
+    """Return the content of the list on *docname*.
+
+    ``render(entries, pagename)`` builds the nodes for *entries* as shown on
+    *pagename*. The pages after the first are noted, and rendered later by
+    :func:`collect_pages`.
+    """
+    if (
+        not per_page
+        or len(entries) <= per_page
+        or not isinstance(app.builder, StandaloneHTMLBuilder)
+    ):
+        return render(entries, docname)
+
+    chunks = [entries[i : i + per_page] for i in range(0, len(entries), per_page)]
+    pagenames = [docname] + [
+        f"{docname}-{tag}-{number}" for number in range(2, len(chunks) + 1)
+    ]
+    title = app.env.titles[docname].astext()
+    titles = [title] + [
+        _("%s (page %d of %d)") % (title, number, len(chunks))
+        for number in range(2, len(chunks) + 1)
+    ]
+    for pagename, chunk in zip(pagenames[1:], chunks[1:]):
+        _pending.append(ListPage(pagename, pagenames, titles, chunk, render))
+
+    return render(chunks[0], docname) + [navigation(app, docname, pagenames)]
+
+
+def navigation(app: Sphinx, pagename: str, pagenames: list[str]) -> nodes.paragraph:
+    para = nodes.paragraph(classes=["list-pages"])
+    para += nodes.Text(_("Pages:"))
+    for number, other in enumerate(pagenames, start=1):
+        para += nodes.Text(" ")
+        if other == pagename:
+            para += nodes.strong(str(number), str(number))
+        else:
+            para += nodes.reference(
+                str(number),
+                str(number),
+                internal=True,
+                refuri=app.builder.get_relative_uri(pagename, other),
+            )
+    return para
+
+
+def clear_pending(app: Sphinx) -> None:
+    _pending.clear()
+
+
+def collect_pages(app: Sphinx) -> Iterator[tuple[str, dict[str, Any], str]]:
+    builder = app.builder
+    while _pending:
+        page = _pending.pop(0)
+        index = page.pagenames.index(page.pagename)
+        title = page.titles[index]
+
+        section = nodes.section(ids=[nodes.make_id(page.pagename)])
+        section += nodes.title(title, title)
+        section.extend(page.render(page.entries, page.pagename))
+        section += navigation(app, page.pagename, page.pagenames)
+        document = new_document(page.pagename, builder.docsettings)
+        document += section
+
+        # the same as StandaloneHTMLBuilder.write_doc; render_partial would
+        # apply docutils' admonition transform, which only knows its own nodes
+        builder.current_docname = page.pagename
+        visitor = builder.create_translator(document, builder)
+        document.walkabout(visitor)
+        body = "".join(visitor.fragment)
+
+        def link(other: int) -> dict[str, str]:
+            return {
+                "link": builder.get_relative_uri(page.pagename, page.pagenames[other]),
+                "title": page.titles[other],
+            }
+
+        yield (
+            page.pagename,
+            {
+                "title": title,
+                "body": body,
+                "parents": [link(0)],
+                "prev": link(index - 1),
+                "next": link(index + 1) if index + 1 < len(page.pagenames) else None,
+                "meta": None,
+                "metatags": "",
+                "rellinks": builder.globalcontext["rellinks"][:],
+                "sourcename": "",
+                "toc": "",
+                "display_toc": False,
+                "page_source_suffix": "",
+            },
+            "page.html",
+        )
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.connect("builder-inited", clear_pending)
+    app.connect("html-collect-pages", collect_pages)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
+EOF
+
+update docs/source/_ext/parsecache.py <<'EOF'
+"""Cache the content parsed by the ``<name>-compat`` and ``todo`` directives.
+
+The body of a note is parsed again every time its page is read, although
+most notes live in docstrings that rarely change. The parsed nodes are
+stored in the doctree directory, one file per document, each note keyed by
+a hash of its content and of the reference context it is parsed in. The
+files also depend on the versions of Sphinx, docutils and every loaded
+extension. They survive an environment reset, and a note is only reused
+for the exact same content. A file is replaced atomically once its document
+is read, with the notes found in this read only.
+
+Content that does more than produce nodes is parsed every time: anything
+with ids or names (targets, index entries, footnotes, nested notes), parse
+errors, pending transforms, includes, and directives changing the current
+module, role or domain. Disable the cache with ``parse_cache = False``.
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import TYPE_CHECKING, NamedTuple
+
+import docutils
+import sphinx
+from docutils import nodes
+
+if TYPE_CHECKING:
+    from docutils.nodes import Element, Node
+    from sphinx.application import Sphinx
+    from sphinx.util.docutils import SphinxDirective
+    from sphinx.util.typing import ExtensionMetadata
+
+CACHE_DIRNAME = "parse_cache"
+
+# bump when the layout of the cached files changes
+CACHE_FORMAT = 2
+
+
+class Entry(NamedTuple):
+    """Parsed content, as it was stored."""
+
+    offset: int
+    source: str
+    # pickled list of detached nodes, only unpickled when used
+    children: bytes
+    # the source and line the parse left the document at, which are given
+    # to the nodes added next without their own
+    end_source: str | None
+    end_line: int | None
+
+
+class ParseCache:
+    """Parsed directive content, on disk per document."""
+
+    def __init__(self, directory: str, salt: bytes) -> None:
+        self.directory = directory
+        self.salt = salt
+        # the document being read, its stored entries and the ones used
+        self.docname: str | None = None
+        self.stored: dict[str, Entry] = {}
+        self.used: dict[str, Entry | None] = {}
+
+    def path(self, docname: str) -> str:
+        # plain strings, Path objects cost more than the parsing saved
+        digest = hashlib.sha256(self.salt + docname.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pickle")
+
+    def key(self, directive: SphinxDirective) -> str:
+        env = directive.env
+        current = env.current_document
+        digest = hashlib.sha256()
+        for part in (
+            directive.name,
+            sorted(env.ref_context.items()),
+            current.default_role,
+            current.default_domain and current.default_domain.name,
+            current.highlight_language,
+            "\n".join(directive.content),
+        ):
+            digest.update(repr(part).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, docname: str, key: str) -> Entry | None:
+        if docname != self.docname:
+            self.docname = docname
+            self.stored = self.load(docname)
+            self.used = {}
+        if key not in self.used:
+            self.used[key] = self.stored.get(key)
+        return self.used[key]
+
+    def add(self, key: str, entry: Entry) -> None:
+        self.used[key] = entry
+
+    def load(self, docname: str) -> dict[str, Entry]:
+        try:
+            with open(self.path(docname), "rb") as f:
+                # much faster than pickle.load on the file
+                data = f.read()
+            return pickle.loads(data)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            return {}
+
+    def save(self, docname: str) -> None:
+        """Store the entries used while *docname* was read, when changed."""
+        if docname != self.docname:
+            return
+        used = {key: entry for key, entry in self.used.items() if entry is not None}
+        if used != self.stored:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(used, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path(docname))
+        self.docname = None
+        self.stored = {}
+        self.used = {}
+
+
+# set up at builder-inited, before parallel read workers are forked
+_cache: ParseCache | None = None
+
+
+def context(directive: SphinxDirective) -> tuple:
+    """What parsing may change besides the nodes it returns."""
+    env = directive.env
+    current = env.current_document
+    return (
+        dict(env.ref_context),
+        current.default_role,
+        current.default_domain,
+        current.highlight_language,
+        len(env.dependencies[env.docname]),
+    )
+
+
+def cacheable(children: list[Node]) -> bool:
+    for child in children:
+        for node in child.findall(nodes.Element):
+            if isinstance(
+                node, (nodes.system_message, nodes.problematic, nodes.pending)
+            ):
+                return False
+            if node["ids"] or node["names"] or "refname" in node or "refid" in node:
+                return False
+    return True
+
+
+def dumps(children: list[Node]) -> bytes:
+    """Pickle *children* without their parent and document, which are only
+    cleared while pickling; a detached copy costs more to make."""
+    parents = [(child, child.parent) for child in children]
+    documents = [
+        (descendant, descendant.document)
+        for child in children
+        for descendant in child.findall()
+    ]
+    try:
+        for child, _ in parents:
+            child.parent = None
+        for descendant, _ in documents:
+            descendant.document = None
+        return pickle.dumps(children, pickle.HIGHEST_PROTOCOL)
+    finally:
+        for child, parent in parents:
+            child.parent = parent
+        for descendant, document in documents:
+            descendant.document = document
+
+
+def nested_parse(directive: SphinxDirective, node: Element) -> None:
+    """Parse the content of *directive* into *node*, through the cache."""
+    content = directive.content
+    offset = directive.content_offset
+    if _cache is None or not content:
+        directive.state.nested_parse(content, offset, node)
+        return
+
+    key = _cache.key(directive)
+    source = content.source(0)
+    entry = _cache.get(directive.env.docname, key)
+    if entry is not None:
+        document = directive.state.document
+        # the nodes are small but many; with a large heap, collections
+        # triggered while unpickling them cost more than the parsing saved
+        gc.disable()
+        try:
+            children = pickle.loads(entry.children)
+        finally:
+            gc.enable()
+        shift = offset - entry.offset
+        for child in children:
+            for descendant in child.findall():
+                descendant.document = document
+            for element in child.findall(nodes.Element):
+                if element.source == entry.source:
+                    element.source = source
+                # a node without a line keeps none
+                if element.line is not None:
+                    element.line += shift
+            # not node.extend, which gives the current line to the children
+            # without one
+            child.parent = node
+        node.children.extend(children)
+        document.current_source = (
+            source if entry.end_source == entry.source else entry.end_source
+        )
+        document.current_line = (
+            None if entry.end_line is None else entry.end_line + shift
+        )
+        return
+
+    before = context(directive)
+    start = len(node)
+    directive.state.nested_parse(content, offset, node)
+    children = node.children[start:]
+    if context(directive) == before and cacheable(children):
+        document = directive.state.document
+        _cache.add(
+            key,
+            Entry(
+                offset,
+                source,
+                dumps(children),
+                document.current_source,
+                document.current_line,
+            ),
+        )
+
+
+def init_cache(app: Sphinx) -> None:
+    global _cache
+
+    if not app.config.parse_cache:
+        _cache = None
+        return
+    versions = [
+        CACHE_FORMAT,
+        sphinx.__version__,
+        docutils.__version__,
+        sorted((name, ext.version) for name, ext in app.extensions.items()),
+        app.config.default_role,
+    ]
+    directory = os.path.join(os.fspath(app.doctreedir), CACHE_DIRNAME)
+    _cache = ParseCache(directory, repr(versions).encode())
+
+
+def save_document(app: Sphinx, doctree: nodes.document) -> None:
+    if _cache is not None:
+        _cache.save(app.env.docname)
+
+
+def setup(app: Sphinx) -> ExtensionMetadata:
+    app.add_config_value("parse_cache", True, "", bool)
+    app.connect("builder-inited", init_cache)
+    app.connect("doctree-read", save_document)
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
+EOF
+
+update docs/source/conf.py <<'EOF'
+import os
+import pathlib
+import sys
+sys.path.insert(0, pathlib.Path(__file__).parents[2].resolve().as_posix())
+sys.path.append(os.path.abspath("./_ext"))
+project = "compatsphinxext"
+copyright = "2024, RAPIDS contrib"
+author = "RAPIDS contrib"
+
+extensions = [
+    "numpydoc",
+    "sphinx.ext.autodoc",
+    "sphinx.ext.autosummary",
+    "sphinx.ext.githubpages",
+    "sphinx.ext.intersphinx",
+    "intersphinx_cache",
+    "PandasCompat",
+    "compatsignatures",
+    "todo",
+    "envreport",
+]
 
 exclude_patterns = []
 pygments_style = "sphinx"
+html_theme_options = {
+    "github_url": "https://github.com/raybellwaves/compatsphinxext",
+}
 html_theme = "pydata_sphinx_theme"
 html_static_path = ["_static"]
 templates_path = ["_templates"]
 
 include_pandas_compat = True
 
+# every compat note, one JSON object per line, for coverage dashboards
+compat_matrix = "compat_matrix.jsonl"
+
+compat_upstreams = {
+    "pandas": "Pandas",
+    "networkx": "NetworkX",
+    "numpy": "NumPy",
+    "pyarrow": "PyArrow",
+}
+
 todo_include_todos = True
 
 autosummary_generate = True
 
+# build with ``-D env_report=1`` to write _environment.txt with the
+# installed packages; it is cached until the environment changes
+env_report = False
+
+# build with ``-D hook_timings=1`` to write hook_timings.txt/.json with the
+# time spent in each directive, domain hook and list processor
+hook_timings = False
+
+# inventories are served from _inventories/ and only refreshed when their
+# version in intersphinx_cache_versions changes; a missing one is fetched
+# there first. ``-D intersphinx_cache_offline=1`` never fetches them
+intersphinx_cache_dir = "_inventories"
+intersphinx_cache_versions = {}
+
 intersphinx_mapping = {
     "pandas": (
         "https://pandas.pydata.org/pandas-docs/stable/",
@@ -631,6 +3104,10 @@ intersphinx_mapping = {
         "https://docs.python.org/3",
         "https://docs.python.org/3/objects.inv",
     ),
+    "pyarrow": (
+        "https://arrow.apache.org/docs/",
+        None,
+    ),
     "networkx": (
         "https://networkx.org/documentation/stable/",
         "https://networkx.org/documentation/stable/objects.inv",
@@ -641,6 +3118,7 @@ intersphinx_mapping = {
     ),
 }
 
+
 def setup(app):
     app.add_css_file("https://docs.rapids.ai/assets/css/custom.css")
     app.add_js_file(
@@ -648,7 +3126,7 @@ def setup(app):
     )
 EOF
 
-cat <<'EOF' >docs/source/api.rst
+update docs/source/api.rst <<'EOF'
 .. currentmodule:: compatsphinxext
 
 .. _api:
@@ -665,11 +3143,16 @@ Top-level functions
 
    create_meal_df
    create_meal_g
+   empty
+   ewm
+   from_arrow
+   from_arrow_batches
    reindex
    rename
+   to_numeric
 EOF
 
-cat <<'EOF' >docs/source/compat.rst
+update docs/source/compat.rst <<'EOF'
 .. currentmodule:: compatsphinxext
 
 .. _compat:
@@ -678,12 +3161,28 @@ cat <<'EOF' >docs/source/compat.rst
 Compatability
 #############
 
+pandas
+======
+
+Notes are sorted by the pandas object they document, for example
+:pandascompat:compat:`pandas.DataFrame.reindex`.
+
 .. pandas-compat-list::
+   :sort: upstream
 
-EOF
+networkx
+========
 
+.. networkx-compat-list::
 
-cat <<'EOF' >docs/source/index.rst
+pyarrow
+=======
+
+.. pyarrow-compat-list::
+
+EOF
+
+update docs/source/index.rst <<'EOF'
 Welcome to compatsphinxext's documentation!
 ===========================================
 
@@ -701,7 +3200,7 @@ Check out the :doc:`usage` section for further information, including how to
    Compatability <compat>
 EOF
 
-cat <<'EOF' >docs/source/usage.rst
+update docs/source/usage.rst <<'EOF'
 Usage
 =====
 
@@ -718,10 +3217,14 @@ TODOS
 .. todolist::
 EOF
 
+if [ "$check" = 1 ]; then
+    exit "$drift"
+fi
+
 cd docs
 
 # One time creation
-# cat <<'EOF' >Makefile
+# update Makefile <<'EOF'
 # SPHINXOPTS    ?=
 # SPHINXBUILD   ?= sphinx-build
 # SOURCEDIR     = source
@@ -739,8 +3242,8 @@ cd docs
 # 	@$(SPHINXBUILD) -M $@ "$(SOURCEDIR)" "$(BUILDDIR)" $(SPHINXOPTS) $(O)
 # EOF
 
+# incremental: only the documents whose sources changed are read again;
+# run "make clean" first for a full rebuild
 make html
-# if building and testing locally comment these out
-make clean
 # this will build with a debugger
 #sphinx-build -b html docs/source docs/build/html -T -a -E -P
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""Check that importing compatsphinxext stays within its import time budget.
+
+The module is imported with ``python -X importtime`` in fresh interpreters.
+The best cumulative time must be under ``--budget`` milliseconds and none of
+the heavy dependencies may be imported along with it::
+
+    python scripts/check_importtime.py --budget 50
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).parents[1]
+
+# imported lazily, by the functions using them
+HEAVY = ("networkx", "numpy", "pandas", "pyarrow", "scipy")
+
+
+def import_time(module: str) -> tuple[float, list[str]]:
+    """Return the cumulative import time of ``module`` in ms, and the heavy
+    modules it imported."""
+    code = f"import sys, {module}; print(*(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000, result.stdout.split()
+    raise RuntimeError(f"{module} not found in the -X importtime output")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="compatsphinxext")
+    parser.add_argument("--budget", type=float, default=50.0, help="milliseconds")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # the first import may compile the module
+    timings = [import_time(args.module) for _ in range(args.repeat)]
+    best = min(elapsed for elapsed, _ in timings)
+    heavy = sorted({name for _, imported in timings for name in imported})
+    print(f"import {args.module}: {best:.1f} ms (budget {args.budget:g} ms)")
+
+    failures = []
+    if best > args.budget:
+        failures.append(f"import time {best:.1f} ms is over {args.budget:g} ms")
+    if heavy:
+        failures.append(f"imported eagerly: {', '.join(heavy)}")
+    for failure in failures:
+        print(f"error: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()